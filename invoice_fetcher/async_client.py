@@ -0,0 +1,354 @@
+"""Asyncio invoice download client built on httpx."""
+
+import asyncio
+import io
+import time
+from typing import TYPE_CHECKING, Any, BinaryIO, Dict, Optional
+
+from requests.adapters import DEFAULT_POOLSIZE
+
+from .exceptions import ConfigurationError, IncompleteDownloadError, NetworkError
+from .partial import PartialDownload, conditional_headers
+
+if TYPE_CHECKING:
+    from .client import InvoiceClient
+
+
+def require_httpx() -> Any:
+    """Import httpx, which the async engine needs.
+
+    Returns:
+        The httpx module
+
+    Raises:
+        ConfigurationError: If httpx is not installed
+    """
+    try:
+        import httpx
+    except ImportError:
+        raise ConfigurationError(
+            "The async engine requires httpx: pip install 'invoice-fetcher[async]'"
+        )
+    return httpx
+
+
+class AsyncInvoiceClient:
+    """Downloads invoices with an asyncio HTTP client.
+
+    Mirrors ``InvoiceClient.download_invoice`` for the async engine. The
+    client borrows cookies, referer, headers and the rate limiter from an
+    authenticated ``InvoiceClient``, which also serves as the fallback for
+    anything that needs the browser (cookie refreshes and non-PDF invoice
+    pages).
+    """
+
+    def __init__(
+        self,
+        client: "InvoiceClient",
+        concurrency: Optional[int] = None,
+        transport: Any = None,
+    ):
+        """Initialize the client.
+
+        Args:
+            client: Authenticated synchronous client
+            concurrency: Number of downloads kept in flight, used to size the
+                connection pool
+            transport: httpx transport to use instead of the pooled default
+
+        Raises:
+            ConfigurationError: If httpx (or h2 for HTTP/2) is not installed
+        """
+        httpx = require_httpx()
+
+        self.client = client
+        self.config = client.config
+        self._httpx = httpx
+        self._cookies_loaded_at = 0.0
+        self._cookie_lock = asyncio.Lock()
+
+        connections = max(concurrency or 0, DEFAULT_POOLSIZE)
+        limits = httpx.Limits(
+            max_connections=connections,
+            max_keepalive_connections=(
+                connections if self.config.get("transport.keep_alive", True) else 0
+            ),
+        )
+        if transport is None:
+            try:
+                transport = httpx.AsyncHTTPTransport(
+                    limits=limits,
+                    http2=self.config.get("transport.http2", False),
+                    retries=self.config.get("transport.retries", 3),
+                )
+            except ImportError:
+                raise ConfigurationError(
+                    "HTTP/2 requires the h2 package: pip install 'httpx[http2]'"
+                )
+
+        self._http = httpx.AsyncClient(
+            transport=transport,
+            headers=dict(client.session.headers),
+            timeout=30,
+            follow_redirects=True,
+        )
+        self._load_cookies()
+
+    async def __aenter__(self) -> "AsyncInvoiceClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        await self._http.aclose()
+
+    def _load_cookies(self) -> None:
+        """Copy the synchronous client's session cookies."""
+        for cookie in self.client.session.cookies:
+            self._http.cookies.set(
+                cookie.name, cookie.value, domain=cookie.domain, path=cookie.path
+            )
+        self._cookies_loaded_at = time.monotonic()
+
+    async def _refresh_cookies(self, force: bool = False) -> None:
+        """Refresh cookies from the browser when stale or rejected.
+
+        Args:
+            force: Refresh even if the cookies are within their TTL
+        """
+        async with self._cookie_lock:
+            age = time.monotonic() - self._cookies_loaded_at
+            if not force and age < self.client.cookie_ttl:
+                return
+            await asyncio.to_thread(self.client.refresh_cookies, force)
+            self._load_cookies()
+
+    def _is_auth_failure(self, response: Any) -> bool:
+        """Check whether a response was rejected for missing authentication."""
+        return (
+            response.status_code in self.client.AUTH_FAILURE_STATUSES
+            or "signin" in str(response.url).lower()
+        )
+
+    async def download_invoice(self, invoice_url: str) -> bytes:
+        """Download invoice PDF from URL.
+
+        Args:
+            invoice_url: URL to the invoice PDF
+
+        Returns:
+            PDF content as bytes
+
+        Raises:
+            NetworkError: If download fails
+        """
+        buffer = io.BytesIO()
+        await self.fetch_invoice(invoice_url, buffer)
+        return buffer.getvalue()
+
+    async def fetch_invoice(self, invoice_url: str, fileobj: BinaryIO) -> int:
+        """Download invoice PDF from URL into a file object.
+
+        Args:
+            invoice_url: URL to the invoice PDF
+            fileobj: Binary file object the PDF is written to
+
+        Returns:
+            Number of bytes written
+
+        Raises:
+            NetworkError: If download fails
+        """
+        try:
+            response = await self._send(invoice_url)
+            try:
+                response.raise_for_status()
+
+                if not self._is_pdf(response, invoice_url):
+                    content = await self._download_with_browser(invoice_url)
+                    fileobj.write(content)
+                    return len(content)
+
+                size = 0
+                async for chunk in response.aiter_bytes(self.client.CHUNK_SIZE):
+                    fileobj.write(chunk)
+                    size += len(chunk)
+                return size
+            finally:
+                await response.aclose()
+
+        except self._httpx.HTTPError as e:
+            raise NetworkError(f"Failed to download invoice from {invoice_url}: {e}")
+
+    async def download_to(
+        self,
+        invoice_url: str,
+        partial: PartialDownload,
+        validators: Optional[Dict[str, Optional[str]]] = None,
+    ) -> bool:
+        """Download an invoice into a partial download.
+
+        Mirrors ``InvoiceClient.download_to``: interrupted transfers are
+        resumed from the bytes already received, rejected requests fail
+        right away, and a stored copy is only downloaded again if it has
+        changed. Part file operations run in worker threads.
+
+        Args:
+            invoice_url: URL to the invoice PDF
+            partial: Partial download receiving the PDF
+            validators: ``etag`` and ``last_modified`` of a stored copy
+
+        Returns:
+            True if the invoice was downloaded, False if it was not modified
+
+        Raises:
+            NetworkError: If the download still fails after resuming
+            FileError: If the part file cannot be written
+        """
+        attempts = self.config.get("client.resume_attempts", 3)
+        attempt = 0
+        while True:
+            try:
+                return await self._download_part(invoice_url, partial, validators)
+            except IncompleteDownloadError:
+                await asyncio.to_thread(partial.suspend)
+                if attempt >= attempts:
+                    raise
+                attempt += 1
+
+    async def _download_part(
+        self,
+        invoice_url: str,
+        partial: PartialDownload,
+        validators: Optional[Dict[str, Optional[str]]] = None,
+    ) -> bool:
+        """Make one attempt at completing a partial download.
+
+        Args:
+            invoice_url: URL to the invoice PDF
+            partial: Partial download receiving the PDF
+            validators: Validators of a stored copy, for a conditional request
+
+        Returns:
+            True if the invoice was downloaded, False if it was not modified
+
+        Raises:
+            NetworkError: If the request fails
+            IncompleteDownloadError: If the transfer is interrupted or
+                incomplete
+        """
+        conditions = conditional_headers(validators)
+        try:
+            response = await self._send(
+                invoice_url, {**conditions, **partial.request_headers()}
+            )
+            try:
+                if response.status_code == 416:
+                    # The part file can't be continued; start over
+                    await response.aclose()
+                    await asyncio.to_thread(partial.reset)
+                    response = await self._send(invoice_url, conditions)
+                if response.status_code == 304:
+                    return False
+                response.raise_for_status()
+
+                if not self._is_pdf(response, invoice_url):
+                    content = await self._download_with_browser(invoice_url)
+                    await asyncio.to_thread(partial.begin, 200, {})
+                    await asyncio.to_thread(partial.write, content)
+                else:
+                    await asyncio.to_thread(
+                        partial.begin, response.status_code, response.headers
+                    )
+                    try:
+                        async for chunk in response.aiter_bytes(self.client.CHUNK_SIZE):
+                            await asyncio.to_thread(partial.write, chunk)
+                    except self._httpx.HTTPError as e:
+                        raise IncompleteDownloadError(
+                            f"Download of {invoice_url} was interrupted: {e}"
+                        )
+            finally:
+                await response.aclose()
+
+        except self._httpx.HTTPError as e:
+            raise NetworkError(f"Failed to download invoice from {invoice_url}: {e}")
+
+        await asyncio.to_thread(partial.finish)
+        return True
+
+    async def _send(
+        self, invoice_url: str, headers: Optional[Dict[str, str]] = None
+    ) -> Any:
+        """Request an invoice through the rate limiter.
+
+        Throttled and transiently failed requests are retried as configured
+        in ``rate_limit``, and a request rejected as unauthenticated is
+        retried once with fresh cookies.
+
+        Args:
+            invoice_url: URL to the invoice PDF
+            headers: Extra request headers, e.g. for resuming
+
+        Returns:
+            Streamed response, not yet checked for HTTP errors; the caller
+            must close it
+        """
+        limiter = self.client.rate_limiter
+        await self._refresh_cookies()
+
+        # User-Agent and language come from the client defaults
+        request_headers = {
+            "Accept": "application/pdf,*/*",
+            "Accept-Encoding": "identity",
+        }
+        request_headers.update(headers or {})
+
+        attempt = 0
+        cookies_refreshed = False
+        while True:
+            await limiter.acquire_async()
+            request = self._http.build_request(
+                "GET",
+                invoice_url,
+                headers={**request_headers, "Referer": self.client.referer},
+            )
+            response = await self._http.send(request, stream=True)
+
+            if (
+                not cookies_refreshed
+                and self._is_auth_failure(response)
+                and self.client.can_refresh_cookies
+            ):
+                await response.aclose()
+                cookies_refreshed = True
+                await self._refresh_cookies(force=True)
+                continue
+
+            delay = limiter.observe(
+                response.status_code,
+                response.headers.get("Retry-After"),
+                attempt,
+                throttled="captcha" in str(response.url).lower(),
+            )
+            if delay is None:
+                return response
+
+            await response.aclose()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _is_pdf(response: Any, invoice_url: str) -> bool:
+        """Check whether a response carries the invoice PDF itself."""
+        content_type = response.headers.get("content-type", "").lower()
+        return "pdf" in content_type or invoice_url.endswith(".pdf")
+
+    async def _download_with_browser(self, invoice_url: str) -> bytes:
+        """Download an invoice page that needs the browser.
+
+        The page was already requested over HTTP, so this goes straight to
+        the synchronous client's browser, in a worker thread.
+        """
+        return await asyncio.to_thread(self.client.download_with_browser, invoice_url)
@@ -0,0 +1,219 @@
+"""Asyncio download pipeline for invoices."""
+
+import asyncio
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from .async_client import AsyncInvoiceClient
+from .downloader import (
+    DOWNLOADED,
+    ERROR,
+    SKIPPED,
+    UNCHANGED,
+    InvoiceDownloader,
+    ResultCallback,
+)
+from .exceptions import FileError, NetworkError
+from .partial import PartialDownload
+
+# Marks the end of a queue
+_DONE = object()
+
+
+class AsyncInvoiceDownloader(InvoiceDownloader):
+    """Downloads invoices with an asyncio producer/consumer pipeline.
+
+    Orders flow through three stages connected by bounded queues: the
+    producer pulls orders from the (possibly still enumerating) order
+    iterable, ``concurrency`` download tasks stream invoices into resumable
+    part files, and a writer moves them into place with the file manager.
+    The bounded queues keep memory flat however many downloads are in
+    flight. Disk and manifest work runs in worker threads, so the event
+    loop only waits on the network.
+
+    Takes the same arguments as ``InvoiceDownloader``; the synchronous
+    client supplies the session cookies for the async HTTP client.
+    """
+
+    def run(
+        self,
+        orders: Iterable[Dict[str, Any]],
+        on_result: Optional[ResultCallback] = None,
+    ) -> Dict[str, int]:
+        """Process orders through the pipeline.
+
+        Results are reported through ``on_result`` from the calling thread,
+        which runs the event loop.
+
+        Args:
+            orders: Orders to process
+            on_result: Optional callback invoked with (order, status, message)
+                as each order completes
+
+        Returns:
+            Dictionary with counts per status
+        """
+        return asyncio.run(self.run_async(orders, on_result))
+
+    async def run_async(
+        self,
+        orders: Iterable[Dict[str, Any]],
+        on_result: Optional[ResultCallback] = None,
+    ) -> Dict[str, int]:
+        """Process orders through the pipeline on the running event loop.
+
+        Args:
+            orders: Orders to process
+            on_result: Optional callback invoked with (order, status, message)
+                as each order completes
+
+        Returns:
+            Dictionary with counts per status
+        """
+        counts = {DOWNLOADED: 0, SKIPPED: 0, UNCHANGED: 0, ERROR: 0}
+
+        def report(order: Dict[str, Any], status: str, message: str) -> None:
+            counts[status] += 1
+            if on_result:
+                on_result(order, status, message)
+
+        order_queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency)
+
+        async with self._open_client() as client:
+            downloaders = [
+                asyncio.create_task(
+                    self._download_worker(client, order_queue, write_queue, report)
+                )
+                for _ in range(self.concurrency)
+            ]
+            writer = asyncio.create_task(self._write_worker(write_queue, report))
+            tasks = downloaders + [writer]
+
+            try:
+                await self._produce(orders, order_queue)
+                for _ in downloaders:
+                    await order_queue.put(_DONE)
+                await asyncio.gather(*downloaders)
+                await write_queue.put(_DONE)
+                await writer
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+        return counts
+
+    def _open_client(self) -> AsyncInvoiceClient:
+        """Create the async HTTP client for one run."""
+        return AsyncInvoiceClient(self.client, concurrency=self.concurrency)
+
+    async def _produce(
+        self, orders: Iterable[Dict[str, Any]], order_queue: asyncio.Queue
+    ) -> None:
+        """Feed orders into the pipeline.
+
+        Orders are pulled in a worker thread, so an order generator that
+        drives the browser doesn't block downloads already in flight.
+
+        Args:
+            orders: Orders to process
+            order_queue: Queue read by the download tasks
+        """
+        iterator = iter(orders)
+        while True:
+            order = await asyncio.to_thread(next, iterator, _DONE)
+            if order is _DONE:
+                return
+            await order_queue.put(order)
+
+    async def _download_worker(
+        self,
+        client: AsyncInvoiceClient,
+        order_queue: asyncio.Queue,
+        write_queue: asyncio.Queue,
+        report: ResultCallback,
+    ) -> None:
+        """Download invoices until the order queue is exhausted.
+
+        Args:
+            client: Async HTTP client
+            order_queue: Orders to download
+            write_queue: Downloaded invoices waiting to be stored
+            report: Result callback
+        """
+        while True:
+            order = await order_queue.get()
+            if order is _DONE:
+                return
+
+            order_num = order.get("order_number", "Unknown")
+            try:
+                outcome = await asyncio.to_thread(self.check_order, order)
+                if outcome is not None:
+                    report(order, *outcome)
+                    continue
+
+                validators, partial = await asyncio.to_thread(
+                    self._prepare_download, order
+                )
+                if await client.download_to(order["invoice_url"], partial, validators):
+                    await write_queue.put((order, partial, validators is not None))
+                else:
+                    report(order, UNCHANGED, f"Invoice {order_num} unchanged")
+            except (NetworkError, FileError) as e:
+                report(order, ERROR, f"Failed to download invoice {order_num}: {e}")
+            except Exception as e:
+                report(order, ERROR, f"Failed to process invoice {order_num}: {e}")
+
+    def _prepare_download(
+        self, order: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Optional[str]]], PartialDownload]:
+        """Look up what a download of an order's invoice starts from.
+
+        Args:
+            order: Order dictionary as returned by the invoice client
+
+        Returns:
+            Tuple of the stored invoice's validators (None unless refreshing)
+            and the partial download receiving the invoice
+        """
+        validators = self.stored_validators(order)
+        partial = self.file_manager_for(order).partial_download(
+            order["date"],
+            order.get("total", "0.00"),
+            order.get("order_number", "Unknown"),
+            order["invoice_url"],
+        )
+        return validators, partial
+
+    async def _write_worker(
+        self, write_queue: asyncio.Queue, report: ResultCallback
+    ) -> None:
+        """Store downloaded invoices until the write queue is exhausted.
+
+        Args:
+            write_queue: Downloaded invoices as (order, partial download,
+                refreshed) tuples
+            report: Result callback
+        """
+        while True:
+            item = await write_queue.get()
+            if item is _DONE:
+                return
+
+            order, partial, refreshed = item
+            order_num = order.get("order_number", "Unknown")
+            try:
+                file_path = await asyncio.to_thread(
+                    self.file_manager_for(order).finalize_invoice,
+                    partial,
+                    order["date"],
+                    order.get("total", "0.00"),
+                    order_num,
+                )
+                action = "Refreshed" if refreshed else "Downloaded"
+                report(order, DOWNLOADED, f"{action}: {file_path.name}")
+            except FileError as e:
+                report(order, ERROR, f"Failed to download invoice {order_num}: {e}")
+            except Exception as e:
+                report(order, ERROR, f"Failed to process invoice {order_num}: {e}")
@@ -1,7 +1,9 @@
 """Authentication module for Amazon Business login."""
 
-import time
 import keyring
+import logging
+import requests
+from pathlib import Path
 from typing import Optional
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -10,10 +12,16 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException
-from webdriver_manager.chrome import ChromeDriverManager
 
+from .browserd import DaemonLease, default_state_path
 from .config import Config
-from .exceptions import AuthenticationError, WebDriverError
+from .driver_cache import DriverResolver
+from .exceptions import AuthenticationError, FileError, WebDriverError
+from .probe import SelectorProbe, SelectorStats
+from .readiness import PageReadiness
+from .session_store import SessionStore
+
+logger = logging.getLogger(__name__)
 
 
 class AmazonBusinessAuth:
@@ -21,6 +29,74 @@ class AmazonBusinessAuth:
 
     KEYRING_SERVICE = "amazon-business-invoice-fetcher"
 
+    SIGN_IN_SELECTORS = [
+        "a[data-nav-role='signin']",
+        "a[href*='signin']",
+        "#nav-link-accountList",
+        ".nav-signin-text",
+        "[data-testid='sign-in-button']",
+    ]
+    # Elements that appear once logged in
+    POST_LOGIN_SELECTORS = [
+        "#nav-link-accountList",
+        "[data-nav-role='signin']",
+        ".nav-user-name",
+        "#business-nav",
+    ]
+    SSO_POST_LOGIN_SELECTORS = POST_LOGIN_SELECTORS + [
+        "[data-testid='business-header']",
+        ".ab-user-menu",
+        "#nav-user-name",
+        ".nav-line-1",
+        "[data-nav-role='user-menu']",
+    ]
+    LOGIN_ERROR_SELECTORS = [
+        "#auth-error-message-box",
+        ".auth-error-message",
+        "#auth-warning-message-box",
+    ]
+    LOGIN_FORM_SELECTORS = [
+        "#ap_email",
+        "#ap_password",
+        "input[name='email']",
+        "input[name='password']",
+        "#signin-button",
+    ]
+
+    # Chrome flags for the lean scraping profile
+    LEAN_ARGUMENTS = [
+        "--disable-extensions",
+        "--disable-background-networking",
+        "--disable-component-update",
+        "--disable-default-apps",
+        "--disable-sync",
+        "--no-first-run",
+        "--mute-audio",
+        "--blink-settings=imagesEnabled=false",
+    ]
+    # 2 = block
+    LEAN_PREFS = {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.media_stream": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    }
+    # Resources blocked over CDP in the lean profile
+    LEAN_BLOCKED_URLS = [
+        "*.png",
+        "*.jpg",
+        "*.jpeg",
+        "*.gif",
+        "*.webp",
+        "*.ico",
+        "*.woff",
+        "*.woff2",
+        "*.ttf",
+        "*.otf",
+        "*.mp4",
+        "*.webm",
+        "*.mp3",
+    ]
+
     def __init__(self, config: Config):
         """Initialize the authenticator.
 
@@ -29,37 +105,52 @@ class AmazonBusinessAuth:
         """
         self.config = config
         self.driver: Optional[webdriver.Chrome] = None
+        self.probe: Optional[SelectorProbe] = None
+        self.readiness: Optional[PageReadiness] = None
+        self.selector_stats = SelectorStats.from_config(config)
         self.session_cookies: Optional[list] = None
-
-    def _setup_driver(self, interactive: bool = False) -> webdriver.Chrome:
+        self._daemon_lease: Optional[DaemonLease] = None
+
+        session_dir = self.config.get("session.dir")
+        self.session_store = SessionStore(
+            (
+                Path(session_dir).expanduser()
+                if session_dir
+                else Config.DEFAULT_CONFIG_DIR / "sessions"
+            ),
+            max_age=self.config.get("session.max_age"),
+        )
+
+    def _setup_driver(
+        self, interactive: bool = False, debugger_address: Optional[str] = None
+    ) -> webdriver.Chrome:
         """Set up and return a Chrome WebDriver instance.
 
         Args:
             interactive: If True, show browser window for manual SSO login
+            debugger_address: DevTools address of an already running Chrome
+                to attach to instead of starting a new one
         """
         try:
-            chrome_options = Options()
-
-            # Only run headless if not in interactive mode
-            if not interactive and self.config.get("selenium.headless", True):
-                chrome_options.add_argument("--headless")
-
-            # Add common Chrome options for better compatibility
-            chrome_options.add_argument("--no-sandbox")
-            chrome_options.add_argument("--disable-dev-shm-usage")
-            chrome_options.add_argument("--disable-gpu")
-            chrome_options.add_argument("--window-size=1920,1080")
-            chrome_options.add_argument(
-                "--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36"
-            )
+            if debugger_address:
+                chrome_options = Options()
+                chrome_options.debugger_address = debugger_address
+            else:
+                chrome_options = self._chrome_options(interactive)
 
-            # Set up Chrome service with auto-downloaded driver
-            # Get latest ChromeDriver version
-            service = Service(ChromeDriverManager().install())
+            # Set up Chrome service with the cached (or freshly resolved) driver
+            driver_path = DriverResolver.from_config(self.config).resolve()
+            service = Service(driver_path) if driver_path else Service()
 
             driver = webdriver.Chrome(service=service, options=chrome_options)
 
+            if self._lean(interactive) and not debugger_address:
+                # Fonts and media can't be turned off through prefs
+                driver.execute_cdp_cmd("Network.enable", {})
+                driver.execute_cdp_cmd(
+                    "Network.setBlockedURLs", {"urls": self.LEAN_BLOCKED_URLS}
+                )
+
             # Set timeouts
             timeout = self.config.get("selenium.timeout", 30)
             driver.implicitly_wait(timeout)
@@ -67,11 +158,88 @@ class AmazonBusinessAuth:
                 self.config.get("selenium.page_load_timeout", 30)
             )
 
+            self.probe = SelectorProbe(driver, timeout, stats=self.selector_stats)
+            self.readiness = PageReadiness(
+                driver,
+                timeout=self.config.get("selenium.ready_timeout", 10),
+                quiet_period=self.config.get("selenium.quiet_period", 0.5),
+            )
+
             return driver
 
         except Exception as e:
             raise WebDriverError(f"Failed to set up Chrome driver: {e}")
 
+    def _require_probe(self) -> SelectorProbe:
+        """Get the selector probe of the browser set up for logging in.
+
+        Raises:
+            WebDriverError: If no browser has been set up
+        """
+        if self.probe is None:
+            raise WebDriverError("No browser has been set up")
+        return self.probe
+
+    def _require_readiness(self) -> PageReadiness:
+        """Get the page readiness waiter of the browser set up for logging in.
+
+        Raises:
+            WebDriverError: If no browser has been set up
+        """
+        if self.readiness is None:
+            raise WebDriverError("No browser has been set up")
+        return self.readiness
+
+    def _lean(self, interactive: bool) -> bool:
+        """Check whether the lean browser profile applies.
+
+        Interactive SSO windows always use the full profile so the login
+        pages render normally.
+        """
+        return not interactive and self.config.get("selenium.profile") == "lean"
+
+    def _chrome_options(self, interactive: bool = False) -> Options:
+        """Build the Chrome options for the configured browser profile.
+
+        Args:
+            interactive: If True, show browser window for manual SSO login
+
+        Returns:
+            Chrome options
+        """
+        chrome_options = Options()
+        lean = self._lean(interactive)
+
+        # Only run headless if not in interactive mode
+        if not interactive and self.config.get("selenium.headless", True):
+            chrome_options.add_argument("--headless=new" if lean else "--headless")
+
+        # Add common Chrome options for better compatibility
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument(
+            "--user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/138.0.0.0 Safari/537.36"
+        )
+
+        user_data_dir = self.config.get("selenium.user_data_dir")
+        if user_data_dir:
+            chrome_options.add_argument(
+                f"--user-data-dir={Path(user_data_dir).expanduser()}"
+            )
+
+        if lean:
+            # Return from navigation at DOMContentLoaded; readiness waits
+            # cover whatever the page still loads afterwards
+            chrome_options.page_load_strategy = "eager"
+            for argument in self.LEAN_ARGUMENTS:
+                chrome_options.add_argument(argument)
+            chrome_options.add_experimental_option("prefs", self.LEAN_PREFS)
+
+        return chrome_options
+
     def get_credentials(self) -> tuple[str, str]:
         """Get Amazon Business credentials.
 
@@ -129,6 +297,8 @@ class AmazonBusinessAuth:
             return self._login_sso()
 
         self.driver = self._setup_driver(interactive=False)
+        probe = self._require_probe()
+        readiness = self._require_readiness()
 
         try:
             email, password = self.get_credentials()
@@ -139,36 +309,22 @@ class AmazonBusinessAuth:
             )
             self.driver.get(business_url)
 
-            # Wait for and click sign-in button
-            wait = WebDriverWait(
-                self.driver, self.config.get("amazon.login_timeout", 60)
-            )
-
-            # Look for sign-in link/button
-            sign_in_selectors = [
-                "a[data-nav-role='signin']",
-                "a[href*='signin']",
-                "#nav-link-accountList",
-                ".nav-signin-text",
-                "[data-testid='sign-in-button']",
-            ]
-
-            sign_in_element = None
-            for selector in sign_in_selectors:
-                try:
-                    sign_in_element = wait.until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                    )
-                    break
-                except TimeoutException:
-                    continue
+            login_timeout = self.config.get("amazon.login_timeout", 60)
+            wait = WebDriverWait(self.driver, login_timeout)
 
-            if not sign_in_element:
+            # Wait for and click sign-in link/button
+            result = probe.find(
+                self.SIGN_IN_SELECTORS,
+                timeout=login_timeout,
+                visible=True,
+                group="sign_in",
+            )
+            if not result:
                 raise AuthenticationError(
                     "Could not find sign-in button on Amazon Business page"
                 )
 
-            sign_in_element.click()
+            result.match.click()
 
             # Enter email
             email_field = wait.until(
@@ -192,59 +348,27 @@ class AmazonBusinessAuth:
             sign_in_button = self.driver.find_element(By.ID, "signInSubmit")
             sign_in_button.click()
 
-            # Wait for successful login (check for common post-login elements)
-            try:
-                # Wait for one of these elements to appear, indicating successful login
-                post_login_selectors = [
-                    "#nav-link-accountList",
-                    "[data-nav-role='signin']",
-                    ".nav-user-name",
-                    "#business-nav",
-                ]
-
-                for selector in post_login_selectors:
-                    try:
-                        wait.until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                        )
-                        break
-                    except TimeoutException:
-                        continue
-                else:
-                    # Check if we're still on a login-related page
-                    if (
-                        "signin" in self.driver.current_url.lower()
-                        or "ap/signin" in self.driver.current_url
-                    ):
-                        raise AuthenticationError(
-                            "Login appears to have failed - still on sign-in page"
-                        )
-
-            except TimeoutException:
+            # Wait for one of the post-login elements to appear
+            if not probe.find(
+                self.POST_LOGIN_SELECTORS, timeout=login_timeout, group="post_login"
+            ):
                 # Check for error messages
-                error_selectors = [
-                    "#auth-error-message-box",
-                    ".auth-error-message",
-                    "#auth-warning-message-box",
-                ]
-
-                for selector in error_selectors:
-                    try:
-                        error_element = self.driver.find_element(
-                            By.CSS_SELECTOR, selector
-                        )
-                        if error_element.is_displayed():
-                            error_text = error_element.text
-                            raise AuthenticationError(f"Login failed: {error_text}")
-                    except Exception:
-                        continue
-
-                raise AuthenticationError(
-                    "Login timeout - could not verify successful authentication"
+                error = probe.find(
+                    self.LOGIN_ERROR_SELECTORS, visible=True, group="login_error"
                 )
+                if error:
+                    raise AuthenticationError(f"Login failed: {error.match.text}")
+
+                # Check if we're still on a login-related page
+                if "signin" in self.driver.current_url.lower():
+                    raise AuthenticationError(
+                        "Login appears to have failed - still on sign-in page"
+                    )
 
-            # Give a moment for any redirects to complete
-            time.sleep(2)
+            # Let any redirects complete
+            readiness.page_ready()
+
+            self._save_session()
 
             return self.driver
 
@@ -270,6 +394,8 @@ class AmazonBusinessAuth:
         print("Please log in using your SSO credentials (Okta).\n")
 
         self.driver = self._setup_driver(interactive=True)
+        probe = self._require_probe()
+        readiness = self._require_readiness()
 
         try:
             # Get SSO URL from config or use Amazon Business URL as fallback
@@ -304,53 +430,27 @@ class AmazonBusinessAuth:
                 print("Continuing to wait for login elements...")
 
             # Wait for successful login by checking for post-login elements
-            post_login_selectors = [
-                "#nav-link-accountList",
-                "[data-nav-role='signin']",
-                ".nav-user-name",
-                "#business-nav",
-                "[data-testid='business-header']",
-                ".ab-user-menu",
-                "#nav-user-name",
-                ".nav-line-1",
-                "[data-nav-role='user-menu']",
-            ]
-
-            logged_in = False
             print("Checking for login success indicators...")
 
-            for i, selector in enumerate(post_login_selectors):
-                try:
-                    print(
-                        f"Checking selector {i+1}/{len(post_login_selectors)}: "
-                        f"{selector}"
-                    )
-                    # Use shorter timeout for each individual selector check
-                    element_wait = WebDriverWait(
-                        self.driver, 10
-                    )  # 10 seconds per selector
-                    element_wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
+            result = probe.find(
+                self.SSO_POST_LOGIN_SELECTORS,
+                timeout=self.config.get("amazon.login_timeout", 60),
+                group="sso_post_login",
+            )
 
-                    # Also check that we're not on a login page
-                    current_url = self.driver.current_url.lower()
-                    print(f"Current URL: {current_url}")
+            logged_in = False
+            if result:
+                # Also check that we're not on a login page
+                current_url = self.driver.current_url.lower()
+                print(f"Current URL: {current_url}")
 
-                    if (
-                        "signin" not in current_url
-                        and "ap/signin" not in current_url
-                        and "okta.com" not in current_url
-                    ):
-                        logged_in = True
-                        print(f"✅ Found login indicator: {selector}")
-                        break
-                except TimeoutException:
-                    print(f"❌ Selector not found: {selector}")
-                    continue
-                except Exception as e:
-                    print(f"❌ Error checking selector {selector}: {e}")
-                    continue
+                if (
+                    "signin" not in current_url
+                    and "ap/signin" not in current_url
+                    and "okta.com" not in current_url
+                ):
+                    logged_in = True
+                    print(f"✅ Found login indicator: {result.selector}")
 
             if not logged_in:
                 print(
@@ -368,22 +468,9 @@ class AmazonBusinessAuth:
                 ):
 
                     # Check if login form is NOT present (indicating successful login)
-                    login_form_selectors = [
-                        "#ap_email",
-                        "#ap_password",
-                        "input[name='email']",
-                        "input[name='password']",
-                        "#signin-button",
-                    ]
-
-                    login_form_present = False
-                    for selector in login_form_selectors:
-                        try:
-                            self.driver.find_element(By.CSS_SELECTOR, selector)
-                            login_form_present = True
-                            break
-                        except Exception:
-                            continue
+                    login_form_present = bool(
+                        probe.find(self.LOGIN_FORM_SELECTORS, group="login_form")
+                    )
 
                     if not login_form_present:
                         print("✅ Login successful (no login form detected)")
@@ -402,11 +489,11 @@ class AmazonBusinessAuth:
 
             print("✅ SSO login successful!\n")
 
-            # Save cookies for potential reuse
-            self.session_cookies = self.driver.get_cookies()
+            # Let any final redirects complete
+            readiness.page_ready()
 
-            # Give a moment for any final redirects
-            time.sleep(2)
+            # Save cookies so later runs can skip the browser login
+            self._save_session()
 
             return self.driver
 
@@ -416,16 +503,186 @@ class AmazonBusinessAuth:
                 self.driver = None
             raise AuthenticationError(f"SSO login failed: {e}")
 
+    def _save_session(self) -> None:
+        """Capture the driver's cookies and persist them for reuse."""
+        if not self.driver:
+            return
+
+        self.session_cookies = self.driver.get_cookies()
+
+        email = self.config.amazon_email
+        if not email or not self.config.get("session.enabled", True):
+            return
+
+        try:
+            self.session_store.save(email, self.session_cookies)
+        except FileError as e:
+            # Session reuse is an optimisation; never fail a login over it
+            logger.warning("Could not save session: %s", e)
+
+    def restore_session(self) -> Optional[requests.Session]:
+        """Restore a previously saved session without starting a browser.
+
+        Returns:
+            A requests session carrying the saved cookies if they are still
+            accepted by Amazon Business, otherwise None
+        """
+        email = self.config.amazon_email
+        if not email or not self.config.get("session.enabled", True):
+            return None
+
+        cookies = self.session_store.load(email)
+        if not cookies:
+            return None
+
+        session = requests.Session()
+        for cookie in cookies:
+            session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain"),
+                path=cookie.get("path"),
+            )
+
+        if not self._session_is_alive(session):
+            self.session_store.clear(email)
+            return None
+
+        self.session_cookies = cookies
+        return session
+
+    def _session_is_alive(self, session: requests.Session) -> bool:
+        """Check with a single request whether a session is still logged in.
+
+        Args:
+            session: Session carrying the cookies to validate
+
+        Returns:
+            True if the probe page loads without a redirect to sign-in
+        """
+        probe_url = self.config.get("session.probe_url") or (
+            self.config.get("amazon.business_url", "https://business.amazon.com")
+            + "/orders"
+        )
+
+        try:
+            # Only the status and final URL matter, so don't read the body
+            with session.get(probe_url, timeout=10, stream=True) as response:
+                final_url = response.url.lower()
+                return (
+                    response.status_code == 200
+                    and "signin" not in final_url
+                    and "okta.com" not in final_url
+                )
+        except requests.RequestException:
+            return False
+
+    def is_logged_in(self) -> bool:
+        """Check whether the browser's session is still logged in.
+
+        Returns:
+            True if the driver's cookies are still accepted by Amazon
+            Business
+        """
+        if not self.driver:
+            return False
+
+        session = requests.Session()
+        try:
+            for cookie in self.driver.get_cookies():
+                session.cookies.set(
+                    cookie["name"],
+                    cookie["value"],
+                    domain=cookie.get("domain"),
+                    path=cookie.get("path"),
+                )
+        except Exception:
+            return False
+        return self._session_is_alive(session)
+
+    def resume_browser(self) -> webdriver.Chrome:
+        """Start a browser already logged in using the restored session cookies.
+
+        Returns:
+            WebDriver instance carrying the session cookies
+
+        Raises:
+            WebDriverError: If the browser cannot be started
+        """
+        if self.driver:
+            return self.driver
+
+        self.driver = self._setup_driver(interactive=False)
+
+        try:
+            # Cookies can only be added for the domain currently loaded
+            self.driver.get(
+                self.config.get("amazon.business_url", "https://business.amazon.com")
+            )
+            for cookie in self.session_cookies or []:
+                try:
+                    self.driver.add_cookie(cookie)
+                except Exception:
+                    # Cookies for other domains (e.g. the SSO provider) are skipped
+                    continue
+            self.driver.refresh()
+        except Exception as e:
+            self.logout()
+            raise WebDriverError(f"Failed to resume browser session: {e}")
+
+        return self.driver
+
+    def attach_daemon(self) -> Optional[webdriver.Chrome]:
+        """Attach to the browser of a running ``browserd`` daemon.
+
+        Blocks while another run is using the daemon's browser.
+
+        Returns:
+            WebDriver attached to the daemon's logged-in browser, or None if
+            no daemon is running
+        """
+        lease = DaemonLease.open(
+            default_state_path(self.config),
+            timeout=self.config.get("browserd.attach_timeout", 300),
+        )
+        if lease is None:
+            return None
+
+        try:
+            self.driver = self._setup_driver(debugger_address=lease.debugger_address)
+        except WebDriverError:
+            lease.release()
+            return None
+
+        self._daemon_lease = lease
+        return self.driver
+
     def logout(self) -> None:
-        """Log out and close the driver."""
+        """Log out and close the driver.
+
+        A driver attached to the browser daemon is detached instead, leaving
+        the daemon's browser running for the next run.
+        """
+        if self.selector_stats:
+            self.selector_stats.save()
+
         if self.driver:
             try:
-                self.driver.quit()
+                if self._daemon_lease:
+                    # Only stop our chromedriver; quitting would end the
+                    # daemon's browser session
+                    self.driver.service.stop()
+                else:
+                    self.driver.quit()
             except Exception:
                 pass
             finally:
                 self.driver = None
 
+        if self._daemon_lease:
+            self._daemon_lease.release()
+            self._daemon_lease = None
+
     def __enter__(self):
         """Context manager entry."""
         return self.login()
@@ -0,0 +1,336 @@
+"""Long-lived browser daemon shared by consecutive CLI runs."""
+
+import json
+import logging
+import os
+import socket
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+from .config import Config
+from .exceptions import FileError, WebDriverError
+
+if TYPE_CHECKING:
+    from selenium import webdriver
+
+logger = logging.getLogger(__name__)
+
+# Commands understood on the control socket, one per line
+ATTACH = "ATTACH"
+STATUS = "STATUS"
+STOP = "STOP"
+
+
+def default_state_path(config: Config) -> Path:
+    """Get the daemon state file for a configuration.
+
+    Args:
+        config: Configuration object
+
+    Returns:
+        Path of the state file
+    """
+    state_file = config.get("browserd.state_file")
+    if state_file:
+        return Path(state_file).expanduser()
+    return Config.DEFAULT_CONFIG_DIR / "browserd.json"
+
+
+def read_state(state_path: Path) -> Optional[Dict[str, Any]]:
+    """Read the state of a running daemon.
+
+    Args:
+        state_path: Daemon state file
+
+    Returns:
+        State dictionary, or None if no daemon has registered itself
+    """
+    try:
+        with open(state_path, "r") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) and state.get("control_port") else None
+
+
+def _readline(sock: socket.socket) -> str:
+    """Read one newline-terminated message from a socket."""
+    data = b""
+    while not data.endswith(b"\n"):
+        chunk = sock.recv(1024)
+        if not chunk:
+            break
+        data += chunk
+    return data.decode().strip()
+
+
+def send_command(
+    state_path: Path, command: str, timeout: float = 15
+) -> Optional[Dict[str, Any]]:
+    """Send a one-off command to the daemon.
+
+    Args:
+        state_path: Daemon state file
+        command: STATUS or STOP
+        timeout: Seconds to wait for the reply
+
+    Returns:
+        The daemon's reply, or None if no daemon is reachable
+    """
+    lease = DaemonLease.open(state_path, command, timeout)
+    if lease is None:
+        return None
+    lease.release()
+    return lease.reply
+
+
+class DaemonLease:
+    """Exclusive use of the daemon's browser by one CLI run.
+
+    The daemon lends its browser to one ATTACH connection at a time, so
+    holding the connection open keeps other runs from driving the same
+    browser; they queue until the lease is released.
+    """
+
+    def __init__(self, sock: socket.socket, reply: Dict[str, Any]):
+        """Initialize the lease.
+
+        Args:
+            sock: Open control connection
+            reply: Reply sent by the daemon
+        """
+        self._sock: Optional[socket.socket] = sock
+        self.reply = reply
+
+    @property
+    def debugger_address(self) -> str:
+        """Chrome DevTools address to attach a WebDriver to."""
+        return self.reply["debugger_address"]
+
+    @classmethod
+    def open(
+        cls, state_path: Path, command: str = ATTACH, timeout: float = 300
+    ) -> Optional["DaemonLease"]:
+        """Connect to the daemon and send a command.
+
+        Args:
+            state_path: Daemon state file
+            command: Command to send
+            timeout: Seconds to wait, including while other runs hold the
+                browser
+
+        Returns:
+            The lease, or None if no daemon is reachable or it refused
+        """
+        state = read_state(state_path)
+        if state is None:
+            return None
+
+        try:
+            sock = socket.create_connection(
+                ("127.0.0.1", state["control_port"]), timeout=timeout
+            )
+        except OSError:
+            logger.debug("Browser daemon in %s is not reachable", state_path)
+            return None
+
+        try:
+            sock.sendall(f"{command}\n".encode())
+            reply = json.loads(_readline(sock) or "{}")
+        except (OSError, ValueError) as e:
+            logger.debug("Browser daemon did not answer %s: %s", command, e)
+            sock.close()
+            return None
+
+        if not reply.get("ok"):
+            logger.debug("Browser daemon refused %s: %s", command, reply.get("error"))
+            sock.close()
+            return None
+
+        return cls(sock, reply)
+
+    def release(self) -> None:
+        """Give the browser back to the daemon."""
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            finally:
+                self._sock = None
+
+
+class BrowserDaemon:
+    """Owns an authenticated browser and lends it to CLI runs.
+
+    Runs attach their own WebDriver to the daemon's Chrome through its
+    DevTools address, so Chrome is started and logged in only once per
+    batch of runs.
+
+    Every control connection is handled on its own thread, so STATUS and
+    STOP are answered while a run holds the browser.
+    """
+
+    # Seconds a client may take to send its command
+    COMMAND_TIMEOUT = 10
+    # Seconds between checks for a STOP while waiting for clients
+    ACCEPT_TIMEOUT = 0.5
+
+    def __init__(self, auth, state_path: Path):
+        """Initialize the daemon.
+
+        Args:
+            auth: AmazonBusinessAuth instance used to log in
+            state_path: File advertising the control port to clients
+        """
+        self.auth = auth
+        self.state_path = Path(state_path)
+        self.driver: Optional["webdriver.Chrome"] = None
+        self._server: Optional[socket.socket] = None
+        self._stopping = False
+        self._lease_lock = threading.Lock()
+
+    def start(self, interactive: bool = False) -> None:
+        """Log in and start listening for clients.
+
+        Args:
+            interactive: If True, use interactive mode for SSO login
+
+        Raises:
+            AuthenticationError: If login fails
+            FileError: If the state file cannot be written
+        """
+        self.driver = self.auth.login(interactive=interactive)
+
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.bind(("127.0.0.1", 0))
+        self._server.listen()
+        self._server.settimeout(self.ACCEPT_TIMEOUT)
+
+        state = {
+            "pid": os.getpid(),
+            "control_port": self._server.getsockname()[1],
+            "debugger_address": self.debugger_address,
+            "started": datetime.now().isoformat(timespec="seconds"),
+        }
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.state_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except OSError as e:
+            self.shutdown()
+            raise FileError(f"Failed to write browser daemon state: {e}")
+
+    @property
+    def debugger_address(self) -> str:
+        """Chrome DevTools address of the daemon's browser."""
+        return self._require_driver().capabilities["goog:chromeOptions"][
+            "debuggerAddress"
+        ]
+
+    def _require_driver(self) -> "webdriver.Chrome":
+        """Get the daemon's browser.
+
+        Raises:
+            WebDriverError: If the daemon has not been started
+        """
+        if self.driver is None:
+            raise WebDriverError("The daemon's browser is not running")
+        return self.driver
+
+    def serve_forever(self) -> None:
+        """Serve clients until stopped; returns at once if not started."""
+        server = self._server
+        while server is not None and not self._stopping:
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn: socket.socket) -> None:
+        """Handle one control connection on its own thread, then close it."""
+        with conn:
+            self._handle(conn)
+
+    def _handle(self, conn: socket.socket) -> None:
+        """Answer one control connection.
+
+        Args:
+            conn: Accepted client connection
+        """
+        try:
+            conn.settimeout(self.COMMAND_TIMEOUT)
+            command = _readline(conn)
+        except OSError:
+            return
+
+        if command == ATTACH:
+            with self._lease_lock:
+                self._lend(conn)
+        elif command == STATUS:
+            self._reply(
+                conn,
+                {
+                    "ok": True,
+                    "pid": os.getpid(),
+                    "debugger_address": self.debugger_address,
+                    "logged_in": self.auth.is_logged_in(),
+                },
+            )
+        elif command == STOP:
+            self._stopping = True
+            self._reply(conn, {"ok": True})
+        else:
+            self._reply(conn, {"ok": False, "error": f"unknown command {command!r}"})
+
+    def _lend(self, conn: socket.socket) -> None:
+        """Lend the browser to a client until it disconnects.
+
+        Args:
+            conn: Client connection that sent ATTACH
+        """
+        try:
+            # Make sure the browser is still alive before lending it out
+            self._require_driver().current_url
+        except Exception as e:
+            self._reply(conn, {"ok": False, "error": f"browser unavailable: {e}"})
+            return
+
+        if not self.auth.is_logged_in():
+            self._reply(conn, {"ok": False, "error": "session expired"})
+            return
+
+        self._reply(conn, {"ok": True, "debugger_address": self.debugger_address})
+        # Hold the lease until the client disconnects
+        try:
+            conn.settimeout(None)
+            while conn.recv(1024):
+                pass
+        except OSError:
+            pass
+
+    @staticmethod
+    def _reply(conn: socket.socket, message: Dict[str, Any]) -> None:
+        """Send a JSON reply line, ignoring clients that went away."""
+        try:
+            conn.sendall((json.dumps(message) + "\n").encode())
+        except OSError:
+            pass
+
+    def shutdown(self) -> None:
+        """Stop listening, remove the state file and close the browser."""
+        if self._server is not None:
+            self._server.close()
+            self._server = None
+
+        try:
+            self.state_path.unlink()
+        except OSError:
+            pass
+
+        self.auth.logout()
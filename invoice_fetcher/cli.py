@@ -1,41 +1,86 @@
 """Command line interface for the Amazon Business Invoice Fetcher."""
 
 import click
+import logging
 import sys
+from datetime import datetime, timedelta
 from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.table import Table
-from rich.panel import Panel
 
+# Browser automation, HTTP and keyring modules are slow to import, so they are
+# imported inside the commands that need them to keep startup fast.
 from .config import Config
-from .auth import AmazonBusinessAuth
-from .client import InvoiceClient
-from .file_manager import FileManager
 from .exceptions import (
     InvoiceFetcherError,
     AuthenticationError,
     ConfigurationError,
-    NetworkError,
-    FileError,
 )
 
 console = Console()
+logger = logging.getLogger(__name__)
+
+# Prepended to messages printed by fetch-accounts workers
+_message_prefix = ""
 
 
 def print_error(message: str) -> None:
     """Print an error message."""
-    console.print(f"[red]Error:[/red] {message}")
+    console.print(f"[red]Error:[/red] {_message_prefix}{message}")
 
 
 def print_success(message: str) -> None:
     """Print a success message."""
-    console.print(f"[green]Success:[/green] {message}")
+    console.print(f"[green]Success:[/green] {_message_prefix}{message}")
 
 
 def print_info(message: str) -> None:
     """Print an info message."""
-    console.print(f"[blue]Info:[/blue] {message}")
+    console.print(f"[blue]Info:[/blue] {_message_prefix}{message}")
+
+
+def configure_logging(cfg: Config, verbose: bool = False) -> None:
+    """Configure logging for the invoice fetcher package.
+
+    Args:
+        cfg: Configuration providing ``logging.level`` and ``logging.file``
+        verbose: If True, log at DEBUG level regardless of configuration
+    """
+    if verbose:
+        level = logging.DEBUG
+    else:
+        level_name = str(cfg.get("logging.level", "INFO")).upper()
+        level = getattr(logging, level_name, logging.INFO)
+
+    log_file = cfg.get("logging.file")
+    handler = (
+        logging.FileHandler(Path(log_file).expanduser())
+        if log_file
+        else logging.StreamHandler()
+    )
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s %(name)s %(levelname)s: %(message)s")
+    )
+
+    logger = logging.getLogger("invoice_fetcher")
+    logger.handlers = [handler]
+    logger.setLevel(level)
+
+
+def _log_probe_timings(summary: Dict[str, Dict[str, float]]) -> None:
+    """Log how long selector lookups took, shown with ``--verbose``.
+
+    Args:
+        summary: Timings per selector group from ``SelectorProbe.summary``
+    """
+    for group, timings in sorted(summary.items()):
+        logger.debug(
+            "Selector group %s: %d lookups, %.0f ms total, %.0f ms max",
+            group,
+            timings["calls"],
+            timings["total_ms"],
+            timings["max_ms"],
+        )
 
 
 @click.group()
@@ -50,10 +95,31 @@ def main():
 
 
 @main.command()
-@click.option("--team", required=True, help="Team name for organizing invoices")
+@click.option(
+    "--team",
+    "teams",
+    multiple=True,
+    help="Team name for organizing invoices (repeat to fetch for several teams)",
+)
+@click.option(
+    "--all-teams",
+    is_flag=True,
+    help="Fetch for every team in the teams section of the configuration",
+)
 @click.option(
     "--days", default=90, help="Number of days to look back for invoices (default: 90)"
 )
+@click.option(
+    "--since",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Only fetch invoices for orders placed on or after this date "
+    "(YYYY-MM-DD, overrides --days)",
+)
+@click.option(
+    "--until",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Only fetch invoices for orders placed on or before this date (YYYY-MM-DD)",
+)
 @click.option(
     "--config", type=click.Path(exists=True), help="Path to configuration file"
 )
@@ -67,139 +133,569 @@ def main():
     is_flag=True,
     help="Use SSO authentication (opens browser for interactive login)",
 )
-def fetch(team: str, days: int, config: str, dry_run: bool, sso: bool):
-    """Fetch invoices from Amazon Business for the specified team."""
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    help="Number of invoices to download in parallel "
+    "(default: HTTP connection pool size)",
+)
+@click.option(
+    "--engine",
+    type=click.Choice(["threads", "async"]),
+    help="Download engine: a thread pool or an asyncio pipeline "
+    "(default: client.engine, threads)",
+)
+@click.option(
+    "--fresh-login",
+    is_flag=True,
+    help="Ignore any saved session and log in again",
+)
+@click.option(
+    "--full",
+    is_flag=True,
+    help="Rescan the whole lookback window instead of only orders newer than "
+    "the last successful run",
+)
+@click.option(
+    "--refresh",
+    is_flag=True,
+    help="Re-check invoices that were already downloaded and replace the ones "
+    "that changed (implies --full)",
+)
+@click.option("--verbose", is_flag=True, help="Enable detailed logging")
+def fetch(
+    teams: Tuple[str, ...],
+    all_teams: bool,
+    days: int,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    config: str,
+    dry_run: bool,
+    sso: bool,
+    concurrency: int,
+    engine: Optional[str],
+    fresh_login: bool,
+    full: bool,
+    refresh: bool,
+    verbose: bool,
+):
+    """Fetch invoices from Amazon Business for the specified teams.
+
+    Orders are listed once and each invoice is filed under the team chosen
+    by the match rules in the teams section of the configuration.
+    """
+    if not teams and not all_teams:
+        raise click.UsageError("Missing option '--team' (or use --all-teams)")
+    if teams and all_teams:
+        raise click.UsageError("--team and --all-teams are mutually exclusive")
+    if since and until and since > until:
+        raise click.BadParameter("must not be after --until", param_hint="--since")
 
     try:
         # Load configuration
         config_path = Path(config) if config else None
         cfg = Config(config_path)
         cfg.validate()
+        configure_logging(cfg, verbose)
+
+        result = _run_fetch(
+            cfg,
+            teams,
+            all_teams=all_teams,
+            days=days,
+            since=since,
+            until=until,
+            dry_run=dry_run,
+            sso=sso,
+            concurrency=concurrency,
+            engine=engine,
+            fresh_login=fresh_login,
+            full=full,
+            refresh=refresh,
+        )
+        _print_fetch_summary(result)
 
-        print_info(f"Starting invoice fetch for team: {team}")
-        print_info(f"Looking back {days} days")
-        print_info(f"Download directory: {cfg.download_dir}")
-
-        if dry_run:
-            print_info("DRY RUN MODE - No files will be downloaded")
+        if result["errors"] > 0:
+            sys.exit(1)
 
-        # Set up file manager
-        team_dir = cfg.download_dir / team
-        file_manager = FileManager(team_dir)
+    except ConfigurationError as e:
+        print_error(f"Configuration error: {e}")
+        sys.exit(1)
+    except AuthenticationError as e:
+        print_error(f"Authentication error: {e}")
+        sys.exit(1)
+    except InvoiceFetcherError as e:
+        print_error(str(e))
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print_info("Operation cancelled by user")
+        sys.exit(1)
+    except Exception as e:
+        print_error(f"Unexpected error: {e}")
+        sys.exit(1)
 
-        # Authenticate and get invoices
-        if sso:
-            print_info("Using SSO authentication - browser will open for login")
-            auth = AmazonBusinessAuth(cfg)
-            driver = auth.login(interactive=True)
-        else:
-            with console.status("[bold green]Authenticating with Amazon Business..."):
-                auth = AmazonBusinessAuth(cfg)
-                driver = auth.login()
 
+def _run_fetch(
+    cfg: Config,
+    teams: Tuple[str, ...],
+    *,
+    all_teams: bool = False,
+    days: int = 90,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    dry_run: bool = False,
+    sso: bool = False,
+    concurrency: Optional[int] = None,
+    engine: Optional[str] = None,
+    fresh_login: bool = False,
+    full: bool = False,
+    refresh: bool = False,
+    use_daemon: bool = True,
+    quiet: bool = False,
+) -> Dict[str, Any]:
+    """Log in once, list orders and download the invoices for some teams.
+
+    Args:
+        cfg: Validated configuration
+        teams: Team names to file invoices for
+        all_teams: If True, use every team in the configuration instead
+        days: Number of days to look back
+        since: Only fetch orders placed on or after this date
+        until: Only fetch orders placed on or before this date
+        dry_run: If True, report what would be downloaded without downloading
+        sso: If True, use interactive SSO login
+        concurrency: Maximum number of parallel downloads
+        engine: Download engine, ``threads`` or ``async`` (default:
+            ``client.engine``)
+        fresh_login: If True, ignore saved sessions and the browser daemon
+        full: If True, ignore the incremental sync watermark
+        refresh: If True, revalidate invoices already downloaded with
+            conditional requests (implies ``full``)
+        use_daemon: If True, attach to a running browser daemon when possible
+        quiet: If True, only print progress milestones, not every invoice
+
+    Returns:
+        Dictionary with total ``downloaded``, ``skipped``, ``unchanged``,
+        ``errors``, ``unmatched`` and ``total`` counts, plus per-team counts under
+        ``teams``
+
+    Raises:
+        InvoiceFetcherError: If configuration, login or order listing fails
+    """
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    from .auth import AmazonBusinessAuth
+    from .client import InvoiceClient
+    from .downloader import InvoiceDownloader, DOWNLOADED, SKIPPED, UNCHANGED, ERROR
+    from .file_manager import FileManager
+    from .manifest import InvoiceManifest
+    from .sync_state import SyncState
+    from .teams import TeamRouter, team_download_dir
+
+    downloader_class = InvoiceDownloader
+    engine = engine or cfg.get("client.engine", "threads")
+    if engine == "async":
+        from .async_client import require_httpx
+        from .async_downloader import AsyncInvoiceDownloader
+
+        # Fail before logging in if the optional dependency is missing
+        require_httpx()
+        downloader_class = AsyncInvoiceDownloader
+    elif engine != "threads":
+        raise ConfigurationError(f"Unknown download engine: {engine}")
+
+    if all_teams:
+        teams = tuple(TeamRouter.configured_teams(cfg))
+        if not teams:
+            raise ConfigurationError("No teams defined in the configuration")
+    teams = tuple(dict.fromkeys(teams))
+    router = TeamRouter.from_config(cfg, list(teams))
+
+    # Set up file managers, invoice manifest and incremental sync state
+    manifest = InvoiceManifest(cfg.download_dir)
+    file_managers = {}
+    sync_states = {}
+    for name in teams:
+        team_dir = team_download_dir(cfg, name)
+        file_managers[name] = FileManager(team_dir, manifest=manifest, team=name)
+        sync_states[name] = SyncState(team_dir)
+    run_started = datetime.now()
+    team_counts = {
+        name: {DOWNLOADED: 0, SKIPPED: 0, UNCHANGED: 0, ERROR: 0} for name in teams
+    }
+    result: Dict[str, Any] = {
+        "downloaded": 0,
+        "skipped": 0,
+        "unchanged": 0,
+        "errors": 0,
+        "unmatched": 0,
+        "total": 0,
+        "teams": team_counts,
+    }
+
+    print_info(
+        f"Starting invoice fetch for team{'s' if len(teams) > 1 else ''}: "
+        + ", ".join(teams)
+    )
+
+    window_start = run_started - timedelta(days=days)
+    if not full and not refresh and not since:
+        # One scan serves every team, so start at the oldest watermark. A
+        # team whose earlier runs left a gap in the window has none
+        overlap_days = cfg.get("sync.overlap_days", 3)
+        watermarks = [
+            s.watermark(overlap_days, window_start) for s in sync_states.values()
+        ]
+        known = [w for w in watermarks if w is not None]
+        watermark = min(known) if known and len(known) == len(watermarks) else None
+        if watermark and watermark > window_start:
+            since = watermark
+            print_info("Incremental fetch since last run (use --full to rescan)")
+
+    if since or until:
+        period = (f"from {since:%Y-%m-%d}" if since else f"in the past {days} days") + (
+            f" until {until:%Y-%m-%d}" if until else ""
+        )
+    else:
+        period = f"in the past {days} days"
+    print_info(f"Looking for orders {period}")
+    print_info(f"Download directory: {cfg.download_dir}")
+
+    if dry_run:
+        print_info("DRY RUN MODE - No files will be downloaded")
+    if refresh:
+        print_info("Re-checking invoices that were already downloaded")
+
+    # Authenticate, preferring a running browser daemon and then a saved
+    # session that is still valid
+    auth = AmazonBusinessAuth(cfg)
+    driver = None
+    session = None
+    if not fresh_login:
+        if use_daemon:
+            with console.status("[bold green]Checking for browser daemon..."):
+                driver = auth.attach_daemon()
+        if not driver:
+            with console.status("[bold green]Checking saved session..."):
+                session = auth.restore_session()
+
+    if driver:
+        print_success("Attached to running browser daemon")
+    elif session:
+        print_success("Reusing saved Amazon Business session")
+    elif sso:
+        print_info("Using SSO authentication - browser will open for login")
+        driver = auth.login(interactive=True)
+        print_success("Successfully authenticated with Amazon Business")
+    else:
+        with console.status("[bold green]Authenticating with Amazon Business..."):
+            driver = auth.login()
         print_success("Successfully authenticated with Amazon Business")
 
-        try:
-            client = InvoiceClient(cfg, driver)
-
-            with console.status("[bold green]Fetching recent orders..."):
-                orders = client.get_recent_orders(days)
+    concurrency = concurrency or cfg.get("client.concurrency")
+    client = None
 
-            print_info(f"Found {len(orders)} orders in the past {days} days")
+    try:
+        if session:
+            client = InvoiceClient(
+                cfg,
+                session=session,
+                driver_factory=auth.resume_browser,
+                routing_fields=router.has_rules,
+                concurrency=concurrency,
+            )
+        else:
+            client = InvoiceClient(
+                cfg,
+                driver,
+                routing_fields=router.has_rules,
+                concurrency=concurrency,
+            )
 
-            if not orders:
-                print_info("No orders found")
-                return
+        # Process orders while they are still being listed
+        downloader = downloader_class(
+            client,
+            concurrency=concurrency,
+            dry_run=dry_run,
+            route=lambda order: file_managers[order["team"]],
+            refresh=refresh,
+        )
+        # Only the newest order is kept for the sync watermark
+        newest_orders: list = []
+
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+            disable=quiet,
+        ) as progress:
+            # The total is unknown until listing finishes
+            task = progress.add_task("Fetching recent orders...", total=None)
+
+            def routed_orders():
+                orders = client.iter_orders(
+                    days, since=since or window_start, until=until
+                )
+                for order in orders:
+                    result["total"] += 1
+                    if not newest_orders or order["date"] > newest_orders[0]["date"]:
+                        newest_orders[:] = [order]
+
+                    order["team"] = router.route(order)
+                    if order["team"]:
+                        routed = result["total"] - result["unmatched"]
+                        progress.update(task, total=routed)
+                        yield order
+                    else:
+                        result["unmatched"] += 1
+
+            def report(order: dict, status: str, message: str) -> None:
+                order_num = order.get("order_number", "Unknown")
+                progress.update(task, description=f"Processed order {order_num}")
+                team_counts[order["team"]][status] += 1
+
+                if status == ERROR:
+                    print_error(message)
+                elif quiet:
+                    pass
+                elif status == DOWNLOADED and not dry_run:
+                    print_success(message)
+                else:
+                    print_info(message)
+
+                progress.advance(task)
+
+            counts = downloader.run(routed_orders(), on_result=report)
+
+        print_info(f"Found {result['total']} orders {period}")
+        if not result["total"]:
+            print_info("No orders found")
+        if result["unmatched"]:
+            print_info(f"{result['unmatched']} orders matched none of the teams")
+
+        result["downloaded"] = counts[DOWNLOADED]
+        result["skipped"] = counts[SKIPPED]
+        result["unchanged"] = counts[UNCHANGED]
+        result["errors"] = counts[ERROR]
+
+    finally:
+        if auth.probe is not None:
+            _log_probe_timings(auth.probe.summary())
+        if client is not None:
+            _log_probe_timings(client.probe_summary())
+        auth.logout()
+        manifest.close()
+
+    # Only advance a team's watermark when all of its invoices were handled,
+    # so failed downloads are retried on the next run
+    if not dry_run:
+        # --until includes orders placed on that day
+        covered_until = until + timedelta(days=1) if until else None
+        for name, sync_state in sync_states.items():
+            if team_counts[name][ERROR] == 0:
+                sync_state.update(
+                    newest_orders, run_started, since or window_start, covered_until
+                )
+                sync_state.save()
+
+    return result
+
+
+def _print_fetch_summary(result: Dict[str, Any]) -> None:
+    """Print the summary tables for a fetch.
+
+    Args:
+        result: Result returned by ``_run_fetch``
+    """
+    from rich.table import Table
+
+    from .downloader import DOWNLOADED, SKIPPED, UNCHANGED, ERROR
+
+    summary_table = Table(title="Download Summary")
+    summary_table.add_column("Status", style="cyan")
+    summary_table.add_column("Count", justify="right", style="green")
+
+    summary_table.add_row("Downloaded", str(result["downloaded"]))
+    summary_table.add_row("Skipped (already exists)", str(result["skipped"]))
+    if result["unchanged"]:
+        summary_table.add_row("Unchanged (not modified)", str(result["unchanged"]))
+    summary_table.add_row("Errors", str(result["errors"]))
+    if result["unmatched"]:
+        summary_table.add_row("No matching team", str(result["unmatched"]))
+    summary_table.add_row("Total processed", str(result["total"]))
+
+    console.print(summary_table)
+
+    if len(result["teams"]) > 1:
+        team_table = Table(title="Per-Team Summary")
+        team_table.add_column("Team", style="cyan")
+        team_table.add_column("Downloaded", justify="right", style="green")
+        team_table.add_column("Skipped", justify="right", style="yellow")
+        if result["unchanged"]:
+            team_table.add_column("Unchanged", justify="right", style="yellow")
+        team_table.add_column("Errors", justify="right", style="red")
+        for name, counts in result["teams"].items():
+            row = [name, str(counts[DOWNLOADED]), str(counts[SKIPPED])]
+            if result["unchanged"]:
+                row.append(str(counts[UNCHANGED]))
+            row.append(str(counts[ERROR]))
+            team_table.add_row(*row)
+        console.print(team_table)
 
-            # Process orders
-            downloaded_count = 0
-            skipped_count = 0
-            error_count = 0
 
-            with Progress(
-                SpinnerColumn(),
-                TextColumn("[progress.description]{task.description}"),
-                console=console,
-            ) as progress:
-                task = progress.add_task("Processing invoices...", total=len(orders))
+@main.command()
+@click.option(
+    "--account",
+    "accounts",
+    multiple=True,
+    help="Account profile to fetch (repeatable, default: all profiles)",
+)
+@click.option(
+    "--days", default=90, help="Number of days to look back for invoices (default: 90)"
+)
+@click.option(
+    "--since",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Only fetch invoices for orders placed on or after this date (YYYY-MM-DD)",
+)
+@click.option(
+    "--until",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Only fetch invoices for orders placed on or before this date (YYYY-MM-DD)",
+)
+@click.option(
+    "--config", type=click.Path(exists=True), help="Path to configuration file"
+)
+@click.option(
+    "--dry-run",
+    is_flag=True,
+    help="Show what would be downloaded without actually downloading",
+)
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    help="Number of invoices to download in parallel per account",
+)
+@click.option(
+    "--max-browsers",
+    type=click.IntRange(min=1),
+    help="Maximum accounts fetched at once (default: accounts.max_browsers)",
+)
+@click.option(
+    "--fresh-login",
+    is_flag=True,
+    help="Ignore any saved session and log in again",
+)
+@click.option(
+    "--full",
+    is_flag=True,
+    help="Rescan the whole lookback window instead of only orders newer than "
+    "the last successful run",
+)
+@click.option("--verbose", is_flag=True, help="Enable detailed logging")
+def fetch_accounts(
+    accounts: Tuple[str, ...],
+    days: int,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    config: str,
+    dry_run: bool,
+    concurrency: int,
+    max_browsers: int,
+    fresh_login: bool,
+    full: bool,
+    verbose: bool,
+):
+    """Fetch invoices for several Amazon Business accounts in parallel.
+
+    Each account profile from the accounts section of the configuration runs
+    in its own process with its own Chrome profile and download directory.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    import multiprocessing
 
-                for order in orders:
-                    order_num = order.get("order_number", "Unknown")
-                    order_date = order.get("date")
-                    order_total = order.get("total", "0.00")
-                    invoice_url = order.get("invoice_url")
-
-                    progress.update(task, description=f"Processing order {order_num}")
-
-                    if not invoice_url:
-                        print_error(f"No invoice URL found for order {order_num}")
-                        error_count += 1
-                        progress.advance(task)
-                        continue
-
-                    if not order_date:
-                        print_error(f"No date found for order {order_num}")
-                        error_count += 1
-                        progress.advance(task)
-                        continue
-
-                    # Check if file already exists
-                    if file_manager.file_exists(order_date, order_total, order_num):
-                        print_info(f"Invoice {order_num} already exists, skipping")
-                        skipped_count += 1
-                        progress.advance(task)
-                        continue
-
-                    if dry_run:
-                        filename = file_manager.generate_filename(
-                            order_date, order_total, order_num
-                        )
-                        print_info(f"Would download: {filename}")
-                        downloaded_count += 1
-                        progress.advance(task)
-                        continue
-
-                    # Download invoice
-                    try:
-                        invoice_content = client.download_invoice(invoice_url)
-                        file_path = file_manager.save_invoice(
-                            invoice_content, order_date, order_total, order_num
-                        )
-                        print_success(f"Downloaded: {file_path.name}")
-                        downloaded_count += 1
-                    except (NetworkError, FileError) as e:
-                        print_error(f"Failed to download invoice {order_num}: {e}")
-                        error_count += 1
-
-                    progress.advance(task)
+    from rich.table import Table
 
-        finally:
-            auth.logout()
+    if since and until and since > until:
+        raise click.BadParameter("must not be after --until", param_hint="--since")
 
-        # Print summary
-        summary_table = Table(title="Download Summary")
-        summary_table.add_column("Status", style="cyan")
-        summary_table.add_column("Count", justify="right", style="green")
+    try:
+        cfg = Config(Path(config) if config else None)
+        profiles = cfg.get("accounts.profiles") or []
+        names = [profile.get("name") for profile in profiles]
+        if not profiles or not all(names):
+            raise ConfigurationError(
+                "accounts.profiles must list at least one profile, each with a name"
+            )
 
-        summary_table.add_row("Downloaded", str(downloaded_count))
-        summary_table.add_row("Skipped (already exists)", str(skipped_count))
-        summary_table.add_row("Errors", str(error_count))
-        summary_table.add_row("Total processed", str(len(orders)))
+        unknown = set(accounts) - set(names)
+        if unknown:
+            raise ConfigurationError(
+                f"Unknown account profiles: {', '.join(sorted(unknown))}"
+            )
+        if accounts:
+            profiles = [p for p in profiles if p["name"] in accounts]
+
+        max_browsers = max_browsers or cfg.get("accounts.max_browsers", 2)
+        workers = min(len(profiles), max_browsers)
+        options = {
+            "days": days,
+            "since": since,
+            "until": until,
+            "dry_run": dry_run,
+            "concurrency": concurrency,
+            "fresh_login": fresh_login,
+            "full": full,
+            "verbose": verbose,
+        }
+        print_info(
+            f"Fetching {len(profiles)} accounts with up to {workers} browsers at once"
+        )
 
-        console.print(summary_table)
+        results = []
+        # Spawned workers start clean instead of inheriting this process's
+        # threads and open connections
+        with ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        ) as executor:
+            futures = [
+                executor.submit(_fetch_account, config, profile, options)
+                for profile in profiles
+            ]
+            for future in as_completed(futures):
+                results.append(future.result())
+
+        results.sort(key=lambda result: names.index(result["account"]))
+
+        table = Table(title="Account Summary")
+        table.add_column("Account", style="cyan")
+        table.add_column("Downloaded", justify="right", style="green")
+        table.add_column("Skipped", justify="right", style="yellow")
+        table.add_column("Errors", justify="right", style="red")
+        table.add_column("Status")
+        for result in results:
+            table.add_row(
+                result["account"],
+                str(result["downloaded"]),
+                str(result["skipped"]),
+                str(result["errors"]),
+                f"[red]{result['error']}[/red]" if result["error"] else "OK",
+            )
+        table.add_row(
+            "Total",
+            str(sum(r["downloaded"] for r in results)),
+            str(sum(r["skipped"] for r in results)),
+            str(sum(r["errors"] for r in results)),
+            "",
+        )
+        console.print(table)
 
-        if error_count > 0:
+        if any(r["errors"] or r["error"] for r in results):
             sys.exit(1)
 
     except ConfigurationError as e:
         print_error(f"Configuration error: {e}")
         sys.exit(1)
-    except AuthenticationError as e:
-        print_error(f"Authentication error: {e}")
-        sys.exit(1)
-    except InvoiceFetcherError as e:
-        print_error(str(e))
-        sys.exit(1)
     except KeyboardInterrupt:
         print_info("Operation cancelled by user")
         sys.exit(1)
@@ -208,6 +704,80 @@ def fetch(team: str, days: int, config: str, dry_run: bool, sso: bool):
         sys.exit(1)
 
 
+def _account_config(cfg: Config, profile: Dict[str, Any]) -> Config:
+    """Build the configuration for one account profile.
+
+    Every account gets its own download root and Chrome profile directory so
+    that parallel workers don't share browser state or manifests.
+
+    Args:
+        cfg: Base configuration
+        profile: Account profile from ``accounts.profiles``
+
+    Returns:
+        Configuration for the account
+    """
+    name = profile["name"]
+    amazon = {
+        key: profile[key] for key in ("email", "sso_url", "use_sso") if key in profile
+    }
+    return cfg.with_overrides(
+        {
+            "download_dir": profile.get("download_dir") or str(cfg.download_dir / name),
+            "amazon": amazon,
+            "selenium": {
+                "user_data_dir": str(Config.DEFAULT_CONFIG_DIR / "profiles" / name)
+            },
+        }
+    )
+
+
+def _fetch_account(
+    config: Optional[str], profile: Dict[str, Any], options: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Fetch invoices for one account profile in a worker process.
+
+    Args:
+        config: Path to the configuration file, if given
+        profile: Account profile from ``accounts.profiles``
+        options: fetch-accounts command line options
+
+    Returns:
+        The ``_run_fetch`` result with ``account`` and ``error`` added
+    """
+    global _message_prefix
+    from .teams import TeamRouter
+
+    name = profile["name"]
+    _message_prefix = f"{name}: "
+    options = dict(options)
+    verbose = options.pop("verbose", False)
+
+    try:
+        cfg = _account_config(Config(Path(config) if config else None), profile)
+        cfg.validate()
+        configure_logging(cfg, verbose)
+
+        # Without teams the account's invoices go to a folder named after it
+        teams = tuple(
+            profile.get("teams") or TeamRouter.configured_teams(cfg) or [name]
+        )
+        result = _run_fetch(
+            cfg,
+            teams,
+            use_daemon=False,
+            quiet=True,
+            **options,
+        )
+        result["error"] = None
+    except Exception as e:
+        print_error(str(e))
+        result = {"downloaded": 0, "skipped": 0, "errors": 0, "error": str(e)}
+
+    result["account"] = name
+    return result
+
+
 @main.command()
 @click.option("--config", type=click.Path(), help="Path to configuration file")
 @click.option(
@@ -217,6 +787,9 @@ def fetch(team: str, days: int, config: str, dry_run: bool, sso: bool):
 )
 def setup(config: str, sso: bool):
     """Set up configuration and credentials."""
+    from rich.panel import Panel
+
+    from .auth import AmazonBusinessAuth
 
     try:
         config_path = Path(config) if config else Config.DEFAULT_CONFIG_FILE
@@ -273,6 +846,87 @@ def setup(config: str, sso: bool):
         sys.exit(1)
 
 
+@main.command()
+@click.option(
+    "--config", type=click.Path(exists=True), help="Path to configuration file"
+)
+@click.option(
+    "--sso",
+    is_flag=True,
+    help="Use SSO authentication - browser will open for login",
+)
+@click.option("--stop", is_flag=True, help="Stop the running daemon")
+@click.option("--status", is_flag=True, help="Show whether a daemon is running")
+def browserd(config: str, sso: bool, stop: bool, status: bool):
+    """Keep a logged-in browser running for subsequent fetches.
+
+    While the daemon runs, fetch attaches to its browser instead of starting
+    Chrome and logging in again. Stop it with Ctrl+C or --stop.
+    """
+    from .auth import AmazonBusinessAuth
+    from .browserd import (
+        BrowserDaemon,
+        STATUS,
+        STOP,
+        default_state_path,
+        send_command,
+    )
+
+    try:
+        config_path = Path(config) if config else None
+        cfg = Config(config_path)
+        state_path = default_state_path(cfg)
+
+        if stop or status:
+            reply = send_command(state_path, STOP if stop else STATUS)
+            if reply is None:
+                print_info("No browser daemon is running")
+            elif stop:
+                print_success("Browser daemon stopped")
+            elif reply.get("logged_in") is False:
+                print_info(
+                    f"Browser daemon running (pid {reply['pid']}) but its "
+                    "session has expired - restart it to log in again"
+                )
+            else:
+                print_info(
+                    f"Browser daemon running (pid {reply['pid']}, "
+                    f"browser at {reply['debugger_address']})"
+                )
+            return
+
+        if send_command(state_path, STATUS) is not None:
+            print_info("A browser daemon is already running")
+            return
+
+        cfg.validate()
+        configure_logging(cfg)
+
+        daemon = BrowserDaemon(AmazonBusinessAuth(cfg), state_path)
+        try:
+            if sso:
+                print_info("Using SSO authentication - browser will open for login")
+                daemon.start(interactive=True)
+            else:
+                with console.status(
+                    "[bold green]Authenticating with Amazon Business..."
+                ):
+                    daemon.start()
+            print_success("Browser daemon ready - press Ctrl+C to stop")
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            print_info("Stopping browser daemon")
+        finally:
+            daemon.shutdown()
+
+    except AuthenticationError as e:
+        print_error(f"Authentication error: {e}")
+        sys.exit(1)
+    except Exception as e:
+        print_error(f"Browser daemon failed: {e}")
+        sys.exit(1)
+
+
 @main.command()
 @click.option("--team", help="Team name to list invoices for (optional)")
 @click.option("--year", type=int, help="Year to filter invoices (optional)")
@@ -281,33 +935,24 @@ def setup(config: str, sso: bool):
 )
 def list_invoices(team: str, year: int, config: str):
     """List existing invoices."""
+    from rich.table import Table
+
+    from .manifest import InvoiceManifest
+    from .teams import team_download_dirs
 
     try:
         config_path = Path(config) if config else None
         cfg = Config(config_path)
 
-        if team:
-            base_dir = cfg.download_dir / team
-        else:
-            base_dir = cfg.download_dir
-
-        if not base_dir.exists():
-            print_info("No invoices found")
-            return
-
-        if team:
-            file_manager = FileManager(base_dir)
-            invoices = file_manager.list_existing_invoices(year)
-        else:
-            # List all teams
-            teams = [d for d in base_dir.iterdir() if d.is_dir()]
-            invoices = []
-            for team_dir in teams:
-                fm = FileManager(team_dir)
-                team_invoices = fm.list_existing_invoices(year)
-                for file_path, info in team_invoices:
-                    info["team"] = team_dir.name
-                    invoices.append((file_path, info))
+        manifest = InvoiceManifest(cfg.download_dir)
+        try:
+            if not manifest.is_indexed():
+                # First listing of an existing archive: build the index once
+                with console.status("[bold green]Indexing invoices..."):
+                    manifest.reindex(team_download_dirs(cfg))
+            invoices = manifest.query(team=team, year=year)
+        finally:
+            manifest.close()
 
         if not invoices:
             print_info("No invoices found")
@@ -344,5 +989,32 @@ def list_invoices(team: str, year: int, config: str):
         sys.exit(1)
 
 
+@main.command()
+@click.option(
+    "--config", type=click.Path(exists=True), help="Path to configuration file"
+)
+def reindex(config: str):
+    """Rebuild the invoice manifest from the files on disk."""
+    from .manifest import InvoiceManifest
+    from .teams import team_download_dirs
+
+    try:
+        config_path = Path(config) if config else None
+        cfg = Config(config_path)
+
+        manifest = InvoiceManifest(cfg.download_dir)
+        try:
+            with console.status("[bold green]Indexing invoices..."):
+                count = manifest.reindex(team_download_dirs(cfg))
+        finally:
+            manifest.close()
+
+        print_success(f"Indexed {count} invoices in {manifest.path}")
+
+    except Exception as e:
+        print_error(f"Failed to rebuild invoice manifest: {e}")
+        sys.exit(1)
+
+
 if __name__ == "__main__":
     main()
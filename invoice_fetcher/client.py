@@ -1,114 +1,675 @@
 """Amazon Business invoice client for fetching invoices."""
 
+import logging
+import re
+import threading
 import time
 import requests
+import lxml.html
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import Callable, Iterable, Iterator, List, Dict, Any, Optional, Tuple
+from urllib.parse import urljoin
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 from .config import Config
-from .exceptions import NetworkError, InvoiceNotFoundError
+from .exceptions import (
+    AuthenticationError,
+    IncompleteDownloadError,
+    InvoiceNotFoundError,
+    NetworkError,
+    WebDriverError,
+)
+from .partial import PartialDownload, conditional_headers
+from .probe import SelectorProbe, SelectorStats
+from .ratelimit import RateLimiter
+from .readiness import PageReadiness
+from .transport import configure_session
+
+logger = logging.getLogger(__name__)
 
 
 class InvoiceClient:
     """Client for fetching invoices from Amazon Business."""
 
-    def __init__(self, config: Config, driver: webdriver.Chrome):
+    USER_AGENT = (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    )
+
+    # Bytes read per chunk when streaming invoice PDFs
+    CHUNK_SIZE = 64 * 1024
+
+    # Statuses meaning the session cookies are no longer accepted
+    AUTH_FAILURE_STATUSES = (401, 403)
+
+    # Possible URLs for the order history
+    ORDER_URLS = [
+        "https://business.amazon.com/orders",
+        "https://business.amazon.com/orders/history",
+        "https://business.amazon.com/your-account/orders",
+    ]
+
+    # Elements indicating the order history page has loaded
+    ORDER_PAGE_SELECTORS = [
+        "[data-testid='order-card']",
+        ".order-card",
+        "#ordersContainer",
+        ".a-section.a-spacing-none.order-info",
+        "[data-test-id='order-tile']",
+    ]
+    ORDERS_NAV_SELECTORS = [
+        "a[href*='orders']",
+        "a[href*='order-history']",
+        "#nav-orders",
+        "[data-nav-ref='nav_orders']",
+    ]
+    LOAD_MORE_SELECTORS = [
+        "button[data-testid='load-more']",
+        ".load-more-button",
+        "button[aria-label*='more']",
+    ]
+    PDF_SELECTORS = [
+        "a[href$='.pdf']",
+        "iframe[src*='pdf']",
+        "embed[src*='pdf']",
+        "[data-testid='download-pdf']",
+    ]
+
+    # Selectors shared by the Selenium and HTTP order listing backends
+    ORDER_CARD_SELECTORS = [
+        "[data-testid='order-card']",
+        ".order-card",
+        ".a-section.a-spacing-none.order-info",
+        "[data-test-id='order-tile']",
+    ]
+    ORDER_NUMBER_SELECTORS = [
+        "[data-testid='order-number']",
+        ".order-number",
+        ".order-info-item:contains('Order')",
+        "[class*='order-number']",
+    ]
+    ORDER_DATE_SELECTORS = [
+        "[data-testid='order-date']",
+        ".order-date",
+        "[class*='order-date']",
+        ".date-info",
+    ]
+    ORDER_TOTAL_SELECTORS = [
+        "[data-testid='order-total']",
+        ".order-total",
+        "[class*='total']",
+        ".price",
+    ]
+    INVOICE_LINK_SELECTORS = [
+        "a[href*='invoice']",
+        "a[href*='receipt']",
+        "a[data-testid*='invoice']",
+        ".invoice-link",
+    ]
+    # Optional order card fields used to route invoices to teams
+    ORDER_REQUESTER_SELECTORS = [
+        "[data-testid='order-requester']",
+        ".order-requester",
+        "[class*='requester']",
+        "[class*='ordered-by']",
+    ]
+    ORDER_GROUP_SELECTORS = [
+        "[data-testid='purchasing-group']",
+        ".purchasing-group",
+        "[class*='group-name']",
+    ]
+    ORDER_PO_SELECTORS = [
+        "[data-testid='po-number']",
+        ".po-number",
+        "[class*='purchase-order']",
+    ]
+    # Order field -> selectors
+    ROUTING_FIELDS = {
+        "requester": ORDER_REQUESTER_SELECTORS,
+        "purchasing_group": ORDER_GROUP_SELECTORS,
+        "po_number": ORDER_PO_SELECTORS,
+    }
+    # Labels stripped from routing field texts, e.g. "Requested by: Jane"
+    ROUTING_LABEL_PATTERN = re.compile(
+        r"^(?:requested by|requester|ordered by|purchasing group|group|"
+        r"purchase order(?: number)?|po(?: number)?)\b\s*[:#]?\s*",
+        re.IGNORECASE,
+    )
+
+    NEXT_PAGE_SELECTORS = [
+        "ul.a-pagination li.a-last a",
+        "a[rel='next']",
+        "a[data-testid='pagination-next']",
+    ]
+
+    # Returns candidate date texts of the last (oldest) order card loaded
+    LAST_CARD_DATES_SCRIPT = """
+        const [cardSelectors, dateSelectors] = arguments;
+        for (const cardSel of cardSelectors) {
+            let cards;
+            try { cards = document.querySelectorAll(cardSel); } catch (e) { continue; }
+            if (!cards.length) { continue; }
+            const card = cards[cards.length - 1];
+            const texts = [];
+            for (const sel of dateSelectors) {
+                try {
+                    const el = card.querySelector(sel);
+                    if (el) { texts.push(el.innerText.trim()); }
+                } catch (e) {}
+            }
+            return texts;
+        }
+        return [];
+    """
+
+    # Collects candidate texts/links for every order card in one round trip.
+    # Returns [index of the card selector that matched (-1 if none), cards].
+    # For each field the first match of every selector is returned as a
+    # [selector, value] pair in selector order, leaving the regex and date
+    # parsing to Python.
+    EXTRACT_ORDERS_SCRIPT = """
+        const [cardSelectors, fields] = arguments;
+        const queryAll = (root, sel) => {
+            try { return root.querySelectorAll(sel); } catch (e) { return []; }
+        };
+        const query = (root, sel) => {
+            try { return root.querySelector(sel); } catch (e) { return null; }
+        };
+
+        let matched = -1;
+        let cards = [];
+        for (const [index, sel] of cardSelectors.entries()) {
+            const found = queryAll(document, sel);
+            if (found.length) { matched = index; cards = Array.from(found); break; }
+        }
+
+        return [matched, cards.map((card) => {
+            const result = {};
+            for (const [name, spec] of Object.entries(fields)) {
+                result[name] = [];
+                for (const sel of spec.selectors) {
+                    const el = query(card, sel);
+                    if (el) {
+                        result[name].push([
+                            sel,
+                            spec.attr ? (el[spec.attr] || "") : el.innerText.trim(),
+                        ]);
+                    }
+                }
+            }
+            return result;
+        })];
+    """
+
+    def __init__(
+        self,
+        config: Config,
+        driver: Optional[webdriver.Chrome] = None,
+        session: Optional[requests.Session] = None,
+        driver_factory: Optional[Callable[[], webdriver.Chrome]] = None,
+        routing_fields: bool = False,
+        concurrency: Optional[int] = None,
+    ):
         """Initialize the invoice client.
 
+        Either an authenticated driver or an authenticated session must be
+        given. When built from a session, the browser is only started (via
+        ``driver_factory``) if a WebDriver is actually needed.
+
         Args:
             config: Configuration object
             driver: Authenticated WebDriver instance
+            session: Authenticated requests session, e.g. restored from disk
+            driver_factory: Callable returning an authenticated WebDriver on demand
+            routing_fields: If True, also extract the requester, purchasing
+                group and PO number of each order for team routing
+            concurrency: Number of parallel downloads, used to size the HTTP
+                connection pools
         """
+        if driver is None and session is None:
+            raise ValueError("Either an authenticated driver or session is required")
+
         self.config = config
-        self.driver = driver
-        self.session = requests.Session()
+        self._driver = driver
+        self._driver_factory = driver_factory
+        self.routing_fields = routing_fields
+        self.session = configure_session(
+            session or requests.Session(),
+            config,
+            concurrency=concurrency,
+            user_agent=self.USER_AGENT,
+        )
+
+        # Shared by all requests so concurrent downloads back off together
+        self.rate_limiter = RateLimiter.from_config(config)
+
+        # WebDriver is not thread-safe; serialise access when downloads run
+        # concurrently
+        self._driver_lock = threading.RLock()
+        self._probe: Optional[SelectorProbe] = None
+        self._readiness: Optional[PageReadiness] = None
+        self.selector_stats = SelectorStats.from_config(config)
+
+        # Cookies are copied from the browser only when stale, not per request
+        self.cookie_ttl = config.get("client.cookie_ttl", 300)
+        self._cookies_synced_at: Optional[float] = None
+        self._referer = config.get("amazon.business_url", "https://business.amazon.com")
 
         # Copy cookies from selenium to requests session
-        self._sync_cookies()
+        if self._driver is not None:
+            self._sync_cookies()
+
+    @property
+    def driver(self) -> webdriver.Chrome:
+        """WebDriver instance, started on first use if not provided."""
+        with self._driver_lock:
+            if self._driver is None:
+                if self._driver_factory is None:
+                    raise WebDriverError("No WebDriver available for this client")
+                self._driver = self._driver_factory()
+                self._sync_cookies()
+            return self._driver
+
+    @property
+    def probe(self) -> SelectorProbe:
+        """Selector probe bound to the WebDriver."""
+        with self._driver_lock:
+            if self._probe is None:
+                self._probe = SelectorProbe(
+                    self.driver,
+                    self.config.get("selenium.timeout", 30),
+                    stats=self.selector_stats,
+                )
+            return self._probe
+
+    def probe_summary(self) -> Dict[str, Dict[str, float]]:
+        """Summarise selector probe timings without starting a browser.
+
+        Returns:
+            ``SelectorProbe.summary`` of the probe, or an empty dictionary
+            if the browser was never used
+        """
+        return self._probe.summary() if self._probe is not None else {}
+
+    @property
+    def readiness(self) -> PageReadiness:
+        """Page readiness waiter bound to the WebDriver."""
+        with self._driver_lock:
+            if self._readiness is None:
+                self._readiness = PageReadiness(
+                    self.driver,
+                    timeout=self.config.get("selenium.ready_timeout", 10),
+                    quiet_period=self.config.get("selenium.quiet_period", 0.5),
+                )
+            return self._readiness
 
     def _sync_cookies(self) -> None:
-        """Sync cookies from Selenium driver to requests session."""
-        for cookie in self.driver.get_cookies():
-            self.session.cookies.set(
-                cookie["name"],
-                cookie["value"],
-                domain=cookie.get("domain"),
-                path=cookie.get("path"),
-            )
+        """Sync cookies from Selenium driver to requests session.
+
+        Also remembers the browser's current page as the Referer for
+        downloads.
+        """
+        with self._driver_lock:
+            for cookie in self.driver.get_cookies():
+                self.session.cookies.set(
+                    cookie["name"],
+                    cookie["value"],
+                    domain=cookie.get("domain"),
+                    path=cookie.get("path"),
+                )
+            self._referer = self.driver.current_url or self._referer
+            self._cookies_synced_at = time.monotonic()
+
+    def refresh_cookies(self, force: bool = False) -> bool:
+        """Sync cookies from the browser if the cached copy is stale.
+
+        Args:
+            force: Sync even if the cookies are within their TTL
+
+        Returns:
+            True if the cookies were synced
+
+        Raises:
+            AuthenticationError: If a sync is forced on a client running on a
+                restored session without a browser; a browser started now
+                would only be seeded with the same rejected cookies
+        """
+        with self._driver_lock:
+            if self._driver is None:
+                if force and self._driver_factory is not None:
+                    raise AuthenticationError(
+                        "Saved session was rejected; log in again with " "--fresh-login"
+                    )
+                return False
+
+            synced_at = self._cookies_synced_at
+            if (
+                not force
+                and synced_at is not None
+                and time.monotonic() - synced_at < self.cookie_ttl
+            ):
+                return False
+
+            self._sync_cookies()
+            return True
+
+    @property
+    def can_refresh_cookies(self) -> bool:
+        """Whether a rejected request should force a cookie refresh.
+
+        On a restored session without a browser, the forced refresh raises
+        ``AuthenticationError`` rather than retrying.
+        """
+        return self._driver is not None or self._driver_factory is not None
+
+    @property
+    def referer(self) -> str:
+        """Referer sent with invoice downloads."""
+        return self._referer
+
+    def _invalidate_cookies(self) -> None:
+        """Mark the cookie copy stale after the browser changed pages."""
+        self._cookies_synced_at = None
+
+    def _is_auth_failure(self, response: requests.Response) -> bool:
+        """Check whether a response was rejected for missing authentication.
+
+        Args:
+            response: Response to check
+
+        Returns:
+            True on 401/403 or a redirect to the sign-in page
+        """
+        return (
+            response.status_code in self.AUTH_FAILURE_STATUSES
+            or "signin" in str(response.url).lower()
+        )
 
     def navigate_to_orders(self) -> None:
         """Navigate to the orders/invoices page."""
         try:
             # Try different possible URLs for orders
-            order_urls = [
-                "https://business.amazon.com/orders",
-                "https://business.amazon.com/orders/history",
-                "https://business.amazon.com/your-account/orders",
-            ]
-
-            wait = WebDriverWait(self.driver, 30)
-
-            for url in order_urls:
+            for url in self.ORDER_URLS:
                 try:
                     self.driver.get(url)
                     # Wait for the page to load and check if we're on an orders page
-                    time.sleep(3)
+                    self.readiness.page_ready()
 
                     # Look for order-related elements
-                    order_indicators = [
-                        "[data-testid='order-card']",
-                        ".order-card",
-                        "#ordersContainer",
-                        ".a-section.a-spacing-none.order-info",
-                        "[data-test-id='order-tile']",
-                    ]
-
-                    for selector in order_indicators:
-                        try:
-                            wait.until(
-                                EC.presence_of_element_located(
-                                    (By.CSS_SELECTOR, selector)
-                                )
-                            )
-                            return  # Successfully found orders page
-                        except TimeoutException:
-                            continue
+                    if self.probe.find(
+                        self.ORDER_PAGE_SELECTORS, timeout=30, group="order_page"
+                    ):
+                        self._invalidate_cookies()
+                        return  # Successfully found orders page
 
                 except Exception:
                     continue
 
             # If we get here, try to find orders link in navigation
-            nav_selectors = [
-                "a[href*='orders']",
-                "a[href*='order-history']",
-                "#nav-orders",
-                "[data-nav-ref='nav_orders']",
-            ]
-
-            for selector in nav_selectors:
-                try:
-                    orders_link = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    orders_link.click()
-                    time.sleep(3)
-                    return
-                except NoSuchElementException:
-                    continue
+            result = self.probe.find(self.ORDERS_NAV_SELECTORS, group="orders_nav")
+            if result:
+                result.match.click()
+                self.readiness.page_ready()
+                self._invalidate_cookies()
+                return
 
             raise InvoiceNotFoundError("Could not navigate to orders page")
 
         except Exception as e:
             raise InvoiceNotFoundError(f"Failed to navigate to orders: {e}")
 
-    def get_recent_orders(self, days: int = 90) -> List[Dict[str, Any]]:
-        """Get recent orders from the past specified days.
+    def get_recent_orders(
+        self,
+        days: int = 90,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get recent orders from the past specified days or a date range.
 
         Args:
-            days: Number of days to look back
+            days: Number of days to look back (ignored if ``since`` is given)
+            since: Only return orders placed on or after this date
+            until: Only return orders placed on or before this date
+
+        Returns:
+            List of order dictionaries with basic information
+        """
+        return list(self.iter_orders(days, since=since, until=until))
+
+    def iter_orders(
+        self,
+        days: int = 90,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield recent orders as soon as they are extracted.
+
+        Uses the backend selected by ``client.backend``. The ``http`` backend
+        yields each page of the order history as it is parsed, so invoices
+        can be downloaded while later pages are still being fetched, and
+        falls back to Selenium if the order history cannot be read over HTTP.
+        The Selenium backend keeps the browser to itself while it scrolls and
+        yields the orders once loading is complete. The order history is
+        newest first, so both backends stop loading more orders once they
+        reach orders older than the start of the range.
+
+        Args:
+            days: Number of days to look back (ignored if ``since`` is given)
+            since: Only yield orders placed on or after this date
+            until: Only yield orders placed on or before this date
+
+        Yields:
+            Order dictionaries with basic information
+        """
+        cutoff_date = since or datetime.now() - timedelta(days=days)
+        # ``until`` is inclusive of the whole day
+        end_date = until + timedelta(days=1) if until else None
+        # Orders already yielded before a fallback to Selenium
+        seen = set()
+
+        try:
+            if self.config.get("client.backend", "http") == "http":
+                try:
+                    for order_data in self._iter_orders_http(cutoff_date, end_date):
+                        seen.add(order_data["order_number"])
+                        yield order_data
+                    return
+                except (NetworkError, InvoiceNotFoundError) as e:
+                    logger.warning(
+                        "HTTP order listing failed, falling back to Selenium: %s", e
+                    )
+
+            # Downloads that need the browser wait until scrolling is done
+            with self._driver_lock:
+                orders = self._get_recent_orders_selenium(cutoff_date, end_date)
+
+            for order_data in orders:
+                if not seen or order_data["order_number"] not in seen:
+                    yield order_data
+        finally:
+            if self.selector_stats:
+                self.selector_stats.save()
+
+    @staticmethod
+    def _in_range(
+        order_data: Dict[str, Any], cutoff_date: datetime, end_date: Optional[datetime]
+    ) -> bool:
+        """Check whether an order falls within [cutoff_date, end_date)."""
+        order_date = order_data["date"]
+        return order_date >= cutoff_date and (end_date is None or order_date < end_date)
+
+    def _ordered(self, group: str, selectors: List[str]) -> List[str]:
+        """Order a selector group by past success, if adaptive ordering is on."""
+        if self.selector_stats:
+            return self.selector_stats.order(group, selectors)
+        return list(selectors)
+
+    def _record(self, group: str, matched: Optional[str], missed: List[str]) -> None:
+        """Record which selector of a group matched, if adaptive ordering is on."""
+        if self.selector_stats:
+            self.selector_stats.record(group, matched, missed)
+
+    def _iter_orders_http(
+        self, cutoff_date: datetime, end_date: Optional[datetime] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield recent orders by paging through the order history over HTTP.
+
+        Each page's orders are yielded before the next page is requested.
+        Paging stops at the first page containing orders older than
+        ``cutoff_date``.
+
+        Args:
+            cutoff_date: Only orders on or after this date are yielded
+            end_date: Only orders before this date are yielded
+
+        Yields:
+            Order dictionaries
+
+        Raises:
+            NetworkError: If the order history cannot be reached, the session
+                was redirected to sign-in, or a later page fails to load
+            InvoiceNotFoundError: If no order history page with recognisable
+                order cards could be found
+        """
+        headers = {"Accept": "text/html,application/xhtml+xml,*/*;q=0.8"}
+
+        for url in self.ORDER_URLS:
+            found_listing = False
+            visited = set()
+            page_url: Optional[str] = url
+
+            while page_url and page_url not in visited:
+                visited.add(page_url)
+
+                try:
+                    response = self._request(page_url, headers=headers, timeout=30)
+                except requests.RequestException as e:
+                    raise NetworkError(f"Failed to load order history {page_url}: {e}")
+
+                if "signin" in response.url.lower():
+                    raise NetworkError("Session was redirected to sign-in")
+
+                try:
+                    response.raise_for_status()
+                except requests.HTTPError as e:
+                    # An error status on a candidate URL just means the order
+                    # history lives elsewhere; once paging has begun it's a
+                    # failure
+                    if found_listing:
+                        raise NetworkError(
+                            f"Failed to load order history {page_url}: {e}"
+                        )
+                    break
+
+                document = lxml.html.fromstring(response.text)
+                cards = self._select_first(
+                    document, self.ORDER_CARD_SELECTORS, "order_card"
+                )
+                if not cards:
+                    break
+                found_listing = True
+
+                reached_cutoff = False
+                for card in cards:
+                    order_data = self._extract_order_data_html(card, response.url)
+                    if not order_data:
+                        continue
+                    if order_data["date"] < cutoff_date:
+                        reached_cutoff = True
+                    elif self._in_range(order_data, cutoff_date, end_date):
+                        yield order_data
+
+                if reached_cutoff:
+                    break
+
+                next_links = self._select_first(
+                    document, self.NEXT_PAGE_SELECTORS, "next_page"
+                )
+                next_href = next_links[0].get("href") if next_links else None
+                page_url = urljoin(response.url, next_href) if next_href else None
+
+            if found_listing:
+                return
+
+        raise InvoiceNotFoundError("No order history found over HTTP")
+
+    def _select_first(self, element, selectors: List[str], group: str) -> list:
+        """Return the matches of the first selector that matches anything.
+
+        Args:
+            element: lxml element to search within
+            selectors: CSS selectors to try
+            group: Selector group name used for adaptive ordering
+
+        Returns:
+            List of matching lxml elements (empty if nothing matched)
+        """
+        missed: List[str] = []
+        for selector in self._ordered(group, selectors):
+            try:
+                matches = element.cssselect(selector)
+            except Exception:
+                matches = []
+            if matches:
+                self._record(group, selector, missed)
+                return matches
+            missed.append(selector)
+
+        self._record(group, None, missed)
+        return []
+
+    def _extract_order_data_html(
+        self, order_element, base_url: str
+    ) -> Optional[Dict[str, Any]]:
+        """Extract order data from an order card parsed with lxml.
+
+        Mirrors ``_extract_order_data`` for the HTTP backend.
+
+        Args:
+            order_element: lxml element representing an order
+            base_url: URL of the page, used to resolve relative links
+
+        Returns:
+            Dictionary with order information or None if extraction fails
+        """
+
+        def first_matches(selectors: List[str]):
+            for selector in selectors:
+                try:
+                    matches = order_element.cssselect(selector)
+                except Exception:
+                    continue
+                if matches:
+                    yield selector, matches[0]
+
+        def texts(selectors: List[str]):
+            for selector, match in first_matches(selectors):
+                yield selector, " ".join(match.text_content().split())
+
+        return self._order_from_candidates(
+            texts(self.ORDER_NUMBER_SELECTORS),
+            texts(self.ORDER_DATE_SELECTORS),
+            texts(self.ORDER_TOTAL_SELECTORS),
+            (
+                (selector, urljoin(base_url, match.get("href")))
+                for selector, match in first_matches(self.INVOICE_LINK_SELECTORS)
+                if match.get("href")
+            ),
+            self._routing_candidates(texts),
+        )
+
+    def _get_recent_orders_selenium(
+        self, cutoff_date: datetime, end_date: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """Get recent orders by scrolling the order history in the browser.
+
+        Scrolling stops once the oldest loaded order is older than
+        ``cutoff_date``.
+
+        Args:
+            cutoff_date: Only orders on or after this date are returned
+            end_date: Only orders before this date are returned
 
         Returns:
             List of order dictionaries with basic information
@@ -116,87 +677,209 @@ class InvoiceClient:
         self.navigate_to_orders()
 
         orders = []
-        cutoff_date = datetime.now() - timedelta(days=days)
 
         try:
-            # Wait for orders to load
-            # wait = WebDriverWait(self.driver, 30)
-
             # Scroll and load more orders if needed
-            last_height = self.driver.execute_script(
-                "return document.body.scrollHeight"
-            )
+            last_height = self._scroll_height()
+            scroll_timeout = self.config.get("selenium.scroll_timeout", 2)
 
-            while True:
+            while not self._oldest_loaded_before(cutoff_date):
                 # Scroll down to load more orders
                 self.driver.execute_script(
                     "window.scrollTo(0, document.body.scrollHeight);"
                 )
-                time.sleep(2)
 
-                # Check if new content loaded
-                new_height = self.driver.execute_script(
-                    "return document.body.scrollHeight"
-                )
-                if new_height == last_height:
+                # Check if new content loaded, then let it finish rendering
+                if not self.readiness.wait_for(
+                    lambda: self._scroll_height() != last_height, scroll_timeout
+                ):
                     break
-                last_height = new_height
+                self.readiness.dom_quiet()
+                last_height = self._scroll_height()
 
                 # Look for "Load more" or similar buttons
-                load_more_selectors = [
-                    "button[data-testid='load-more']",
-                    ".load-more-button",
-                    "button[aria-label*='more']",
-                ]
-
-                for selector in load_more_selectors:
-                    try:
-                        load_more = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        if load_more.is_displayed() and load_more.is_enabled():
-                            load_more.click()
-                            time.sleep(3)
-                            break
-                    except NoSuchElementException:
-                        continue
+                result = self.probe.find(
+                    self.LOAD_MORE_SELECTORS, visible=True, group="load_more"
+                )
+                if result and result.match.is_enabled():
+                    card_count = self.readiness.count(self.ORDER_CARD_SELECTORS)
+                    result.match.click()
+                    self.readiness.element_count_stable(
+                        self.ORDER_CARD_SELECTORS, card_count
+                    )
+
+            if self.config.get("client.extraction", "script") == "script":
+                extracted = self._extract_orders_script()
+            else:
+                extracted = self._extract_orders_elements()
+
+            for order_data in extracted:
+                if self._in_range(order_data, cutoff_date, end_date):
+                    orders.append(order_data)
 
-            # Find all order elements
-            order_selectors = [
-                "[data-testid='order-card']",
-                ".order-card",
-                ".a-section.a-spacing-none.order-info",
-                "[data-test-id='order-tile']",
-            ]
+            return orders
 
-            order_elements = []
-            for selector in order_selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        order_elements = elements
-                        break
-                except NoSuchElementException:
-                    continue
+        except Exception as e:
+            raise InvoiceNotFoundError(f"Failed to get recent orders: {e}")
 
-            if not order_elements:
-                raise InvoiceNotFoundError("No order elements found on page")
+    def _oldest_loaded_before(self, cutoff_date: datetime) -> bool:
+        """Check whether the last loaded order card is older than the cutoff.
 
-            for order_elem in order_elements:
+        Args:
+            cutoff_date: Start of the requested date range
+
+        Returns:
+            True if no further orders need to be loaded
+        """
+        date_texts = self.driver.execute_script(
+            self.LAST_CARD_DATES_SCRIPT,
+            self.ORDER_CARD_SELECTORS,
+            self.ORDER_DATE_SELECTORS,
+        )
+        for date_text in date_texts or []:
+            order_date = self._parse_date(date_text)
+            if order_date:
+                return order_date < cutoff_date
+        return False
+
+    def _scroll_height(self) -> int:
+        """Get the current scroll height of the page."""
+        return self.driver.execute_script("return document.body.scrollHeight")
+
+    def _extract_orders_script(self) -> List[Dict[str, Any]]:
+        """Extract all order cards on the page with a single script call.
+
+        Returns:
+            List of order dictionaries
+
+        Raises:
+            InvoiceNotFoundError: If no order cards are present
+        """
+        # Field selectors keep their default priority: several can match the
+        # same card with different values
+        fields = {
+            "order_number": {"selectors": self.ORDER_NUMBER_SELECTORS},
+            "date_text": {"selectors": self.ORDER_DATE_SELECTORS},
+            "total_text": {"selectors": self.ORDER_TOTAL_SELECTORS},
+            "invoice_href": {"selectors": self.INVOICE_LINK_SELECTORS, "attr": "href"},
+        }
+        if self.routing_fields:
+            for name, selectors in self.ROUTING_FIELDS.items():
+                fields[name] = {"selectors": selectors}
+
+        card_selectors = self._ordered("order_card", self.ORDER_CARD_SELECTORS)
+        matched, cards = self.driver.execute_script(
+            self.EXTRACT_ORDERS_SCRIPT, card_selectors, fields
+        )
+
+        if matched < 0 or not cards:
+            self._record("order_card", None, card_selectors)
+            raise InvoiceNotFoundError("No order elements found on page")
+        self._record("order_card", card_selectors[matched], card_selectors[:matched])
+
+        orders = []
+        for card in cards:
+            order_data = self._order_from_candidates(
+                (tuple(pair) for pair in card["order_number"]),
+                (tuple(pair) for pair in card["date_text"]),
+                (tuple(pair) for pair in card["total_text"]),
+                (tuple(pair) for pair in card["invoice_href"]),
+                {
+                    name: (tuple(pair) for pair in card[name])
+                    for name in self.ROUTING_FIELDS
+                    if name in card
+                },
+            )
+            if order_data:
+                orders.append(order_data)
+
+        return orders
+
+    def _extract_orders_elements(self) -> List[Dict[str, Any]]:
+        """Extract order cards on the page one WebDriver call at a time.
+
+        Returns:
+            List of order dictionaries
+
+        Raises:
+            InvoiceNotFoundError: If no order cards are present
+        """
+        # Find all order elements
+        result = self.probe.find_all(self.ORDER_CARD_SELECTORS, group="order_card")
+        if not result:
+            raise InvoiceNotFoundError("No order elements found on page")
+
+        orders = []
+        # Field selectors routinely miss, so don't let each miss block for
+        # the full implicit wait
+        with self.probe.no_implicit_wait():
+            for order_elem in result.match:
                 try:
                     order_data = self._extract_order_data(order_elem)
-                    if (
-                        order_data
-                        and order_data.get("date", datetime.min) >= cutoff_date
-                    ):
+                    if order_data:
                         orders.append(order_data)
                 except Exception as e:
                     # Log error but continue with other orders
                     print(f"Error extracting order data: {e}")
                     continue
 
-            return orders
+        return orders
 
-        except Exception as e:
-            raise InvoiceNotFoundError(f"Failed to get recent orders: {e}")
+    def _order_from_candidates(
+        self,
+        order_numbers: Iterable[Tuple[str, str]],
+        dates: Iterable[Tuple[str, str]],
+        totals: Iterable[Tuple[str, str]],
+        invoice_hrefs: Iterable[Tuple[str, str]],
+        routing: Optional[Dict[str, Iterable[Tuple[str, str]]]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """Build an order dictionary from candidate values for each field.
+
+        Candidates are (selector, value) pairs in the selectors' default
+        order; the first value that parses wins. The order is never adapted
+        to past hits, as a lower-priority selector can match a different
+        value on the same card (e.g. a line item price instead of the total).
+
+        Args:
+            order_numbers: Candidate texts containing the order number
+            dates: Candidate texts containing the order date
+            totals: Candidate texts containing the order total
+            invoice_hrefs: Candidate invoice links
+            routing: Candidate texts for each routing field, keyed by the
+                order field name
+
+        Returns:
+            Dictionary with order information, or None if no order number or
+            date could be parsed
+        """
+
+        def first_parsed(candidates, parse) -> Any:
+            for _, value in candidates:
+                parsed = parse(value)
+                if parsed:
+                    return parsed
+            return None
+
+        order_data: Dict[str, Any] = {}
+        fields = [
+            ("order_number", order_numbers, self._parse_order_number),
+            ("date", dates, self._parse_date),
+            ("total", totals, self._parse_total),
+            ("invoice_url", invoice_hrefs, lambda href: href),
+        ]
+        for name, candidates in (routing or {}).items():
+            fields.append((name, candidates, self._parse_routing_value))
+
+        for key, candidates, parse in fields:
+            value = first_parsed(candidates, parse)
+            if value:
+                order_data[key] = value
+
+        # Return order data if we found at least order number and date
+        if "order_number" in order_data and "date" in order_data:
+            return order_data
+
+        return None
 
     def _extract_order_data(self, order_element) -> Optional[Dict[str, Any]]:
         """Extract order data from an order element.
@@ -207,96 +890,90 @@ class InvoiceClient:
         Returns:
             Dictionary with order information or None if extraction fails
         """
-        try:
-            order_data = {}
 
-            # Try to find order number
-            order_num_selectors = [
-                "[data-testid='order-number']",
-                ".order-number",
-                ".order-info-item:contains('Order')",
-                "[class*='order-number']",
-            ]
-
-            for selector in order_num_selectors:
+        def first_matches(selectors: List[str]):
+            for selector in selectors:
                 try:
-                    elem = order_element.find_element(By.CSS_SELECTOR, selector)
-                    text = elem.text.strip()
-                    # Extract order number from text like "Order # 123-4567890-1234567"
-                    import re
-
-                    match = re.search(r"#?\s*(\d{3}-\d{7}-\d{7})", text)
-                    if match:
-                        order_data["order_number"] = match.group(1)
-                        break
+                    yield selector, order_element.find_element(
+                        By.CSS_SELECTOR, selector
+                    )
                 except Exception:
                     continue
 
-            # Try to find order date
-            date_selectors = [
-                "[data-testid='order-date']",
-                ".order-date",
-                "[class*='order-date']",
-                ".date-info",
-            ]
+        def texts(selectors: List[str]):
+            for selector, elem in first_matches(selectors):
+                yield selector, elem.text.strip()
 
-            for selector in date_selectors:
-                try:
-                    elem = order_element.find_element(By.CSS_SELECTOR, selector)
-                    date_text = elem.text.strip()
-                    # Parse common date formats
-                    order_data["date"] = self._parse_date(date_text)
-                    if order_data["date"]:
-                        break
-                except Exception:
-                    continue
+        try:
+            return self._order_from_candidates(
+                texts(self.ORDER_NUMBER_SELECTORS),
+                texts(self.ORDER_DATE_SELECTORS),
+                texts(self.ORDER_TOTAL_SELECTORS),
+                (
+                    (selector, elem.get_attribute("href"))
+                    for selector, elem in first_matches(self.INVOICE_LINK_SELECTORS)
+                ),
+                self._routing_candidates(texts),
+            )
+        except Exception:
+            return None
 
-            # Try to find order total
-            total_selectors = [
-                "[data-testid='order-total']",
-                ".order-total",
-                "[class*='total']",
-                ".price",
-            ]
+    def _routing_candidates(
+        self, texts: Callable[[List[str]], Iterable[Tuple[str, str]]]
+    ) -> Optional[Dict[str, Iterable[Tuple[str, str]]]]:
+        """Build candidate texts for the routing fields, if they are wanted.
 
-            for selector in total_selectors:
-                try:
-                    elem = order_element.find_element(By.CSS_SELECTOR, selector)
-                    total_text = elem.text.strip()
-                    # Extract price from text like "$249.99"
-                    import re
-
-                    match = re.search(r"\$?(\d+\.?\d*)", total_text)
-                    if match:
-                        order_data["total"] = match.group(1)
-                        break
-                except Exception:
-                    continue
+        Args:
+            texts: Backend-specific function yielding (selector, text) pairs
+                for a list of selectors
 
-            # Try to find invoice/receipt link
-            invoice_selectors = [
-                "a[href*='invoice']",
-                "a[href*='receipt']",
-                "a[data-testid*='invoice']",
-                ".invoice-link",
-            ]
+        Returns:
+            Candidates keyed by order field name, or None
+        """
+        if not self.routing_fields:
+            return None
+        return {
+            name: texts(selectors) for name, selectors in self.ROUTING_FIELDS.items()
+        }
 
-            for selector in invoice_selectors:
-                try:
-                    elem = order_element.find_element(By.CSS_SELECTOR, selector)
-                    order_data["invoice_url"] = elem.get_attribute("href")
-                    break
-                except Exception:
-                    continue
+    @classmethod
+    def _parse_routing_value(cls, text: str) -> Optional[str]:
+        """Strip the label from a routing field text like "PO # ENG-42".
+
+        Args:
+            text: Text of the field
 
-            # Return order data if we found at least order number and date
-            if "order_number" in order_data and "date" in order_data:
-                return order_data
+        Returns:
+            The field value, or None if empty
+        """
+        value = cls.ROUTING_LABEL_PATTERN.sub("", " ".join(text.split()))
+        return value or None
 
-            return None
+    @staticmethod
+    def _parse_order_number(text: str) -> Optional[str]:
+        """Extract an order number from text like "Order # 123-4567890-1234567".
 
-        except Exception:
-            return None
+        Args:
+            text: Text containing the order number
+
+        Returns:
+            Order number or None if not found
+        """
+        match = re.search(r"#?\s*(\d{3}-\d{7}-\d{7})", text)
+        return match.group(1) if match else None
+
+    @staticmethod
+    def _parse_total(text: str) -> Optional[str]:
+        """Extract a price from text like "$249.99".
+
+        Args:
+            text: Text containing the price
+
+        Returns:
+            Price string or None if not found
+        """
+        match = re.search(r"\$?(\d+\.?\d*)", text)
+        return match.group(1) if match else None
 
     def _parse_date(self, date_text: str) -> Optional[datetime]:
         """Parse date string into datetime object.
@@ -307,7 +984,6 @@ class InvoiceClient:
         Returns:
             Parsed datetime or None if parsing fails
         """
-        import re
         from dateutil.parser import parse
 
         try:
@@ -332,63 +1008,286 @@ class InvoiceClient:
         Raises:
             NetworkError: If download fails
         """
-        try:
-            # Sync cookies again in case they've been updated
-            self._sync_cookies()
+        return b"".join(self.stream_invoice(invoice_url))
 
-            # Add common headers
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                "Accept": "application/pdf,*/*",
-                "Accept-Language": "en-US,en;q=0.9",
-                "Referer": self.driver.current_url,
-            }
+    def stream_invoice(self, invoice_url: str) -> Iterator[bytes]:
+        """Download invoice PDF from URL in chunks.
+
+        The request is made and checked before this returns, so HTTP errors
+        surface here; the body is only read as the iterator is consumed.
+        Browser cookies are synced only when stale (``client.cookie_ttl``)
+        or after the request was rejected as unauthenticated, in which case
+        it is retried once.
+
+        Args:
+            invoice_url: URL to the invoice PDF
+
+        Returns:
+            Iterator over chunks of the PDF content
 
-            response = self.session.get(invoice_url, headers=headers, timeout=30)
+        Raises:
+            NetworkError: If download fails
+            AuthenticationError: If a restored session was rejected
+        """
+        try:
+            response = self._open_invoice(invoice_url)
             response.raise_for_status()
 
             # Verify it's actually a PDF
-            content_type = response.headers.get("content-type", "").lower()
-            if "pdf" not in content_type and not invoice_url.endswith(".pdf"):
+            if not self._is_pdf(response, invoice_url):
+                response.close()
                 # Try to navigate with selenium if direct download fails
-                return self._download_with_selenium(invoice_url)
+                with self._driver_lock:
+                    return self._download_with_selenium(invoice_url)
+
+            return self._iter_response(response, invoice_url)
+
+        except requests.RequestException as e:
+            raise NetworkError(f"Failed to download invoice from {invoice_url}: {e}")
 
-            return response.content
+    def download_to(
+        self,
+        invoice_url: str,
+        partial: PartialDownload,
+        validators: Optional[Dict[str, Optional[str]]] = None,
+    ) -> bool:
+        """Download an invoice into a partial download.
 
+        An interrupted transfer is resumed from the bytes already received,
+        both within this call (up to ``client.resume_attempts`` times) and,
+        through the part file left behind, on the next run. Requests the
+        server rejects are not retried here; throttling and server errors
+        are already retried by the rate limiter.
+
+        Args:
+            invoice_url: URL to the invoice PDF
+            partial: Partial download receiving the PDF
+            validators: ``etag`` and ``last_modified`` of a stored copy; the
+                invoice is then only downloaded if it has changed
+
+        Returns:
+            True if the invoice was downloaded, False if the server reported
+            the stored copy as not modified
+
+        Raises:
+            NetworkError: If the download still fails after resuming
+            AuthenticationError: If a restored session was rejected
+            FileError: If the part file cannot be written
+        """
+        attempts = self.config.get("client.resume_attempts", 3)
+        attempt = 0
+        while True:
+            try:
+                return self._download_part(invoice_url, partial, validators)
+            except IncompleteDownloadError:
+                partial.suspend()
+                if attempt >= attempts:
+                    raise
+                attempt += 1
+
+    def _download_part(
+        self,
+        invoice_url: str,
+        partial: PartialDownload,
+        validators: Optional[Dict[str, Optional[str]]] = None,
+    ) -> bool:
+        """Make one attempt at completing a partial download.
+
+        Args:
+            invoice_url: URL to the invoice PDF
+            partial: Partial download receiving the PDF
+            validators: Validators of a stored copy, for a conditional request
+
+        Returns:
+            True if the invoice was downloaded, False if it was not modified
+
+        Raises:
+            NetworkError: If the request fails
+            IncompleteDownloadError: If the transfer is interrupted or
+                incomplete
+        """
+        conditions = conditional_headers(validators)
+        try:
+            response = self._open_invoice(
+                invoice_url, {**conditions, **partial.request_headers()}
+            )
+            if response.status_code == 416:
+                # The part file can't be continued; start over
+                response.close()
+                partial.reset()
+                response = self._open_invoice(invoice_url, conditions)
+            if response.status_code == 304:
+                response.close()
+                return False
+            response.raise_for_status()
         except requests.RequestException as e:
             raise NetworkError(f"Failed to download invoice from {invoice_url}: {e}")
 
-    def _download_with_selenium(self, invoice_url: str) -> bytes:
+        if self._is_pdf(response, invoice_url):
+            try:
+                partial.begin(response.status_code, response.headers)
+            except Exception:
+                response.close()
+                raise
+            chunks = self._iter_response(response, invoice_url)
+        else:
+            response.close()
+            with self._driver_lock:
+                chunks = self._download_with_selenium(invoice_url)
+            partial.begin(200, {})
+
+        for chunk in chunks:
+            partial.write(chunk)
+        partial.finish()
+        return True
+
+    @staticmethod
+    def _is_pdf(response: requests.Response, invoice_url: str) -> bool:
+        """Check whether a response carries the invoice PDF itself."""
+        content_type = response.headers.get("content-type", "").lower()
+        return "pdf" in content_type or invoice_url.endswith(".pdf")
+
+    def _open_invoice(
+        self, invoice_url: str, headers: Optional[Dict[str, str]] = None
+    ) -> requests.Response:
+        """Request an invoice, refreshing the cookies once if rejected.
+
+        Args:
+            invoice_url: URL to the invoice PDF
+            headers: Extra request headers, e.g. for resuming
+
+        Returns:
+            Streamed response, not yet checked for HTTP errors
+        """
+        self.refresh_cookies()
+        response = self._get_invoice(invoice_url, headers)
+
+        if self._is_auth_failure(response) and self.can_refresh_cookies:
+            response.close()
+            self.refresh_cookies(force=True)
+            response = self._get_invoice(invoice_url, headers)
+
+        return response
+
+    def _get_invoice(
+        self, invoice_url: str, headers: Optional[Dict[str, str]] = None
+    ) -> requests.Response:
+        """Request an invoice with the session's current cookies.
+
+        Args:
+            invoice_url: URL to the invoice PDF
+            headers: Extra request headers
+
+        Returns:
+            Streamed response
+        """
+        # User-Agent and language are set once on the session. PDFs are
+        # already compressed, and an identity encoding keeps Content-Length
+        # and byte ranges meaningful
+        request_headers = {
+            "Accept": "application/pdf,*/*",
+            "Accept-Encoding": "identity",
+            "Referer": self._referer,
+        }
+        request_headers.update(headers or {})
+        return self._request(
+            invoice_url, headers=request_headers, timeout=30, stream=True
+        )
+
+    def _request(self, url: str, **kwargs: Any) -> requests.Response:
+        """Send a GET request through the rate limiter.
+
+        Throttled responses (429/503 or a captcha interstitial) and transient
+        server errors are retried with backoff until the retries configured
+        in ``rate_limit`` run out; the last response is returned either way.
+
+        Args:
+            url: URL to request
+            **kwargs: Passed on to ``requests.Session.get``
+
+        Returns:
+            Response
+        """
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire()
+            response = self.session.get(url, **kwargs)
+            delay = self.rate_limiter.observe(
+                response.status_code,
+                response.headers.get("Retry-After"),
+                attempt,
+                throttled="captcha" in str(response.url).lower(),
+            )
+            if delay is None:
+                return response
+
+            response.close()
+            attempt += 1
+            time.sleep(delay)
+
+    def _iter_response(
+        self, response: requests.Response, invoice_url: str
+    ) -> Iterator[bytes]:
+        """Yield a streamed response body, closing the response when done.
+
+        Args:
+            response: Response opened with ``stream=True``
+            invoice_url: URL of the response, for error messages
+
+        Raises:
+            IncompleteDownloadError: If the connection fails mid-download
+        """
+        try:
+            for chunk in response.iter_content(chunk_size=self.CHUNK_SIZE):
+                if chunk:
+                    yield chunk
+        except requests.RequestException as e:
+            raise IncompleteDownloadError(
+                f"Download of {invoice_url} was interrupted: {e}"
+            )
+        finally:
+            response.close()
+
+    def download_with_browser(self, invoice_url: str) -> bytes:
+        """Download an invoice page that needs the browser.
+
+        For callers that already requested the page and found it isn't a
+        PDF; unlike ``download_invoice`` it doesn't request it again.
+
+        Args:
+            invoice_url: URL of the invoice page
+
+        Returns:
+            PDF content as bytes
+
+        Raises:
+            NetworkError: If download fails
+        """
+        with self._driver_lock:
+            return b"".join(self._download_with_selenium(invoice_url))
+
+    def _download_with_selenium(self, invoice_url: str) -> Iterator[bytes]:
         """Download PDF using Selenium navigation.
 
         Args:
             invoice_url: URL to navigate to
 
         Returns:
-            PDF content as bytes
+            Iterator over chunks of the PDF content
         """
         try:
             # Navigate to the invoice URL
             self.driver.get(invoice_url)
-            time.sleep(3)
+            self.readiness.page_ready()
+            self._invalidate_cookies()
 
             # Look for download link or PDF embed
-            pdf_selectors = [
-                "a[href$='.pdf']",
-                "iframe[src*='pdf']",
-                "embed[src*='pdf']",
-                "[data-testid='download-pdf']",
-            ]
-
-            for selector in pdf_selectors:
-                try:
-                    elem = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    pdf_url = elem.get_attribute("src") or elem.get_attribute("href")
-                    if pdf_url:
-                        return self.download_invoice(pdf_url)
-                except Exception:
-                    continue
+            result = self.probe.find(self.PDF_SELECTORS, group="pdf_link")
+            if result:
+                elem = result.match
+                pdf_url = elem.get_attribute("src") or elem.get_attribute("href")
+                if pdf_url:
+                    return self.stream_invoice(pdf_url)
 
             raise NetworkError("Could not find PDF download link")
 
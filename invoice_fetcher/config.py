@@ -22,6 +22,62 @@ class Config:
             "headless": True,
             "timeout": 30,
             "page_load_timeout": 30,
+            "ready_timeout": 10,
+            "quiet_period": 0.5,
+            "scroll_timeout": 2,
+            "driver_path": None,
+            "driver_manager": "cache",
+            "chrome_binary": None,
+            "profile": "default",
+            "user_data_dir": None,
+        },
+        "client": {
+            "backend": "http",
+            "extraction": "script",
+            "concurrency": None,
+            "cookie_ttl": 300,
+            "engine": "threads",
+            "resume_attempts": 3,
+        },
+        "transport": {
+            "pool_connections": 10,
+            "pool_maxsize": None,
+            "retries": 3,
+            "backoff_factor": 0.5,
+            "keep_alive": True,
+            "tcp_nodelay": True,
+            "http2": False,
+        },
+        "rate_limit": {
+            "requests_per_second": 5.0,
+            "burst": 10,
+            "min_rate": 0.2,
+            "increase": 0.1,
+            "decrease": 0.5,
+            "retries": 4,
+            "backoff": 1.0,
+            "max_backoff": 60.0,
+        },
+        "selectors": {
+            "adaptive": True,
+            "stats_file": None,
+        },
+        "sync": {
+            "overlap_days": 3,
+        },
+        "session": {
+            "enabled": True,
+            "max_age": 43200,
+            "dir": None,
+            "probe_url": None,
+        },
+        "browserd": {
+            "state_file": None,
+            "attach_timeout": 300,
+        },
+        "accounts": {
+            "max_browsers": 2,
+            "profiles": [],
         },
         "amazon": {
             "business_url": "https://business.amazon.com",
@@ -122,6 +178,20 @@ class Config:
 
         return current
 
+    def with_overrides(self, overrides: Dict[str, Any]) -> "Config":
+        """Get a copy of this configuration with some values replaced.
+
+        Args:
+            overrides: Nested dictionary merged over the current values
+
+        Returns:
+            New configuration object; this one is left unchanged
+        """
+        clone = copy.copy(self)
+        clone._config = copy.deepcopy(self._config)
+        clone._merge_config(overrides)
+        return clone
+
     def create_default_config(self) -> None:
         """Create a default configuration file."""
         self.config_file.parent.mkdir(parents=True, exist_ok=True)
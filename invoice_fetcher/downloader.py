@@ -0,0 +1,209 @@
+"""Concurrent download engine for invoices."""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Tuple
+
+from requests.adapters import DEFAULT_POOLSIZE
+
+from .exceptions import FileError, NetworkError
+
+if TYPE_CHECKING:
+    from .client import InvoiceClient
+    from .file_manager import FileManager
+
+# Result statuses reported for each processed order
+DOWNLOADED = "downloaded"
+SKIPPED = "skipped"
+UNCHANGED = "unchanged"
+ERROR = "error"
+
+ResultCallback = Callable[[Dict[str, Any], str, str], None]
+
+
+class InvoiceDownloader:
+    """Downloads invoices for a batch of orders using a bounded worker pool."""
+
+    def __init__(
+        self,
+        client: "InvoiceClient",
+        file_manager: Optional["FileManager"] = None,
+        concurrency: Optional[int] = None,
+        dry_run: bool = False,
+        route: Optional[Callable[[Dict[str, Any]], "FileManager"]] = None,
+        refresh: bool = False,
+    ):
+        """Initialize the downloader.
+
+        Args:
+            client: Invoice client used to download invoice PDFs
+            file_manager: File manager used to store invoices
+            concurrency: Maximum number of parallel downloads. Defaults to the
+                size of the HTTP connection pool.
+            dry_run: If True, report what would be downloaded without downloading
+            route: Callable picking the file manager for each order, used
+                instead of ``file_manager`` when filing into several teams
+            refresh: If True, revalidate invoices that are already stored
+                with a conditional request and replace the ones that changed
+        """
+        if file_manager is None and route is None:
+            raise ValueError("Either a file manager or a route is required")
+
+        self.client = client
+        self.file_manager = file_manager
+        self.route = route
+        self.concurrency = max(1, concurrency or DEFAULT_POOLSIZE)
+        self.dry_run = dry_run
+        self.refresh = refresh
+
+    def process_order(self, order: Dict[str, Any]) -> Tuple[str, str]:
+        """Download and store the invoice for a single order.
+
+        Args:
+            order: Order dictionary as returned by the invoice client
+
+        Returns:
+            Tuple of (status, message) where status is one of DOWNLOADED,
+            SKIPPED, UNCHANGED or ERROR
+        """
+        outcome = self.check_order(order)
+        if outcome is not None:
+            return outcome
+
+        order_num = order.get("order_number", "Unknown")
+        order_date = order["date"]
+        order_total = order.get("total", "0.00")
+        invoice_url = order["invoice_url"]
+        file_manager = self.file_manager_for(order)
+        try:
+            validators = self.stored_validators(order)
+            # Resumes a part file left by an interrupted earlier attempt
+            partial = file_manager.partial_download(
+                order_date, order_total, order_num, invoice_url
+            )
+            if not self.client.download_to(invoice_url, partial, validators):
+                return UNCHANGED, f"Invoice {order_num} unchanged"
+            file_path = file_manager.finalize_invoice(
+                partial, order_date, order_total, order_num
+            )
+            if validators is not None:
+                return DOWNLOADED, f"Refreshed: {file_path.name}"
+            return DOWNLOADED, f"Downloaded: {file_path.name}"
+        except (NetworkError, FileError) as e:
+            return ERROR, f"Failed to download invoice {order_num}: {e}"
+
+    def file_manager_for(self, order: Dict[str, Any]) -> "FileManager":
+        """Get the file manager an order's invoice is stored with."""
+        if self.route is not None:
+            return self.route(order)
+        if self.file_manager is None:
+            raise ValueError("Either a file manager or a route is required")
+        return self.file_manager
+
+    def stored_validators(
+        self, order: Dict[str, Any]
+    ) -> Optional[Dict[str, Optional[str]]]:
+        """Get the validators for revalidating an order's stored invoice.
+
+        Args:
+            order: Order dictionary as returned by the invoice client
+
+        Returns:
+            The recorded ``etag`` and ``last_modified`` (possibly empty) if
+            the invoice is stored and being refreshed, otherwise None
+        """
+        if not self.refresh:
+            return None
+        file_manager = self.file_manager_for(order)
+        order_num = order.get("order_number", "Unknown")
+        args = (order["date"], order.get("total", "0.00"), order_num)
+        if not file_manager.file_exists(*args):
+            return None
+        return file_manager.validators(*args)
+
+    def check_order(self, order: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+        """Decide whether an order's invoice needs downloading.
+
+        Args:
+            order: Order dictionary as returned by the invoice client
+
+        Returns:
+            Tuple of (status, message) if the order is finished without a
+            download (invalid, already stored or dry run), otherwise None
+        """
+        order_num = order.get("order_number", "Unknown")
+        order_date = order.get("date")
+        order_total = order.get("total", "0.00")
+
+        if not order.get("invoice_url"):
+            return ERROR, f"No invoice URL found for order {order_num}"
+
+        if not order_date:
+            return ERROR, f"No date found for order {order_num}"
+
+        file_manager = self.file_manager_for(order)
+
+        # Check if file already exists
+        exists = file_manager.file_exists(order_date, order_total, order_num)
+        if exists and not self.refresh:
+            return SKIPPED, f"Invoice {order_num} already exists, skipping"
+
+        if self.dry_run:
+            filename = file_manager.generate_filename(
+                order_date, order_total, order_num
+            )
+            action = "refresh" if exists else "download"
+            return DOWNLOADED, f"Would {action}: {filename}"
+
+        return None
+
+    def run(
+        self,
+        orders: Iterable[Dict[str, Any]],
+        on_result: Optional[ResultCallback] = None,
+    ) -> Dict[str, int]:
+        """Process orders concurrently.
+
+        Results are reported through ``on_result`` from the calling thread, so
+        callers can safely update progress displays from the callback.
+        Orders may be a generator that is still enumerating: each order is
+        submitted as soon as it is yielded, with at most twice
+        ``concurrency`` orders pending at a time.
+
+        Args:
+            orders: Orders to process
+            on_result: Optional callback invoked with (order, status, message)
+                as each order completes
+
+        Returns:
+            Dictionary with counts per status
+        """
+        counts = {DOWNLOADED: 0, SKIPPED: 0, UNCHANGED: 0, ERROR: 0}
+        pending: Dict[Future, Dict[str, Any]] = {}
+
+        def collect() -> None:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                order = pending.pop(future)
+                try:
+                    status, message = future.result()
+                except Exception as e:
+                    order_num = order.get("order_number", "Unknown")
+                    status = ERROR
+                    message = f"Failed to process invoice {order_num}: {e}"
+
+                counts[status] += 1
+                if on_result:
+                    on_result(order, status, message)
+
+        with ThreadPoolExecutor(
+            max_workers=self.concurrency, thread_name_prefix="invoice-download"
+        ) as executor:
+            for order in orders:
+                if len(pending) >= self.concurrency * 2:
+                    collect()
+                pending[executor.submit(self.process_order, order)] = order
+
+            while pending:
+                collect()
+
+        return counts
@@ -0,0 +1,223 @@
+"""Cached ChromeDriver resolution."""
+
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .config import Config
+from .exceptions import WebDriverError
+
+logger = logging.getLogger(__name__)
+
+VERSION_PATTERN = re.compile(r"\d+\.\d+\.\d+(?:\.\d+)?")
+
+# Chrome executables tried in order when no binary is configured
+CHROME_CANDIDATES = [
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+    "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+]
+
+# How the chromedriver executable is located
+MANAGER_CACHE = "cache"
+MANAGER_SELENIUM = "selenium"
+MANAGER_WEBDRIVER = "webdriver-manager"
+
+
+def binary_version(binary: str) -> Optional[str]:
+    """Get the version reported by ``<binary> --version``.
+
+    Args:
+        binary: Executable to query
+
+    Returns:
+        Version string such as ``120.0.6099.109``, or None if unknown
+    """
+    try:
+        result = subprocess.run(
+            [binary, "--version"], capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+    match = VERSION_PATTERN.search(result.stdout)
+    return match.group(0) if match else None
+
+
+def major_version(version: Optional[str]) -> Optional[str]:
+    """Get the major component of a version string."""
+    return version.split(".", 1)[0] if version else None
+
+
+class DriverResolver:
+    """Resolves the chromedriver executable without per-login discovery.
+
+    The resolved driver path is cached together with the Chrome version it
+    was resolved for. Later runs only check that the driver still exists
+    and matches the installed Chrome, and fall back to webdriver-manager
+    when it doesn't.
+    """
+
+    def __init__(
+        self,
+        cache_path: Path,
+        driver_path: Optional[str] = None,
+        manager: str = MANAGER_CACHE,
+        chrome_binary: Optional[str] = None,
+    ):
+        """Initialize the resolver.
+
+        Args:
+            cache_path: JSON file caching the resolved driver
+            driver_path: Explicit chromedriver path, used as is
+            manager: One of ``cache``, ``selenium`` (let Selenium Manager
+                resolve the driver) or ``webdriver-manager`` (always run
+                webdriver-manager)
+            chrome_binary: Chrome executable used for the version check
+        """
+        self.cache_path = Path(cache_path)
+        self.driver_path = driver_path
+        self.manager = manager
+        self.chrome_binary = chrome_binary
+
+    @classmethod
+    def from_config(cls, config: Config) -> "DriverResolver":
+        """Create a resolver from the ``selenium`` configuration section.
+
+        Args:
+            config: Configuration object
+
+        Returns:
+            Configured resolver
+        """
+        return cls(
+            Config.DEFAULT_CONFIG_DIR / "chromedriver.json",
+            driver_path=config.get("selenium.driver_path"),
+            manager=config.get("selenium.driver_manager", MANAGER_CACHE),
+            chrome_binary=config.get("selenium.chrome_binary"),
+        )
+
+    def resolve(self) -> Optional[str]:
+        """Get the chromedriver executable to use.
+
+        Returns:
+            Path to chromedriver, or None to let Selenium Manager resolve it
+
+        Raises:
+            WebDriverError: If the configured driver path does not exist
+        """
+        if self.driver_path:
+            configured = Path(self.driver_path).expanduser()
+            if not configured.is_file():
+                raise WebDriverError(f"chromedriver not found at {configured}")
+            return str(configured)
+
+        if self.manager == MANAGER_SELENIUM:
+            return None
+
+        chrome_version = self.chrome_version()
+
+        if self.manager != MANAGER_WEBDRIVER:
+            cached = self._cached_driver(chrome_version)
+            if cached:
+                logger.debug("Using cached chromedriver %s", cached)
+                return cached
+
+        try:
+            driver_path = self._install()
+        except Exception as e:
+            logger.warning(
+                "webdriver-manager failed (%s), falling back to Selenium Manager", e
+            )
+            return None
+
+        self._save(
+            {
+                "driver_path": driver_path,
+                "driver_version": binary_version(driver_path),
+                "chrome_version": chrome_version,
+            }
+        )
+        return driver_path
+
+    def chrome_version(self) -> Optional[str]:
+        """Get the installed Chrome version.
+
+        Returns:
+            Version string, or None if Chrome cannot be queried
+        """
+        candidates = [self.chrome_binary] if self.chrome_binary else CHROME_CANDIDATES
+        for candidate in candidates:
+            binary = shutil.which(candidate) or (
+                candidate if os.path.isfile(candidate) else None
+            )
+            if binary:
+                version = binary_version(binary)
+                if version:
+                    return version
+        return None
+
+    def _cached_driver(self, chrome_version: Optional[str]) -> Optional[str]:
+        """Get the cached driver path if it is still valid.
+
+        Args:
+            chrome_version: Installed Chrome version, if known
+
+        Returns:
+            Cached driver path, or None if the cache is missing or stale
+        """
+        data = self._load()
+        driver_path = data.get("driver_path")
+        if not driver_path or not os.path.isfile(driver_path):
+            return None
+
+        if chrome_version is None:
+            # Chrome can't be queried (e.g. on Windows); trust a driver that runs
+            return driver_path if binary_version(driver_path) else None
+
+        if major_version(data.get("chrome_version")) != major_version(chrome_version):
+            return None
+
+        driver_version = binary_version(driver_path)
+        if major_version(driver_version) != major_version(chrome_version):
+            return None
+
+        return driver_path
+
+    def _install(self) -> str:
+        """Resolve the driver with webdriver-manager."""
+        from webdriver_manager.chrome import ChromeDriverManager
+
+        return ChromeDriverManager().install()
+
+    def _load(self) -> Dict[str, Any]:
+        """Load the cache file, ignoring missing or corrupt files."""
+        try:
+            with open(self.cache_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _save(self, data: Dict[str, Any]) -> None:
+        """Write the cache file atomically, ignoring write failures."""
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Per-process name, as parallel fetch-accounts workers resolve
+            # the driver at the same time
+            tmp_path = self.cache_path.with_name(
+                f"{self.cache_path.name}.{os.getpid()}.tmp"
+            )
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning("Failed to cache chromedriver location: %s", e)
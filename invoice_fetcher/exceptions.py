@@ -25,6 +25,12 @@ class NetworkError(InvoiceFetcherError):
     pass
 
 
+class IncompleteDownloadError(NetworkError):
+    """Raised when a transfer ends before the whole invoice was received."""
+
+    pass
+
+
 class FileError(InvoiceFetcherError):
     """Raised when there's an issue with file operations."""
 
@@ -1,22 +1,57 @@
 """File management utilities for organizing invoices."""
 
+import hashlib
+import os
 import re
+import tempfile
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import (
+    TYPE_CHECKING,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Union,
+)
 from datetime import datetime
-from .exceptions import FileError
+from .exceptions import FileError, InvoiceFetcherError
+from .partial import PartialDownload
+
+if TYPE_CHECKING:
+    from .manifest import InvoiceManifest
+
+# Invoice content accepted by FileManager.save_invoice
+InvoiceContent = Union[bytes, Iterable[bytes], BinaryIO]
 
 
 class FileManager:
     """Manages file operations and organization for invoices."""
 
-    def __init__(self, base_dir: Path):
+    # Bytes read per chunk when saving from a file-like object
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        base_dir: Path,
+        manifest: Optional["InvoiceManifest"] = None,
+        team: Optional[str] = None,
+    ):
         """Initialize the file manager.
 
         Args:
             base_dir: Base directory for storing invoices
+            manifest: Manifest to record saved invoices in
+            team: Team name recorded in the manifest (defaults to the
+                directory name)
         """
         self.base_dir = Path(base_dir)
+        self.manifest = manifest
+        self.team = team or self.base_dir.name
+        # Filename -> parsed info of the invoices on disk, built on first use
+        self._index: Optional[Dict[str, dict]] = None
+        self._index_lock = threading.Lock()
         self.base_dir.mkdir(parents=True, exist_ok=True)
 
     def generate_filename(
@@ -65,9 +100,8 @@ class FileManager:
         year = transaction_date.year
         month = transaction_date.month
 
-        # Create year/month directory structure
+        # Directories are only created when an invoice is actually written
         dir_path = self.base_dir / str(year) / f"{month:02d}"
-        dir_path.mkdir(parents=True, exist_ok=True)
 
         filename = self.generate_filename(transaction_date, amount, invoice_number)
         return dir_path / filename
@@ -85,20 +119,81 @@ class FileManager:
         Returns:
             True if file exists, False otherwise
         """
+        filename = self.generate_filename(transaction_date, amount, invoice_number)
+        return filename in self._load_index()
+
+    def validators(
+        self, transaction_date: datetime, amount: str, invoice_number: str
+    ) -> Dict[str, Optional[str]]:
+        """Get the HTTP validators recorded for a stored invoice.
+
+        Args:
+            transaction_date: Date of the transaction
+            amount: Transaction amount
+            invoice_number: Amazon invoice number
+
+        Returns:
+            Dictionary with ``etag`` and ``last_modified``, or an empty
+            dictionary if none were recorded or there is no manifest
+        """
+        if self.manifest is None:
+            return {}
         file_path = self.get_file_path(transaction_date, amount, invoice_number)
-        return file_path.exists()
+        return self.manifest.validators(file_path)
+
+    def _load_index(self) -> Dict[str, dict]:
+        """Get the index of invoices on disk, scanning the directory once.
+
+        Returns:
+            Dictionary mapping filenames to their parsed info
+        """
+        with self._index_lock:
+            if self._index is None:
+                index = {}
+                for year_entry in self._scan(self.base_dir):
+                    if not year_entry.name.isdigit() or not year_entry.is_dir():
+                        continue
+                    for month_entry in self._scan(year_entry.path):
+                        if not month_entry.is_dir():
+                            continue
+                        for entry in self._scan(month_entry.path):
+                            if not entry.name.endswith(".pdf"):
+                                continue
+                            parsed_info = self.parse_filename(entry.name)
+                            if parsed_info:
+                                index[entry.name] = parsed_info
+                self._index = index
+            return self._index
+
+    @staticmethod
+    def _scan(path) -> list:
+        """List a directory, treating a missing directory as empty."""
+        try:
+            with os.scandir(path) as entries:
+                return list(entries)
+        except (FileNotFoundError, NotADirectoryError):
+            return []
 
     def save_invoice(
         self,
-        content: bytes,
+        content: InvoiceContent,
         transaction_date: datetime,
         amount: str,
         invoice_number: str,
     ) -> Path:
         """Save invoice content to file.
 
+        Downloads go through ``partial_download`` and ``finalize_invoice``
+        so they can be resumed; this is for callers that already hold the
+        whole invoice, e.g. when importing files fetched by other means.
+
+        The content is written to a temporary file next to the final path,
+        flushed to disk and then renamed into place, so an interrupted run
+        never leaves a truncated PDF behind.
+
         Args:
-            content: PDF content as bytes
+            content: PDF content as bytes, an iterable of byte chunks or a
+                binary file-like object
             transaction_date: Date of the transaction
             amount: Transaction amount
             invoice_number: Amazon invoice number
@@ -108,15 +203,152 @@ class FileManager:
 
         Raises:
             FileError: If there's an error saving the file
+            NetworkError: If streamed content fails mid-download
         """
         file_path = self.get_file_path(transaction_date, amount, invoice_number)
+        digest = hashlib.sha256()
+        size = 0
+        tmp_path = None
 
         try:
-            with open(file_path, "wb") as f:
-                f.write(content)
-            return file_path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(
+                dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp"
+            )
+            tmp_path = Path(tmp_name)
+            with os.fdopen(fd, "wb") as f:
+                for chunk in self._chunks(content):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, file_path)
         except Exception as e:
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+            if isinstance(e, InvoiceFetcherError):
+                raise
+            raise FileError(f"Failed to save invoice {invoice_number}: {e}")
+
+        self._register(
+            file_path,
+            transaction_date,
+            amount,
+            invoice_number,
+            size,
+            digest.hexdigest(),
+        )
+        return file_path
+
+    def partial_download(
+        self,
+        transaction_date: datetime,
+        amount: str,
+        invoice_number: str,
+        url: str,
+    ) -> PartialDownload:
+        """Get the resumable partial download for an invoice.
+
+        Args:
+            transaction_date: Date of the transaction
+            amount: Transaction amount
+            invoice_number: Amazon invoice number
+            url: Invoice URL
+
+        Returns:
+            Partial download next to the invoice's final path
+        """
+        file_path = self.get_file_path(transaction_date, amount, invoice_number)
+        return PartialDownload(file_path, url)
+
+    def finalize_invoice(
+        self,
+        partial: PartialDownload,
+        transaction_date: datetime,
+        amount: str,
+        invoice_number: str,
+    ) -> Path:
+        """Move a completed partial download into place.
+
+        An existing invoice at the final path, e.g. one being refreshed, is
+        replaced atomically. The size and SHA-256 computed while the body
+        was written are recorded in the manifest together with the
+        validators of the download, for later conditional requests.
+
+        Args:
+            partial: Finished partial download
+            transaction_date: Date of the transaction
+            amount: Transaction amount
+            invoice_number: Amazon invoice number
+
+        Returns:
+            Path to the saved file
+
+        Raises:
+            FileError: If the file cannot be moved into place
+        """
+        file_path = partial.final_path
+        sha256 = partial.sha256
+        if sha256 is None:
+            raise FileError(f"Invoice {invoice_number} was never downloaded")
+
+        try:
+            os.replace(partial.path, file_path)
+        except OSError as e:
             raise FileError(f"Failed to save invoice {invoice_number}: {e}")
+        partial.discard()
+
+        self._register(
+            file_path,
+            transaction_date,
+            amount,
+            invoice_number,
+            partial.received,
+            sha256,
+            etag=partial.etag,
+            last_modified=partial.last_modified,
+        )
+        return file_path
+
+    def _register(
+        self,
+        file_path: Path,
+        transaction_date: datetime,
+        amount: str,
+        invoice_number: str,
+        size: int,
+        sha256: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Add a saved invoice to the index and the manifest."""
+        parsed_info = self.parse_filename(file_path.name)
+        with self._index_lock:
+            if self._index is not None and parsed_info:
+                self._index[file_path.name] = parsed_info
+
+        if self.manifest is not None:
+            self.manifest.record(
+                team=self.team,
+                invoice_number=invoice_number,
+                transaction_date=transaction_date,
+                amount=amount,
+                file_path=file_path,
+                size=size,
+                sha256=sha256,
+                etag=etag,
+                last_modified=last_modified,
+            )
+
+    def _chunks(self, content: InvoiceContent) -> Iterator[bytes]:
+        """Normalize invoice content to an iterator of byte chunks."""
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            yield bytes(content)
+        elif hasattr(content, "read"):
+            yield from iter(lambda: content.read(self.CHUNK_SIZE), b"")
+        else:
+            yield from content
 
     def list_existing_invoices(self, year: Optional[int] = None) -> list:
         """List all existing invoice files.
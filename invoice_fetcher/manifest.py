@@ -0,0 +1,328 @@
+"""SQLite manifest of downloaded invoices."""
+
+import hashlib
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .exceptions import FileError
+
+
+class InvoiceManifest:
+    """Index of the invoices stored under a download root.
+
+    The manifest lives next to the team directories and is kept up to date
+    by ``FileManager`` whenever an invoice is stored, normally by
+    ``finalize_invoice`` once a download completes, so listing and filtering
+    invoices never needs to walk the archive.
+    """
+
+    FILENAME = ".manifest.sqlite3"
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS invoices (
+            path TEXT PRIMARY KEY,
+            team TEXT NOT NULL,
+            invoice_number TEXT NOT NULL,
+            date TEXT NOT NULL,
+            amount TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            sha256 TEXT,
+            downloaded_at TEXT,
+            etag TEXT,
+            last_modified TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_invoices_team_date ON invoices (team, date);
+        CREATE INDEX IF NOT EXISTS idx_invoices_date ON invoices (date);
+        CREATE INDEX IF NOT EXISTS idx_invoices_number ON invoices (invoice_number);
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        );
+    """
+
+    # Columns added after the first release, created on older manifests
+    MIGRATIONS = {
+        "etag": "ALTER TABLE invoices ADD COLUMN etag TEXT",
+        "last_modified": "ALTER TABLE invoices ADD COLUMN last_modified TEXT",
+    }
+
+    def __init__(self, root: Path):
+        """Initialize the manifest.
+
+        The database is only opened (and created) on first use.
+
+        Args:
+            root: Download root containing the team directories
+        """
+        self.root = Path(root)
+        self.path = self.root / self.FILENAME
+        self._conn: Optional[sqlite3.Connection] = None
+        # Invoices are saved from several download threads
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database, creating the schema if needed."""
+        if self._conn is None:
+            try:
+                self.root.mkdir(parents=True, exist_ok=True)
+                conn = sqlite3.connect(str(self.path), check_same_thread=False)
+                conn.executescript(self.SCHEMA)
+                columns = {
+                    row[1] for row in conn.execute("PRAGMA table_info(invoices)")
+                }
+                with conn:
+                    for column, statement in self.MIGRATIONS.items():
+                        if column not in columns:
+                            conn.execute(statement)
+                self._conn = conn
+            except sqlite3.Error as e:
+                raise FileError(f"Failed to open invoice manifest {self.path}: {e}")
+        return self._conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _relative(self, file_path: Path) -> str:
+        """Store paths relative to the root where possible."""
+        try:
+            return str(Path(file_path).relative_to(self.root))
+        except ValueError:
+            return str(file_path)
+
+    def record(
+        self,
+        team: str,
+        invoice_number: str,
+        transaction_date: datetime,
+        amount: str,
+        file_path: Path,
+        size: int,
+        sha256: Optional[str],
+        downloaded_at: Optional[datetime] = None,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> None:
+        """Record a stored invoice.
+
+        Args:
+            team: Team the invoice belongs to
+            invoice_number: Amazon invoice number
+            transaction_date: Date of the transaction
+            amount: Transaction amount
+            file_path: Path of the stored PDF
+            size: File size in bytes
+            sha256: Hex digest of the file content
+            downloaded_at: When the invoice was downloaded (defaults to now)
+            etag: ETag the server sent with the invoice
+            last_modified: Last-Modified date the server sent with the invoice
+
+        Raises:
+            FileError: If the manifest cannot be updated
+        """
+        row = (
+            self._relative(file_path),
+            team,
+            invoice_number,
+            transaction_date.strftime("%Y-%m-%d"),
+            amount,
+            size,
+            sha256,
+            (downloaded_at or datetime.now()).isoformat(timespec="seconds"),
+            etag,
+            last_modified,
+        )
+
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO invoices "
+                        "(path, team, invoice_number, date, amount, size, sha256, "
+                        "downloaded_at, etag, last_modified) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        row,
+                    )
+            except sqlite3.Error as e:
+                raise FileError(f"Failed to record invoice {invoice_number}: {e}")
+
+    def validators(self, file_path: Path) -> Dict[str, Optional[str]]:
+        """Get the HTTP validators recorded for a stored invoice.
+
+        Args:
+            file_path: Path of the stored PDF
+
+        Returns:
+            Dictionary with ``etag`` and ``last_modified`` (either may be
+            None), or an empty dictionary if the invoice is not recorded
+        """
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT etag, last_modified FROM invoices WHERE path = ?",
+                    (self._relative(file_path),),
+                )
+                .fetchone()
+            )
+        if row is None:
+            return {}
+        return {"etag": row[0], "last_modified": row[1]}
+
+    def query(
+        self, team: Optional[str] = None, year: Optional[int] = None
+    ) -> List[Tuple[Path, Dict[str, Any]]]:
+        """List recorded invoices.
+
+        Args:
+            team: If specified, only list invoices for this team
+            year: If specified, only list invoices from this year
+
+        Returns:
+            List of tuples (file_path, info) sorted by date, where info
+            contains date, amount, invoice_number and team
+        """
+        sql = "SELECT path, team, invoice_number, date, amount FROM invoices"
+        clauses = []
+        params: List[Any] = []
+        if team:
+            clauses.append("team = ?")
+            params.append(team)
+        if year:
+            clauses.append("date >= ? AND date < ?")
+            params.extend([f"{year:04d}-01-01", f"{year + 1:04d}-01-01"])
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY date, team, invoice_number"
+
+        with self._lock:
+            rows = self._connect().execute(sql, params).fetchall()
+
+        return [
+            (
+                self.root / path,
+                {
+                    "date": datetime.strptime(date, "%Y-%m-%d"),
+                    "amount": amount,
+                    "invoice_number": invoice_number,
+                    "team": row_team,
+                },
+            )
+            for path, row_team, invoice_number, date, amount in rows
+        ]
+
+    def is_indexed(self) -> bool:
+        """Check whether the manifest has been built from disk at least once."""
+        with self._lock:
+            row = (
+                self._connect()
+                .execute("SELECT value FROM meta WHERE key = 'indexed_at'")
+                .fetchone()
+            )
+        return row is not None
+
+    def reindex(self, team_dirs: Optional[Dict[str, Path]] = None) -> int:
+        """Rebuild the manifest from the invoices on disk.
+
+        Every directory under the root is scanned as a team, as are the
+        given team directories, which may lie outside the root.
+
+        Args:
+            team_dirs: Team name -> directory for teams configured with their
+                own download directory
+
+        Returns:
+            Number of invoices indexed
+
+        Raises:
+            FileError: If the manifest cannot be rebuilt
+        """
+        # Imported here to avoid a circular import with file_manager
+        from .file_manager import FileManager
+
+        # Validators can't be recovered from disk, so keep the recorded ones
+        with self._lock:
+            validators = {
+                path: (etag, last_modified)
+                for path, etag, last_modified in self._connect().execute(
+                    "SELECT path, etag, last_modified FROM invoices"
+                )
+            }
+
+        # Directory -> team; configured directories take precedence
+        teams: Dict[Path, Tuple[Path, str]] = {}
+        if self.root.exists():
+            for team_dir in sorted(self.root.iterdir()):
+                if team_dir.is_dir() and not team_dir.name.startswith("."):
+                    teams[team_dir.resolve()] = (team_dir, team_dir.name)
+        for team, team_dir in (team_dirs or {}).items():
+            team_dir = Path(team_dir)
+            if team_dir.is_dir():
+                teams[team_dir.resolve()] = (team_dir, team)
+
+        rows = []
+        for team_dir, team in teams.values():
+            fm = FileManager(team_dir)
+            for file_path, info in fm.list_existing_invoices():
+                stat = file_path.stat()
+                path = self._relative(file_path)
+                rows.append(
+                    (
+                        path,
+                        team,
+                        info["invoice_number"],
+                        info["date"].strftime("%Y-%m-%d"),
+                        info["amount"],
+                        stat.st_size,
+                        file_sha256(file_path),
+                        datetime.fromtimestamp(stat.st_mtime).isoformat(
+                            timespec="seconds"
+                        ),
+                        *validators.get(path, (None, None)),
+                    )
+                )
+
+        with self._lock:
+            conn = self._connect()
+            try:
+                with conn:
+                    conn.execute("DELETE FROM invoices")
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO invoices "
+                        "(path, team, invoice_number, date, amount, size, sha256, "
+                        "downloaded_at, etag, last_modified) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+                    conn.execute(
+                        "INSERT OR REPLACE INTO meta (key, value) "
+                        "VALUES ('indexed_at', ?)",
+                        (datetime.now().isoformat(timespec="seconds"),),
+                    )
+            except sqlite3.Error as e:
+                raise FileError(f"Failed to rebuild invoice manifest: {e}")
+
+        return len(rows)
+
+
+def file_sha256(file_path: Path) -> str:
+    """Compute the SHA-256 digest of a file.
+
+    Args:
+        file_path: File to hash
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
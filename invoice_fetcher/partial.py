@@ -0,0 +1,260 @@
+"""Partially downloaded invoices that can be resumed."""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Mapping, Optional
+
+from .exceptions import FileError, IncompleteDownloadError
+
+CONTENT_RANGE_PATTERN = re.compile(r"bytes\s+(\d+)-(\d+)/(\d+|\*)")
+
+
+def conditional_headers(
+    validators: Optional[Mapping[str, Optional[str]]],
+) -> Dict[str, str]:
+    """Build the headers revalidating a stored invoice.
+
+    Args:
+        validators: ``etag`` and ``last_modified`` recorded when the invoice
+            was downloaded
+
+    Returns:
+        ``If-None-Match`` and/or ``If-Modified-Since`` headers, so the server
+        answers 304 Not Modified if the invoice hasn't changed
+    """
+    headers: Dict[str, str] = {}
+    if not validators:
+        return headers
+    etag = validators.get("etag")
+    if etag:
+        headers["If-None-Match"] = etag
+    last_modified = validators.get("last_modified")
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    return headers
+
+
+class PartialDownload:
+    """A ``.part`` file receiving an invoice, with a JSON sidecar.
+
+    The sidecar records the invoice URL, the bytes received so far and the
+    response's validator (ETag or Last-Modified). A later attempt, in the
+    same run or the next, asks the server for the remaining bytes with a
+    ``Range`` request guarded by ``If-Range``. The server either continues
+    with a 206, or sends the whole (changed) invoice with a 200.
+
+    The SHA-256 of the body is computed as chunks are written. Only a part
+    file left over by an earlier attempt is read back, once, when resuming.
+    """
+
+    # Bytes read per chunk when rehashing a leftover part file
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, final_path: Path, url: str):
+        """Open the partial download for an invoice.
+
+        A leftover part file is kept for resuming only if its sidecar is for
+        the same URL and carries a validator.
+
+        Args:
+            final_path: Path the finished invoice is stored at
+            url: Invoice URL
+        """
+        self.final_path = Path(final_path)
+        self.path = self.final_path.with_name(f".{self.final_path.name}.part")
+        self.state_path = self.path.with_name(self.path.name + ".json")
+        self.url = url
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.total: Optional[int] = None
+        self.received = 0
+        self._file: Optional[BinaryIO] = None
+        self._digest: Optional["hashlib._Hash"] = None
+
+        state = self._load()
+        if state.get("url") == url and (
+            state.get("etag") or state.get("last_modified")
+        ):
+            try:
+                self.received = self.path.stat().st_size
+            except OSError:
+                self.received = 0
+            if self.received:
+                self.etag = state.get("etag")
+                self.last_modified = state.get("last_modified")
+                self.total = state.get("total")
+
+    @property
+    def validator(self) -> Optional[str]:
+        """Validator for ``If-Range``; weak ETags cannot be used there."""
+        if self.etag and not self.etag.startswith("W/"):
+            return self.etag
+        return self.last_modified
+
+    @property
+    def sha256(self) -> Optional[str]:
+        """Hex SHA-256 of the bytes received, once a response was begun."""
+        return self._digest.hexdigest() if self._digest is not None else None
+
+    def request_headers(self) -> Dict[str, str]:
+        """Get the headers resuming this download.
+
+        Returns:
+            ``Range`` and ``If-Range`` headers, or no headers if the download
+            has to start from the beginning
+        """
+        if self.received and self.validator:
+            return {"Range": f"bytes={self.received}-", "If-Range": self.validator}
+        return {}
+
+    def begin(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Start writing a response body.
+
+        A 206 continues the part file; anything else replaces it.
+
+        Args:
+            status_code: HTTP status of the response
+            headers: Response headers
+
+        Raises:
+            IncompleteDownloadError: If the server resumed at the wrong
+                offset; the part file is discarded so a retry starts over
+            FileError: If the part file cannot be opened
+        """
+        resume = status_code == 206 and self.received > 0
+        if resume:
+            match = CONTENT_RANGE_PATTERN.match(headers.get("Content-Range") or "")
+            if not match or int(match.group(1)) != self.received:
+                expected = self.received
+                self.reset()
+                raise IncompleteDownloadError(
+                    f"Server resumed at the wrong offset (expected {expected})"
+                )
+            total = match.group(3)
+            self.total = int(total) if total != "*" else None
+            if self._digest is None:
+                self._digest = self._hash_part()
+        else:
+            self.received = 0
+            self._digest = hashlib.sha256()
+            length = headers.get("Content-Length")
+            self.total = int(length) if length and length.isdigit() else None
+
+        self.etag = headers.get("ETag") or (self.etag if resume else None)
+        self.last_modified = headers.get("Last-Modified") or (
+            self.last_modified if resume else None
+        )
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = open(self.path, "ab" if resume else "wb")
+        except OSError as e:
+            raise FileError(f"Failed to open {self.path}: {e}")
+        self._save()
+
+    def write(self, chunk: bytes) -> None:
+        """Append a chunk of the response body.
+
+        Args:
+            chunk: Bytes received
+
+        Raises:
+            FileError: If the part file cannot be written
+        """
+        if self._file is None or self._digest is None:
+            raise FileError(f"Download into {self.path} was not begun")
+        try:
+            self._file.write(chunk)
+        except OSError as e:
+            raise FileError(f"Failed to write {self.path}: {e}")
+        self._digest.update(chunk)
+        self.received += len(chunk)
+
+    def finish(self) -> None:
+        """Flush the part file and check it is complete.
+
+        Raises:
+            IncompleteDownloadError: If fewer bytes than announced were
+                received; the part file is kept for resuming
+        """
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self.suspend()
+
+        if self.total is not None and self.received != self.total:
+            raise IncompleteDownloadError(
+                f"Incomplete download: received {self.received} of "
+                f"{self.total} bytes"
+            )
+
+    def suspend(self) -> None:
+        """Close the part file and record progress for a later resume."""
+        if self._file is not None:
+            try:
+                self._file.close()
+            finally:
+                self._file = None
+        self._save()
+
+    def reset(self) -> None:
+        """Throw away received bytes so the next attempt starts over."""
+        self.suspend()
+        self.discard()
+        self.received = 0
+        self.etag = self.last_modified = self.total = None
+        self._digest = None
+
+    def discard(self) -> None:
+        """Remove the part file and its sidecar."""
+        for path in (self.path, self.state_path):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _hash_part(self) -> "hashlib._Hash":
+        """Hash the bytes an earlier attempt left in the part file.
+
+        Raises:
+            FileError: If the part file cannot be read
+        """
+        digest = hashlib.sha256()
+        try:
+            with open(self.path, "rb") as f:
+                for chunk in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                    digest.update(chunk)
+        except OSError as e:
+            raise FileError(f"Failed to read {self.path}: {e}")
+        return digest
+
+    def _load(self) -> Dict[str, Any]:
+        """Load the sidecar, ignoring missing or corrupt files."""
+        try:
+            with open(self.state_path, "r") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def _save(self) -> None:
+        """Write the sidecar, ignoring write failures."""
+        if not self.path.exists():
+            return
+        state = {
+            "url": self.url,
+            "received": self.received,
+            "total": self.total,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+        }
+        try:
+            tmp_path = self.state_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_path, self.state_path)
+        except OSError:
+            pass
@@ -0,0 +1,307 @@
+"""Selector probing that does not stall on selectors that are expected to miss."""
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+# Returns [index, match] for the first selector that matches anything, where
+# match is the first element (or all elements when requested). Invalid
+# selectors (e.g. jQuery-only pseudo classes) are skipped.
+PROBE_SCRIPT = """
+    const [root, selectors, findAll, visibleOnly] = arguments;
+    const scope = root || document;
+    const isVisible = (el) => el.getClientRects().length > 0;
+
+    for (let i = 0; i < selectors.length; i++) {
+        let found;
+        try {
+            found = Array.from(scope.querySelectorAll(selectors[i]));
+        } catch (e) {
+            continue;
+        }
+        if (visibleOnly) {
+            found = found.filter(isVisible);
+        }
+        if (found.length) {
+            return [i, findAll ? found : found[0]];
+        }
+    }
+    return null;
+"""
+
+
+class SelectorStats:
+    """Persisted per-group selector hit rates used to order candidates.
+
+    Selectors that matched most recently are tried first. Only use this for
+    groups whose selectors locate the same thing (a page element or the
+    order card container): reordering a group whose selectors can match
+    different values would change what is extracted, not only how fast.
+    """
+
+    def __init__(self, path: Path):
+        """Initialize selector statistics.
+
+        Args:
+            path: JSON file the statistics are persisted to
+        """
+        self.path = Path(path)
+        self._groups: Dict[str, Dict[str, Dict[str, float]]] = self._read()
+        self._dirty: set = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Config) -> Optional["SelectorStats"]:
+        """Create selector statistics as configured.
+
+        Args:
+            config: Configuration object
+
+        Returns:
+            SelectorStats instance, or None if adaptive ordering is disabled
+        """
+        if not config.get("selectors.adaptive", True):
+            return None
+
+        stats_file = config.get("selectors.stats_file")
+        path = (
+            Path(stats_file).expanduser()
+            if stats_file
+            else Config.DEFAULT_CONFIG_DIR / "selector_stats.json"
+        )
+        return cls(path)
+
+    def _read(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Read persisted statistics, ignoring missing or corrupt files."""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def order(self, group: str, selectors: List[str]) -> List[str]:
+        """Order selectors so the most recently successful come first.
+
+        Args:
+            group: Selector group name
+            selectors: Selectors in their default order
+
+        Returns:
+            Selectors in the order they should be tried
+        """
+        with self._lock:
+            stats = dict(self._groups.get(group, {}))
+
+        def rank(selector: str):
+            entry = stats.get(selector, {})
+            return (-entry.get("last_success", 0), -entry.get("hits", 0))
+
+        # sorted() is stable, so untried selectors keep their default order
+        return sorted(selectors, key=rank)
+
+    def record(
+        self, group: str, matched: Optional[str], missed: Iterable[str] = ()
+    ) -> None:
+        """Record the outcome of a lookup.
+
+        Args:
+            group: Selector group name
+            matched: Selector that matched, or None if nothing matched
+            missed: Selectors that were tried and did not match
+        """
+        with self._lock:
+            stats = self._groups.setdefault(group, {})
+            for selector in missed:
+                entry = stats.setdefault(selector, {"hits": 0, "misses": 0})
+                entry["misses"] = entry.get("misses", 0) + 1
+            if matched is not None:
+                entry = stats.setdefault(matched, {"hits": 0, "misses": 0})
+                entry["hits"] = entry.get("hits", 0) + 1
+                entry["last_success"] = time.time()
+            self._dirty.add(group)
+
+    def save(self) -> None:
+        """Persist the groups updated by this instance.
+
+        Groups are merged into the file on disk so that instances used for
+        different selector groups (e.g. login and order listing) don't
+        overwrite each other's statistics.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+
+            data = self._read()
+            for group in self._dirty:
+                data[group] = self._groups[group]
+
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                # Unique per process, as parallel accounts share the file
+                tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+                with open(tmp_path, "w") as f:
+                    json.dump(data, f, indent=2)
+                os.replace(tmp_path, self.path)
+                self._dirty.clear()
+            except OSError as e:
+                logger.debug("Could not save selector statistics: %s", e)
+
+
+class ProbeResult(NamedTuple):
+    """Outcome of a successful selector probe."""
+
+    selector: str
+    match: Any
+    elapsed: float
+
+
+class SelectorProbe:
+    """Finds the first matching selector from a list in a single round trip.
+
+    All candidate selectors are raced in one ``execute_script`` call instead
+    of one ``find_element`` per selector, so misses cost nothing and the
+    driver's implicit wait never applies.
+    """
+
+    POLL_INTERVAL = 0.25
+
+    def __init__(
+        self,
+        driver,
+        implicit_wait: float = 0,
+        stats: Optional[SelectorStats] = None,
+    ):
+        """Initialize the probe.
+
+        Args:
+            driver: WebDriver instance to probe
+            implicit_wait: The driver's configured implicit wait in seconds,
+                restored after ``no_implicit_wait`` blocks
+            stats: Optional selector statistics used to order candidates
+        """
+        self.driver = driver
+        self.implicit_wait = implicit_wait
+        self.stats = stats
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+
+    @contextmanager
+    def no_implicit_wait(self) -> Iterator[None]:
+        """Temporarily disable the implicit wait for native element lookups."""
+        self.driver.implicitly_wait(0)
+        try:
+            yield
+        finally:
+            self.driver.implicitly_wait(self.implicit_wait)
+
+    def find(
+        self,
+        selectors: List[str],
+        root: Any = None,
+        timeout: float = 0,
+        visible: bool = False,
+        group: Optional[str] = None,
+    ) -> Optional[ProbeResult]:
+        """Find the first element matching any of the selectors.
+
+        Args:
+            selectors: CSS selectors in order of preference
+            root: Element to search within (defaults to the whole document)
+            timeout: Seconds to keep polling for a match (0 checks once)
+            visible: Only match elements that are rendered
+            group: Name used for timing instrumentation
+
+        Returns:
+            ProbeResult with the matched selector and element, or None
+        """
+        return self._probe(selectors, root, timeout, visible, False, group)
+
+    def find_all(
+        self,
+        selectors: List[str],
+        root: Any = None,
+        timeout: float = 0,
+        visible: bool = False,
+        group: Optional[str] = None,
+    ) -> Optional[ProbeResult]:
+        """Find all elements matching the first selector that matches anything.
+
+        Args:
+            selectors: CSS selectors in order of preference
+            root: Element to search within (defaults to the whole document)
+            timeout: Seconds to keep polling for a match (0 checks once)
+            visible: Only match elements that are rendered
+            group: Name used for timing instrumentation
+
+        Returns:
+            ProbeResult with the matched selector and list of elements, or None
+        """
+        return self._probe(selectors, root, timeout, visible, True, group)
+
+    def _probe(
+        self,
+        selectors: List[str],
+        root: Any,
+        timeout: float,
+        visible: bool,
+        find_all: bool,
+        group: Optional[str],
+    ) -> Optional[ProbeResult]:
+        """Run the probe script until it matches or the timeout expires."""
+        if self.stats and group:
+            selectors = self.stats.order(group, selectors)
+
+        group = group or "default"
+        start = time.monotonic()
+        deadline = start + timeout
+
+        while True:
+            found = self.driver.execute_script(
+                PROBE_SCRIPT, root, list(selectors), find_all, visible
+            )
+            if found or time.monotonic() >= deadline:
+                break
+            time.sleep(self.POLL_INTERVAL)
+
+        elapsed = time.monotonic() - start
+        self.timings[group].append(elapsed)
+
+        if not found:
+            logger.debug("Probe %s: no match in %.1f ms", group, elapsed * 1000)
+            if self.stats:
+                self.stats.record(group, None, selectors)
+            return None
+
+        index, match = found
+        if self.stats:
+            # The probe tries selectors in order, so all earlier ones missed
+            self.stats.record(group, selectors[index], selectors[:index])
+        logger.debug(
+            "Probe %s: matched %r in %.1f ms", group, selectors[index], elapsed * 1000
+        )
+        return ProbeResult(selectors[index], match, elapsed)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Summarise probe timings per selector group.
+
+        Returns:
+            Dictionary mapping group name to call count and total/max time in ms
+        """
+        return {
+            group: {
+                "calls": len(times),
+                "total_ms": sum(times) * 1000,
+                "max_ms": max(times) * 1000,
+            }
+            for group, times in self.timings.items()
+        }
@@ -0,0 +1,231 @@
+"""Shared request rate limiting with adaptive backoff on throttling."""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Optional
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+# Statuses Amazon uses to throttle clients
+THROTTLE_STATUSES = (429, 503)
+# Statuses of transient server failures worth retrying
+TRANSIENT_STATUSES = (500, 502, 504)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header.
+
+    Args:
+        value: Header value, either seconds or an HTTP date
+
+    Returns:
+        Seconds to wait, or None if the header is missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """Token bucket shared by all requests of a client.
+
+    Requests take a token each; tokens refill at ``rate`` per second up to
+    ``burst``. The rate adapts AIMD-style: every successful request adds
+    ``increase`` requests/second (up to the configured rate), and every
+    throttled response multiplies it by ``decrease`` and pauses all
+    requests for the server's Retry-After, or a jittered backoff, at most
+    ``max_backoff`` seconds either way.
+    """
+
+    def __init__(
+        self,
+        rate: Optional[float] = 5.0,
+        burst: int = 10,
+        min_rate: float = 0.2,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        retries: int = 4,
+        backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize the limiter.
+
+        Args:
+            rate: Requests per second, or None for no limit (throttling still
+                pauses requests)
+            burst: Requests allowed back to back after an idle period
+            min_rate: Lowest rate throttling can reduce the limit to
+            increase: Requests/second added after each successful request
+            decrease: Factor the rate is multiplied by when throttled
+            retries: Retries of throttled or transiently failed requests
+            backoff: Base delay in seconds, doubled with every retry
+            max_backoff: Longest delay between retries, in seconds, also
+                applied to the server's Retry-After
+            clock: Monotonic clock, replaceable for testing
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min(min_rate, rate) if rate else min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    @classmethod
+    def from_config(cls, config: Config) -> "RateLimiter":
+        """Create a limiter from the ``rate_limit`` configuration section.
+
+        Args:
+            config: Configuration object
+
+        Returns:
+            Configured limiter
+        """
+        return cls(
+            rate=config.get("rate_limit.requests_per_second", 5.0),
+            burst=config.get("rate_limit.burst", 10),
+            min_rate=config.get("rate_limit.min_rate", 0.2),
+            increase=config.get("rate_limit.increase", 0.1),
+            decrease=config.get("rate_limit.decrease", 0.5),
+            retries=config.get("rate_limit.retries", 4),
+            backoff=config.get("rate_limit.backoff", 1.0),
+            max_backoff=config.get("rate_limit.max_backoff", 60.0),
+        )
+
+    def reserve(self) -> float:
+        """Take a token, possibly one that has not been refilled yet.
+
+        Returns:
+            Seconds the caller must wait before sending its request
+        """
+        with self._lock:
+            now = self._clock()
+            if not self.rate:
+                return max(0.0, self._paused_until - now)
+
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def _pause_remaining(self) -> float:
+        """Seconds left of a pause started by a throttled response."""
+        with self._lock:
+            return self._paused_until - self._clock()
+
+    def acquire(self) -> None:
+        """Block until the next request may be sent."""
+        time.sleep(self.reserve())
+        # Throttling may have paused requests while this one was waiting
+        remaining = self._pause_remaining()
+        while remaining > 0:
+            time.sleep(remaining)
+            remaining = self._pause_remaining()
+
+    async def acquire_async(self) -> None:
+        """Wait until the next request may be sent, without blocking the loop."""
+        await asyncio.sleep(self.reserve())
+        remaining = self._pause_remaining()
+        while remaining > 0:
+            await asyncio.sleep(remaining)
+            remaining = self._pause_remaining()
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Get a jittered exponential backoff delay.
+
+        Args:
+            attempt: Number of retries made so far
+
+        Returns:
+            Random delay between 0 and ``backoff * 2 ** attempt`` seconds,
+            capped at ``max_backoff``
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+
+    def succeeded(self) -> None:
+        """Additively raise the rate after a successful request."""
+        with self._lock:
+            if self.rate and self.max_rate and self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def throttled(self, delay: float) -> None:
+        """Multiplicatively lower the rate and pause all requests.
+
+        Args:
+            delay: Seconds to pause before the next request
+        """
+        with self._lock:
+            now = self._clock()
+            if self.rate:
+                self.rate = max(self.min_rate, self.rate * self.decrease)
+                self._tokens = min(self._tokens, 0.0)
+                self._updated = now
+            self._paused_until = max(self._paused_until, now + delay)
+        logger.warning(
+            "Throttled by Amazon, pausing %.1fs and slowing to %s requests/s",
+            delay,
+            f"{self.rate:.2f}" if self.rate else "unlimited",
+        )
+
+    def observe(
+        self,
+        status_code: int,
+        retry_after: Optional[str] = None,
+        attempt: int = 0,
+        throttled: bool = False,
+    ) -> Optional[float]:
+        """Adapt to a response and decide whether to retry it.
+
+        Args:
+            status_code: HTTP status of the response
+            retry_after: The response's Retry-After header
+            attempt: Number of retries made so far for this request
+            throttled: If True, treat the response as throttled whatever its
+                status, e.g. for captcha interstitials
+
+        Returns:
+            Seconds to wait before retrying, or None if the response is final
+        """
+        if throttled or status_code in THROTTLE_STATUSES:
+            delay = parse_retry_after(retry_after)
+            if delay is None:
+                delay = self.backoff_delay(attempt)
+            else:
+                # A huge or bogus Retry-After must not stall every request
+                delay = min(delay, self.max_backoff)
+            self.throttled(delay)
+            return delay if attempt < self.retries else None
+
+        if status_code in TRANSIENT_STATUSES:
+            return self.backoff_delay(attempt) if attempt < self.retries else None
+
+        self.succeeded()
+        return None
@@ -0,0 +1,181 @@
+"""Event-driven page readiness waits replacing fixed sleeps."""
+
+import logging
+import time
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Installs a MutationObserver on first use (and again after every navigation,
+# since the window object is replaced) and returns
+# [readyState, ms since last DOM mutation, resource entries loaded so far].
+READINESS_SCRIPT = """
+    if (!window.__invoiceFetcherMutations) {
+        const state = { last: performance.now() };
+        window.__invoiceFetcherMutations = state;
+        new MutationObserver(() => { state.last = performance.now(); }).observe(
+            document,
+            { childList: true, subtree: true, attributes: true, characterData: true }
+        );
+    }
+    return [
+        document.readyState,
+        performance.now() - window.__invoiceFetcherMutations.last,
+        performance.getEntriesByType("resource").length,
+    ];
+"""
+
+# Returns the number of elements matched by the first selector that matches
+COUNT_SCRIPT = """
+    const selectors = arguments[0];
+    for (const sel of selectors) {
+        try {
+            const count = document.querySelectorAll(sel).length;
+            if (count) { return count; }
+        } catch (e) {}
+    }
+    return 0;
+"""
+
+
+class PageReadiness:
+    """Waits until a page is actually ready instead of sleeping a fixed time.
+
+    A page counts as ready once ``document.readyState`` is ``complete``, the
+    DOM has not mutated for ``quiet_period`` seconds and no new network
+    resources have been fetched in that time. Every wait is capped at
+    ``timeout`` seconds, after which the caller simply carries on.
+    """
+
+    POLL_INTERVAL = 0.1
+
+    def __init__(self, driver, timeout: float = 10, quiet_period: float = 0.5):
+        """Initialize the readiness waiter.
+
+        Args:
+            driver: WebDriver instance
+            timeout: Maximum seconds any single wait may take
+            quiet_period: Seconds without DOM or network activity that count
+                as settled
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.quiet_period = quiet_period
+
+    def wait_for(
+        self, condition: Callable[[], bool], timeout: Optional[float] = None
+    ) -> bool:
+        """Poll a condition until it holds or the timeout expires.
+
+        Args:
+            condition: Callable returning True once the wait is over
+            timeout: Maximum seconds to wait (defaults to the configured ceiling)
+
+        Returns:
+            True if the condition was met, False on timeout
+        """
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        while True:
+            try:
+                if condition():
+                    return True
+            except Exception:
+                # Pages mid-navigation can reject scripts; just poll again
+                pass
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(self.POLL_INTERVAL)
+
+    def page_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the document to load and the DOM and network to settle.
+
+        Args:
+            timeout: Maximum seconds to wait (defaults to the configured ceiling)
+
+        Returns:
+            True if the page settled, False on timeout
+        """
+        start = time.monotonic()
+        quiet_ms = self.quiet_period * 1000
+        resources = {"count": -1, "since": start}
+
+        def settled() -> bool:
+            ready_state, ms_since_mutation, resource_count = self.driver.execute_script(
+                READINESS_SCRIPT
+            )
+            now = time.monotonic()
+            if resource_count != resources["count"]:
+                resources["count"] = resource_count
+                resources["since"] = now
+
+            return (
+                ready_state == "complete"
+                and ms_since_mutation >= quiet_ms
+                and now - resources["since"] >= self.quiet_period
+            )
+
+        ready = self.wait_for(settled, timeout)
+        logger.debug(
+            "Page %s after %.1f ms",
+            "ready" if ready else "not ready",
+            (time.monotonic() - start) * 1000,
+        )
+        return ready
+
+    def dom_quiet(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the DOM stops changing, e.g. after scrolling.
+
+        Args:
+            timeout: Maximum seconds to wait (defaults to the configured ceiling)
+
+        Returns:
+            True if the DOM settled, False on timeout
+        """
+        quiet_ms = self.quiet_period * 1000
+        return self.wait_for(
+            lambda: self.driver.execute_script(READINESS_SCRIPT)[1] >= quiet_ms,
+            timeout,
+        )
+
+    def element_count_stable(
+        self,
+        selectors: List[str],
+        previous_count: int = 0,
+        timeout: Optional[float] = None,
+    ) -> int:
+        """Wait until more elements than before appear and stop increasing.
+
+        Args:
+            selectors: CSS selectors for the elements to count
+            previous_count: Count before the action that loads more elements
+            timeout: Maximum seconds to wait (defaults to the configured ceiling)
+
+        Returns:
+            The element count when the wait finished
+        """
+        last_count = previous_count
+        since = time.monotonic()
+
+        def stable() -> bool:
+            nonlocal last_count, since
+            count = self.driver.execute_script(COUNT_SCRIPT, selectors)
+            now = time.monotonic()
+            if count != last_count:
+                last_count = count
+                since = now
+                return False
+            return count > previous_count and now - since >= self.quiet_period
+
+        self.wait_for(stable, timeout)
+        return last_count
+
+    def count(self, selectors: List[str]) -> int:
+        """Count elements matched by the first matching selector.
+
+        Args:
+            selectors: CSS selectors to try in order
+
+        Returns:
+            Number of matching elements
+        """
+        return self.driver.execute_script(COUNT_SCRIPT, selectors)
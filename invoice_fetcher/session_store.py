@@ -0,0 +1,126 @@
+"""Encrypted on-disk storage for authenticated session cookies."""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import keyring
+from cryptography.fernet import Fernet, InvalidToken
+
+from .exceptions import FileError
+
+
+class SessionStore:
+    """Stores browser session cookies per account, encrypted at rest.
+
+    Cookies are encrypted with a per-account Fernet key that lives in the
+    system keyring, so the cookie files on disk are useless on their own.
+    """
+
+    KEYRING_SERVICE = "amazon-business-invoice-fetcher"
+    KEY_PREFIX = "session-key:"
+
+    def __init__(self, directory: Path, max_age: Optional[int] = None):
+        """Initialize the session store.
+
+        Args:
+            directory: Directory holding the encrypted cookie files
+            max_age: Maximum age in seconds before a stored session is ignored.
+                None means no age limit.
+        """
+        self.directory = Path(directory)
+        self.max_age = max_age
+
+    def _path(self, email: str) -> Path:
+        """Get the cookie file path for an account."""
+        digest = hashlib.sha256(email.strip().lower().encode("utf-8")).hexdigest()
+        return self.directory / f"{digest[:32]}.session"
+
+    def _get_key(self, email: str, create: bool = False) -> Optional[bytes]:
+        """Get the encryption key for an account from the keyring.
+
+        Args:
+            email: Account email
+            create: If True, generate and store a key when none exists
+
+        Returns:
+            Encryption key or None if unavailable
+        """
+        username = f"{self.KEY_PREFIX}{email}"
+        key = keyring.get_password(self.KEYRING_SERVICE, username)
+        if key:
+            return key.encode("ascii")
+
+        if not create:
+            return None
+
+        new_key = Fernet.generate_key()
+        keyring.set_password(self.KEYRING_SERVICE, username, new_key.decode("ascii"))
+        return new_key
+
+    def save(self, email: str, cookies: List[dict]) -> None:
+        """Encrypt and store cookies for an account.
+
+        Args:
+            email: Account email
+            cookies: Cookies as returned by WebDriver.get_cookies()
+
+        Raises:
+            FileError: If the cookies cannot be stored
+        """
+        try:
+            key = self._get_key(email, create=True)
+            if key is None:
+                raise FileError("no encryption key available")
+            payload = json.dumps({"saved_at": time.time(), "cookies": cookies})
+            token = Fernet(key).encrypt(payload.encode("utf-8"))
+
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self._path(email)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, "wb") as f:
+                f.write(token)
+        except Exception as e:
+            raise FileError(f"Failed to save session for {email}: {e}")
+
+    def load(self, email: str) -> Optional[List[dict]]:
+        """Load stored cookies for an account.
+
+        Args:
+            email: Account email
+
+        Returns:
+            List of cookies, or None if there is no usable stored session
+        """
+        path = self._path(email)
+        if not path.exists():
+            return None
+
+        try:
+            key = self._get_key(email)
+            if not key:
+                return None
+
+            payload = json.loads(Fernet(key).decrypt(path.read_bytes()))
+        except (InvalidToken, ValueError):
+            # Corrupt file or key rotated - the session is unusable
+            self.clear(email)
+            return None
+        except Exception:
+            return None
+
+        if self.max_age is not None:
+            if time.time() - payload.get("saved_at", 0) > self.max_age:
+                return None
+
+        return payload.get("cookies") or None
+
+    def clear(self, email: str) -> None:
+        """Remove the stored session for an account."""
+        try:
+            self._path(email).unlink()
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,157 @@
+"""Per-team synchronisation state for incremental fetches."""
+
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from .exceptions import FileError
+
+
+class SyncState:
+    """High-water mark of the orders already fetched for a team.
+
+    The state lives in a small JSON file inside the team directory and
+    records when the last successful run happened and the newest order it
+    saw, so later runs only need to enumerate newer orders.
+
+    It also records the period the fetched orders are complete for
+    (``covered_since`` to ``covered_until``). Runs limited with ``--days``,
+    ``--since`` or ``--until`` only extend that period when they connect
+    to it, so the watermark never skips over orders that were not fetched.
+    """
+
+    FILENAME = ".sync-state.json"
+
+    def __init__(self, team_dir: Path):
+        """Initialize the sync state.
+
+        Args:
+            team_dir: Directory holding the team's invoices
+        """
+        self.path = Path(team_dir) / self.FILENAME
+        self.last_run: Optional[datetime] = None
+        self.newest_order_date: Optional[datetime] = None
+        self.newest_order_number: Optional[str] = None
+        self.covered_since: Optional[datetime] = None
+        self.covered_until: Optional[datetime] = None
+        self._load()
+
+    def _load(self) -> None:
+        """Load the state from disk, ignoring missing or corrupt files."""
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        try:
+            if data.get("last_run"):
+                self.last_run = datetime.fromisoformat(data["last_run"])
+            if data.get("newest_order_date"):
+                self.newest_order_date = datetime.fromisoformat(
+                    data["newest_order_date"]
+                )
+            self.newest_order_number = data.get("newest_order_number")
+            if data.get("covered_since") and data.get("covered_until"):
+                self.covered_since = datetime.fromisoformat(data["covered_since"])
+                self.covered_until = datetime.fromisoformat(data["covered_until"])
+        except (AttributeError, TypeError, ValueError):
+            # Treat an unreadable state like a first run
+            self.last_run = self.newest_order_date = self.newest_order_number = None
+            self.covered_since = self.covered_until = None
+
+    def watermark(
+        self, overlap_days: int = 0, window_start: Optional[datetime] = None
+    ) -> Optional[datetime]:
+        """Get the date from which orders need to be enumerated.
+
+        Args:
+            overlap_days: Days to re-scan before the newest order seen, to
+                catch orders whose invoices appeared late
+            window_start: Start of the lookback window the fetch has to
+                cover; without a complete record back to this date there is
+                no watermark
+
+        Returns:
+            Start date for the next fetch, or None if there is no state yet
+            or the orders since ``window_start`` have not all been fetched
+        """
+        if self.newest_order_date is None:
+            return None
+        if window_start is not None and (
+            self.covered_since is None or self.covered_since > window_start
+        ):
+            return None
+        return self.newest_order_date - timedelta(days=overlap_days)
+
+    def update(
+        self,
+        orders: Iterable[Dict[str, Any]],
+        run_time: datetime,
+        since: datetime,
+        until: Optional[datetime] = None,
+    ) -> None:
+        """Advance the state after a successful run.
+
+        The watermark only advances if the run's period connects to the
+        period already covered, or if there is none yet and the run reached
+        up to now.
+
+        Args:
+            orders: Orders handled by the run
+            run_time: When the run started
+            since: Start of the period the run listed orders for
+            until: End of that period, if the run stopped before now
+        """
+        self.last_run = run_time
+        end = min(until, run_time) if until else run_time
+
+        if self.covered_since is None or self.covered_until is None:
+            if until:
+                # A closed period on its own leaves a gap up to now
+                return
+            self.covered_since, self.covered_until = since, end
+        elif since <= self.covered_until and end >= self.covered_since:
+            self.covered_since = min(self.covered_since, since)
+            self.covered_until = max(self.covered_until, end)
+        else:
+            return
+
+        for order in orders:
+            order_date = order.get("date")
+            if order_date and (
+                self.newest_order_date is None or order_date > self.newest_order_date
+            ):
+                self.newest_order_date = order_date
+                self.newest_order_number = order.get("order_number")
+
+    def save(self) -> None:
+        """Write the state to disk atomically.
+
+        Raises:
+            FileError: If the state cannot be written
+        """
+        data = {
+            "last_run": self.last_run.isoformat() if self.last_run else None,
+            "newest_order_date": (
+                self.newest_order_date.isoformat() if self.newest_order_date else None
+            ),
+            "newest_order_number": self.newest_order_number,
+            "covered_since": (
+                self.covered_since.isoformat() if self.covered_since else None
+            ),
+            "covered_until": (
+                self.covered_until.isoformat() if self.covered_until else None
+            ),
+        }
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            raise FileError(f"Failed to save sync state {self.path}: {e}")
@@ -0,0 +1,138 @@
+"""Routing of orders to teams within a single fetch."""
+
+from fnmatch import fnmatchcase
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .config import Config
+from .exceptions import ConfigurationError
+
+# Match rule keys in the ``teams`` config section -> order fields they test
+MATCH_FIELDS = {
+    "requester": "requester",
+    "purchasing_group": "purchasing_group",
+    "po": "po_number",
+}
+
+
+class TeamRouter:
+    """Decides which team's folder an order's invoice is filed in.
+
+    Each team may have ``match`` rules in the ``teams`` config section,
+    listing glob patterns (case-insensitive) for the requester, purchasing
+    group or PO number shown on the order card. An order goes to the first
+    selected team with a matching rule; orders matching no rule go to the
+    first selected team that has no rules at all.
+    """
+
+    def __init__(self, teams: List[str], rules: Dict[str, Dict[str, List[str]]]):
+        """Initialize the router.
+
+        Args:
+            teams: Selected team names, in priority order
+            rules: Match rules per team, mapping rule keys to patterns
+        """
+        self.teams = list(teams)
+        self.rules = {team: rules.get(team) or {} for team in self.teams}
+        self.fallback = next((t for t in self.teams if not self.rules[t]), None)
+
+    @classmethod
+    def from_config(cls, config: Config, teams: List[str]) -> "TeamRouter":
+        """Create a router for the selected teams.
+
+        Args:
+            config: Configuration object
+            teams: Selected team names
+
+        Returns:
+            Configured router
+
+        Raises:
+            ConfigurationError: If a match rule is malformed
+        """
+        rules = {}
+        for team in teams:
+            match = (config.get(f"teams.{team}") or {}).get("match") or {}
+            if not isinstance(match, dict):
+                raise ConfigurationError(f"teams.{team}.match must be a mapping")
+
+            team_rules = {}
+            for key, patterns in match.items():
+                if key not in MATCH_FIELDS:
+                    raise ConfigurationError(
+                        f"Unknown match rule teams.{team}.match.{key} "
+                        f"(expected one of: {', '.join(MATCH_FIELDS)})"
+                    )
+                if isinstance(patterns, str):
+                    patterns = [patterns]
+                team_rules[key] = [str(p).lower() for p in patterns or []]
+            rules[team] = team_rules
+
+        return cls(teams, rules)
+
+    @staticmethod
+    def configured_teams(config: Config) -> List[str]:
+        """List the teams defined in the ``teams`` config section.
+
+        Args:
+            config: Configuration object
+
+        Returns:
+            Team names in configuration order
+        """
+        return list(config.get("teams") or {})
+
+    @property
+    def has_rules(self) -> bool:
+        """Whether any selected team routes by order fields."""
+        return any(self.rules.values())
+
+    def route(self, order: Dict[str, Any]) -> Optional[str]:
+        """Pick the team for an order.
+
+        Args:
+            order: Order dictionary as returned by the invoice client
+
+        Returns:
+            Team name, or None if no selected team takes the order
+        """
+        for team in self.teams:
+            for key, patterns in self.rules[team].items():
+                value = order.get(MATCH_FIELDS[key])
+                if value and any(
+                    fnmatchcase(str(value).lower(), pattern) for pattern in patterns
+                ):
+                    return team
+        return self.fallback
+
+
+def team_download_dir(config: Config, team: str) -> Path:
+    """Get the directory a team's invoices are stored in.
+
+    Args:
+        config: Configuration object
+        team: Team name
+
+    Returns:
+        ``teams.<team>.download_dir`` if configured, otherwise the team's
+        folder under the download directory
+    """
+    download_dir = (config.get(f"teams.{team}") or {}).get("download_dir")
+    if download_dir:
+        return Path(download_dir).expanduser()
+    return config.download_dir / team
+
+
+def team_download_dirs(config: Config) -> Dict[str, Path]:
+    """Get the directories of all teams defined in the configuration.
+
+    Args:
+        config: Configuration object
+
+    Returns:
+        Team name -> directory its invoices are stored in
+    """
+    return {
+        team: team_download_dir(config, team)
+        for team in TeamRouter.configured_teams(config)
+    }
@@ -0,0 +1,96 @@
+"""HTTP transport tuning for the requests session used by the client."""
+
+import socket
+from typing import Any, List, Optional, Tuple
+
+import requests
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .config import Config
+
+
+class TunedHTTPAdapter(HTTPAdapter):
+    """HTTP adapter that applies socket options to every pooled connection."""
+
+    def __init__(self, socket_options: List[Tuple[int, int, int]], **kwargs):
+        """Initialize the adapter.
+
+        Args:
+            socket_options: ``(level, option, value)`` tuples set on each socket
+            **kwargs: Passed on to ``HTTPAdapter``
+        """
+        self.socket_options = socket_options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        """Create the pool manager with the configured socket options."""
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+def socket_options(tcp_nodelay: bool = True, keep_alive: bool = True) -> list:
+    """Build the socket options for pooled connections.
+
+    Args:
+        tcp_nodelay: Disable Nagle's algorithm so small requests aren't delayed
+        keep_alive: Enable TCP keep-alive probes on idle pooled connections
+
+    Returns:
+        List of ``(level, option, value)`` tuples
+    """
+    options = [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 if tcp_nodelay else 0)]
+    if keep_alive:
+        options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    return options
+
+
+def configure_session(
+    session: requests.Session,
+    config: Config,
+    concurrency: Optional[int] = None,
+    user_agent: Optional[str] = None,
+) -> requests.Session:
+    """Mount tuned adapters and default headers on a session.
+
+    Connection pools are sized to the download concurrency so every worker
+    can keep its connection alive instead of opening a new one per invoice.
+
+    Args:
+        session: Session to configure
+        config: Configuration providing the ``transport`` section
+        concurrency: Number of parallel downloads the session must serve
+        user_agent: User-Agent header sent with every request
+
+    Returns:
+        The configured session
+    """
+    keep_alive = config.get("transport.keep_alive", True)
+    pool_maxsize = config.get("transport.pool_maxsize") or max(
+        concurrency or 0, DEFAULT_POOLSIZE
+    )
+
+    # Only connection failures are retried here; throttling and server
+    # errors are retried by the client's rate limiter
+    retry = Retry(
+        total=config.get("transport.retries", 3),
+        backoff_factor=config.get("transport.backoff_factor", 0.5),
+        status_forcelist=(),
+        allowed_methods=frozenset({"GET", "HEAD"}),
+    )
+    adapter = TunedHTTPAdapter(
+        socket_options(config.get("transport.tcp_nodelay", True), keep_alive),
+        pool_connections=config.get("transport.pool_connections", 10),
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    session.headers["Accept-Language"] = "en-US,en;q=0.9"
+    if user_agent:
+        session.headers["User-Agent"] = user_agent
+    if not keep_alive:
+        session.headers["Connection"] = "close"
+
+    return session
@@ -0,0 +1,370 @@
+"""Tests for the async download engine."""
+
+import asyncio
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+import yaml
+
+from invoice_fetcher.async_downloader import AsyncInvoiceDownloader
+from invoice_fetcher.config import Config
+from invoice_fetcher.downloader import DOWNLOADED, ERROR, SKIPPED, UNCHANGED
+from invoice_fetcher.exceptions import NetworkError
+from invoice_fetcher.file_manager import FileManager
+from invoice_fetcher.partial import PartialDownload
+from invoice_fetcher.ratelimit import RateLimiter
+
+
+def make_order(suffix: str, **overrides) -> dict:
+    """Build an order dictionary for tests."""
+    order = {
+        "order_number": f"123-4567890-{suffix}",
+        "date": datetime(2024, 3, 15),
+        "total": "249.99",
+        "invoice_url": f"https://business.amazon.com/invoice/{suffix}",
+    }
+    order.update(overrides)
+    return order
+
+
+class FakeAsyncClient:
+    """Async client serving canned invoice bodies."""
+
+    def __init__(self, bodies: dict, delay: float = 0):
+        self.bodies = bodies
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def download_to(self, invoice_url: str, partial, validators=None) -> bool:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            body = self.bodies.get(invoice_url)
+            if body is None:
+                raise NetworkError("404 Not Found")
+            if validators is not None:
+                return False
+            partial.begin(200, {"Content-Length": str(len(body))})
+            partial.write(body)
+            partial.finish()
+            return True
+        finally:
+            self.in_flight -= 1
+
+
+class TestAsyncInvoiceDownloader:
+    """Test the asyncio download pipeline."""
+
+    def make_downloader(self, fm, fake, **kwargs) -> AsyncInvoiceDownloader:
+        """Create a downloader using a fake async client."""
+        downloader = AsyncInvoiceDownloader(MagicMock(), fm, **kwargs)
+        downloader._open_client = lambda: fake
+        return downloader
+
+    def test_downloads_and_counts(self):
+        """Test that results are counted per status."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            fm = FileManager(Path(temp_dir))
+            fm.save_invoice(
+                b"existing", datetime(2024, 3, 15), "249.99", "123-4567890-0000001"
+            )
+            orders = [
+                make_order("0000001"),
+                make_order("0000002"),
+                make_order("0000003", invoice_url=None),
+                make_order("0000004"),
+            ]
+            fake = FakeAsyncClient({orders[1]["invoice_url"]: b"%PDF-1.4 content"})
+
+            results = []
+            downloader = self.make_downloader(fm, fake, concurrency=4)
+            counts = downloader.run(
+                orders, on_result=lambda o, s, m: results.append((o, s))
+            )
+
+            assert counts == {DOWNLOADED: 1, SKIPPED: 1, UNCHANGED: 0, ERROR: 2}
+            assert len(results) == 4
+            saved = fm.get_file_path(
+                datetime(2024, 3, 15), "249.99", "123-4567890-0000002"
+            )
+            assert saved.read_bytes() == b"%PDF-1.4 content"
+
+    def test_downloads_overlap(self):
+        """Test that downloads run concurrently up to the limit."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            fm = FileManager(Path(temp_dir))
+            orders = [make_order(f"{i:07d}") for i in range(12)]
+            fake = FakeAsyncClient(
+                {order["invoice_url"]: b"%PDF" for order in orders}, delay=0.05
+            )
+
+            counts = self.make_downloader(fm, fake, concurrency=4).run(iter(orders))
+
+            assert counts[DOWNLOADED] == 12
+            assert fake.max_in_flight == 4
+
+    def test_dry_run_does_not_download(self):
+        """Test that dry run reports without downloading."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            fm = FileManager(Path(temp_dir))
+            fake = FakeAsyncClient({})
+
+            counts = self.make_downloader(fm, fake, dry_run=True).run(
+                [make_order("0000001")]
+            )
+
+            assert counts == {DOWNLOADED: 1, SKIPPED: 0, UNCHANGED: 0, ERROR: 0}
+            assert fm.list_existing_invoices() == []
+
+    def test_enumeration_error_propagates(self):
+        """Test that a failing order source stops the pipeline."""
+
+        def orders():
+            yield make_order("0000001")
+            raise NetworkError("listing failed")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            fm = FileManager(Path(temp_dir))
+            fake = FakeAsyncClient({})
+
+            with pytest.raises(NetworkError):
+                self.make_downloader(fm, fake).run(orders())
+
+    def test_refresh_counts_unchanged(self):
+        """Test that a stored invoice reported as not modified is kept."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            fm = FileManager(Path(temp_dir))
+            order = make_order("0000001")
+            fm.save_invoice(
+                b"%PDF-v1", order["date"], order["total"], order["order_number"]
+            )
+            fake = FakeAsyncClient({order["invoice_url"]: b"%PDF-v2"})
+
+            counts = self.make_downloader(fm, fake, refresh=True).run([order])
+
+            assert counts[UNCHANGED] == 1
+            file_path = fm.get_file_path(
+                order["date"], order["total"], order["order_number"]
+            )
+            assert file_path.read_bytes() == b"%PDF-v1"
+
+
+class TestAsyncInvoiceClient:
+    """Test the httpx invoice client."""
+
+    def make_client(self, temp_dir: str, handler):
+        """Create an async client backed by a mock transport."""
+        httpx = pytest.importorskip("httpx")
+        from invoice_fetcher.async_client import AsyncInvoiceClient
+
+        config_file = Path(temp_dir) / "config.yaml"
+        with open(config_file, "w") as f:
+            yaml.dump({"client": {"cookie_ttl": 300}}, f)
+
+        session = requests.Session()
+        session.headers["User-Agent"] = "invoice-fetcher-test"
+        session.cookies.set("session-id", "1", domain="business.amazon.com")
+
+        sync_client = MagicMock()
+        sync_client.config = Config(config_file)
+        sync_client.session = session
+        sync_client.referer = "https://business.amazon.com/orders"
+        sync_client.cookie_ttl = 300
+        sync_client.AUTH_FAILURE_STATUSES = (401, 403)
+        sync_client.CHUNK_SIZE = 4
+        sync_client.rate_limiter = RateLimiter(rate=None, retries=1, backoff=0)
+
+        return sync_client, AsyncInvoiceClient(
+            sync_client, transport=httpx.MockTransport(handler)
+        )
+
+    def test_download_invoice(self):
+        """Test that invoices are downloaded with the session's cookies."""
+        httpx = pytest.importorskip("httpx")
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(
+                200, headers={"content-type": "application/pdf"}, content=b"%PDF-1.4"
+            )
+
+        async def download(client):
+            async with client:
+                return await client.download_invoice(
+                    "https://business.amazon.com/invoice/1"
+                )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _, client = self.make_client(temp_dir, handler)
+            content = asyncio.run(download(client))
+
+        assert content == b"%PDF-1.4"
+        assert seen[0].headers["Cookie"] == "session-id=1"
+        assert seen[0].headers["User-Agent"] == "invoice-fetcher-test"
+        assert seen[0].headers["Referer"] == "https://business.amazon.com/orders"
+
+    def test_auth_failure_refreshes_cookies(self):
+        """Test that a rejected download is retried with fresh cookies."""
+        httpx = pytest.importorskip("httpx")
+        statuses = [403, 200]
+
+        def handler(request):
+            return httpx.Response(
+                statuses.pop(0),
+                headers={"content-type": "application/pdf"},
+                content=b"%PDF",
+            )
+
+        async def download(client):
+            async with client:
+                return await client.download_invoice(
+                    "https://business.amazon.com/invoice/1"
+                )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sync_client, client = self.make_client(temp_dir, handler)
+            content = asyncio.run(download(client))
+
+        assert content == b"%PDF"
+        sync_client.refresh_cookies.assert_called_once_with(True)
+
+    def test_throttled_download_retried(self):
+        """Test that a 429 is retried after the server's Retry-After."""
+        httpx = pytest.importorskip("httpx")
+        statuses = [429, 200]
+
+        def handler(request):
+            return httpx.Response(
+                statuses.pop(0),
+                headers={"content-type": "application/pdf", "Retry-After": "0"},
+                content=b"%PDF",
+            )
+
+        async def download(client):
+            async with client:
+                return await client.download_invoice(
+                    "https://business.amazon.com/invoice/1"
+                )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sync_client, client = self.make_client(temp_dir, handler)
+            content = asyncio.run(download(client))
+
+        assert content == b"%PDF"
+        assert statuses == []
+
+    def test_http_error_raises_network_error(self):
+        """Test that HTTP errors surface as NetworkError."""
+        httpx = pytest.importorskip("httpx")
+
+        async def download(client):
+            async with client:
+                return await client.download_invoice(
+                    "https://business.amazon.com/invoice/1"
+                )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _, client = self.make_client(temp_dir, lambda request: httpx.Response(500))
+            with pytest.raises(NetworkError):
+                asyncio.run(download(client))
+
+    def test_conditional_download_not_modified(self):
+        """Test that stored validators are sent and a 304 skips the download."""
+        httpx = pytest.importorskip("httpx")
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(304)
+
+        async def download(client, partial):
+            async with client:
+                return await client.download_to(
+                    "https://business.amazon.com/invoice/1",
+                    partial,
+                    {"etag": '"v1"', "last_modified": None},
+                )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _, client = self.make_client(temp_dir, handler)
+            partial = PartialDownload(
+                Path(temp_dir) / "invoice.pdf", "https://business.amazon.com/invoice/1"
+            )
+            modified = asyncio.run(download(client, partial))
+
+            assert modified is False
+            assert not partial.path.exists()
+
+        assert seen[0].headers["If-None-Match"] == '"v1"'
+        assert "If-Modified-Since" not in seen[0].headers
+
+    def test_invoice_page_fetched_once_before_browser(self):
+        """Test that a non-PDF page is handed to the browser without a re-request."""
+        httpx = pytest.importorskip("httpx")
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(
+                200, headers={"content-type": "text/html"}, content=b"<html>"
+            )
+
+        async def download(client, partial):
+            async with client:
+                return await client.download_to(
+                    "https://business.amazon.com/invoice/1", partial
+                )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sync_client, client = self.make_client(temp_dir, handler)
+            sync_client.download_with_browser.return_value = b"%PDF-1.4"
+            partial = PartialDownload(
+                Path(temp_dir) / "invoice.pdf", "https://business.amazon.com/invoice/1"
+            )
+            assert asyncio.run(download(client, partial)) is True
+
+            assert partial.path.read_bytes() == b"%PDF-1.4"
+
+        assert len(seen) == 1
+        sync_client.download_with_browser.assert_called_once_with(
+            "https://business.amazon.com/invoice/1"
+        )
+        sync_client.download_invoice.assert_not_called()
+
+    def test_rejected_download_not_resumed(self):
+        """Test that HTTP errors fail at once instead of re-entering the resume loop."""
+        httpx = pytest.importorskip("httpx")
+        seen = []
+
+        def handler(request):
+            seen.append(request)
+            return httpx.Response(404)
+
+        async def download(client, partial):
+            async with client:
+                await client.download_to(
+                    "https://business.amazon.com/invoice/1", partial
+                )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            _, client = self.make_client(temp_dir, handler)
+            partial = PartialDownload(
+                Path(temp_dir) / "invoice.pdf", "https://business.amazon.com/invoice/1"
+            )
+            with pytest.raises(NetworkError):
+                asyncio.run(download(client, partial))
+
+        assert len(seen) == 1
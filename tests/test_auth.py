@@ -0,0 +1,137 @@
+"""Tests for auth module."""
+
+import logging
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import yaml
+
+from invoice_fetcher.auth import AmazonBusinessAuth
+from invoice_fetcher.config import Config
+from invoice_fetcher.exceptions import FileError
+
+
+def make_auth(temp_dir: str, **selenium_options) -> AmazonBusinessAuth:
+    """Create an authenticator with the given selenium options."""
+    config_file = Path(temp_dir) / "config.yaml"
+    with open(config_file, "w") as f:
+        yaml.dump(
+            {
+                "amazon": {"email": "buyer@example.com"},
+                "selenium": selenium_options,
+                "selectors": {"stats_file": str(Path(temp_dir) / "stats.json")},
+                "session": {"dir": str(Path(temp_dir) / "sessions")},
+            },
+            f,
+        )
+    return AmazonBusinessAuth(Config(config_file))
+
+
+class TestChromeOptions:
+    """Test browser profile options."""
+
+    def test_default_profile(self):
+        """Test that the default profile loads pages normally."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            options = make_auth(temp_dir)._chrome_options()
+
+            assert options.page_load_strategy == "normal"
+            assert "--headless" in options.arguments
+            assert "prefs" not in options.experimental_options
+
+    def test_lean_profile(self):
+        """Test that the lean profile loads eagerly without images."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            options = make_auth(temp_dir, profile="lean")._chrome_options()
+
+            assert options.page_load_strategy == "eager"
+            assert "--headless=new" in options.arguments
+            assert "--disable-extensions" in options.arguments
+            assert "--disable-background-networking" in options.arguments
+            prefs = options.experimental_options["prefs"]
+            assert prefs["profile.managed_default_content_settings.images"] == 2
+
+    def test_lean_profile_not_used_interactively(self):
+        """Test that interactive SSO windows keep the full profile."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            auth = make_auth(temp_dir, profile="lean")
+            options = auth._chrome_options(interactive=True)
+
+            assert options.page_load_strategy == "normal"
+            assert not any(arg.startswith("--headless") for arg in options.arguments)
+
+
+class TestLogout:
+    """Test closing or detaching the browser."""
+
+    def test_logout_detaches_from_daemon(self):
+        """Test that a daemon-attached driver leaves the browser running."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            auth = make_auth(temp_dir)
+            driver = auth.driver = MagicMock()
+            lease = auth._daemon_lease = MagicMock()
+
+            auth.logout()
+
+            driver.quit.assert_not_called()
+            driver.service.stop.assert_called_once()
+            lease.release.assert_called_once()
+            assert auth.driver is None
+
+    def test_logout_quits_own_browser(self):
+        """Test that a browser started by this run is closed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            auth = make_auth(temp_dir)
+            driver = auth.driver = MagicMock()
+
+            auth.logout()
+
+            driver.quit.assert_called_once()
+
+
+class TestIsLoggedIn:
+    """Test checking a running browser's session."""
+
+    def test_probes_with_browser_cookies(self):
+        """Test that the driver's cookies are validated with the probe request."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            auth = make_auth(temp_dir)
+            auth.driver = MagicMock()
+            auth.driver.get_cookies.return_value = [
+                {"name": "session-id", "value": "1", "domain": ".amazon.com"}
+            ]
+            seen = []
+
+            def session_is_alive(session):
+                seen.append(session.cookies.get("session-id"))
+                return False
+
+            auth._session_is_alive = session_is_alive
+
+            assert auth.is_logged_in() is False
+            assert seen == ["1"]
+
+    def test_no_browser(self):
+        """Test that a missing browser is not logged in."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            assert make_auth(temp_dir).is_logged_in() is False
+
+
+class TestSaveSession:
+    """Test persisting the browser's cookies."""
+
+    def test_save_failure_is_logged(self, caplog, capsys):
+        """Test that a failed save is logged, not printed, and doesn't fail."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            auth = make_auth(temp_dir)
+            auth.driver = MagicMock()
+            auth.driver.get_cookies.return_value = []
+            auth.session_store = MagicMock()
+            auth.session_store.save.side_effect = FileError("keyring locked")
+
+            with caplog.at_level(logging.WARNING, logger="invoice_fetcher.auth"):
+                auth._save_session()
+
+        assert "Could not save session: keyring locked" in caplog.text
+        assert capsys.readouterr().out == ""
@@ -0,0 +1,123 @@
+"""Tests for browser daemon module."""
+
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from invoice_fetcher.browserd import (
+    BrowserDaemon,
+    DaemonLease,
+    STATUS,
+    STOP,
+    read_state,
+    send_command,
+)
+
+
+def start_daemon(state_path: Path) -> tuple:
+    """Start a daemon around a fake logged-in browser in a thread."""
+    driver = MagicMock()
+    driver.capabilities = {"goog:chromeOptions": {"debuggerAddress": "localhost:9555"}}
+    auth = MagicMock()
+    auth.login.return_value = driver
+    auth.is_logged_in.return_value = True
+
+    daemon = BrowserDaemon(auth, state_path)
+    daemon.start()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    return daemon, thread
+
+
+class TestBrowserDaemon:
+    """Test the browser daemon control protocol."""
+
+    def test_attach_and_stop(self):
+        """Test that clients get the browser address and can stop the daemon."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_path = Path(temp_dir) / "browserd.json"
+            daemon, thread = start_daemon(state_path)
+
+            assert read_state(state_path)["debugger_address"] == "localhost:9555"
+
+            lease = DaemonLease.open(state_path, timeout=5)
+            assert lease.debugger_address == "localhost:9555"
+            lease.release()
+
+            assert send_command(state_path, STATUS)["pid"] > 0
+            assert send_command(state_path, STOP) == {"ok": True}
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+
+            daemon.shutdown()
+            assert not state_path.exists()
+            daemon.auth.logout.assert_called_once()
+
+    def test_leases_are_exclusive(self):
+        """Test that a second run waits until the first releases the browser."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_path = Path(temp_dir) / "browserd.json"
+            daemon, thread = start_daemon(state_path)
+
+            first = DaemonLease.open(state_path, timeout=5)
+            acquired = []
+
+            def second_run():
+                lease = DaemonLease.open(state_path, timeout=5)
+                acquired.append(time.monotonic())
+                lease.release()
+
+            waiter = threading.Thread(target=second_run)
+            waiter.start()
+            time.sleep(0.2)
+            assert acquired == []
+
+            released = time.monotonic()
+            first.release()
+            waiter.join(timeout=5)
+            assert acquired and acquired[0] >= released
+
+            send_command(state_path, STOP)
+            thread.join(timeout=5)
+            daemon.shutdown()
+
+    def test_status_and_stop_while_leased(self):
+        """Test that control commands are answered while a run holds the browser."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_path = Path(temp_dir) / "browserd.json"
+            daemon, thread = start_daemon(state_path)
+
+            lease = DaemonLease.open(state_path, timeout=5)
+            status = send_command(state_path, STATUS, timeout=2)
+            assert status["logged_in"] is True
+            assert status["debugger_address"] == "localhost:9555"
+
+            assert send_command(state_path, STOP, timeout=2) == {"ok": True}
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+
+            lease.release()
+            daemon.shutdown()
+
+    def test_expired_session_not_lent(self):
+        """Test that a logged-out browser is reported and not lent out."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_path = Path(temp_dir) / "browserd.json"
+            daemon, thread = start_daemon(state_path)
+            daemon.auth.is_logged_in.return_value = False
+
+            assert DaemonLease.open(state_path, timeout=5) is None
+            assert send_command(state_path, STATUS)["logged_in"] is False
+
+            send_command(state_path, STOP)
+            thread.join(timeout=5)
+            daemon.shutdown()
+
+    def test_no_daemon(self):
+        """Test that clients fall back when no daemon is running."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state_path = Path(temp_dir) / "browserd.json"
+            assert DaemonLease.open(state_path) is None
+            assert send_command(state_path, STATUS) is None
@@ -1,5 +1,8 @@
 """Tests for CLI module."""
 
+import subprocess
+import sys
+
 from click.testing import CliRunner
 from unittest.mock import patch, MagicMock
 
@@ -33,9 +36,9 @@ class TestCLI:
         assert "Missing option" in result.output or "required" in result.output.lower()
 
     @patch("invoice_fetcher.cli.Config")
-    @patch("invoice_fetcher.cli.AmazonBusinessAuth")
-    @patch("invoice_fetcher.cli.InvoiceClient")
-    @patch("invoice_fetcher.cli.FileManager")
+    @patch("invoice_fetcher.auth.AmazonBusinessAuth")
+    @patch("invoice_fetcher.client.InvoiceClient")
+    @patch("invoice_fetcher.file_manager.FileManager")
     def test_fetch_dry_run(
         self, mock_file_manager, mock_client, mock_auth, mock_config
     ):
@@ -45,6 +48,7 @@ class TestCLI:
 
         mock_cfg = MagicMock()
         mock_cfg.download_dir = Path("/tmp/invoices")
+        mock_cfg.get.side_effect = lambda key, default=None: default
         mock_config.return_value = mock_cfg
 
         # Mock authentication
@@ -57,7 +61,7 @@ class TestCLI:
 
         # Mock client
         mock_client_instance = MagicMock()
-        mock_client_instance.get_recent_orders.return_value = []
+        mock_client_instance.iter_orders.return_value = []
         mock_client.return_value = mock_client_instance
 
         # Mock file manager
@@ -72,6 +76,168 @@ class TestCLI:
         assert result.exit_code == 0
         assert "DRY RUN MODE" in result.output
 
+    @patch("invoice_fetcher.auth.AmazonBusinessAuth")
+    @patch("invoice_fetcher.client.InvoiceClient")
+    def test_fetch_multiple_teams(self, mock_client, mock_auth):
+        """Test one fetch files invoices for several teams."""
+        import tempfile
+        from datetime import datetime
+        from pathlib import Path
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.yaml"
+            config_file.write_text(
+                f"download_dir: {temp_dir}/invoices\n"
+                "amazon:\n"
+                "  email: buyer@example.com\n"
+                "selectors:\n"
+                f"  stats_file: {temp_dir}/stats.json\n"
+                "teams:\n"
+                "  engineering:\n"
+                "    match:\n"
+                "      po: ['ENG-*']\n"
+                "  marketing: {}\n"
+            )
+
+            mock_client.return_value.iter_orders.return_value = [
+                {
+                    "order_number": f"123-4567890-000000{i}",
+                    "date": datetime(2024, 3, 15),
+                    "total": "10.00",
+                    "invoice_url": f"https://business.amazon.com/invoice/{i}",
+                    "po_number": po,
+                }
+                for i, po in enumerate(["ENG-1", "MKT-1", "ENG-2"])
+            ]
+
+            result = self.runner.invoke(
+                main,
+                ["fetch", "--all-teams", "--config", str(config_file), "--dry-run"],
+            )
+
+            assert result.exit_code == 0, result.output
+            assert mock_auth.return_value.login.call_count <= 1
+            assert mock_client.return_value.iter_orders.call_count == 1
+            assert mock_client.call_args.kwargs["routing_fields"] is True
+            assert "Per-Team Summary" in result.output
+            assert "engineering" in result.output and "marketing" in result.output
+
+    @patch("invoice_fetcher.auth.AmazonBusinessAuth")
+    @patch("invoice_fetcher.client.InvoiceClient")
+    def test_verbose_fetch_logs_probe_timings(self, mock_client, mock_auth, caplog):
+        """Test that --verbose logs selector probe timings when the fetch ends."""
+        import logging
+        import tempfile
+        from pathlib import Path
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.yaml"
+            config_file.write_text(
+                f"download_dir: {temp_dir}/invoices\n"
+                "amazon:\n"
+                "  email: buyer@example.com\n"
+                "selectors:\n"
+                f"  stats_file: {temp_dir}/stats.json\n"
+            )
+            mock_auth.return_value.probe = None
+            mock_client.return_value.iter_orders.return_value = []
+            mock_client.return_value.probe_summary.return_value = {
+                "order_card": {"calls": 3, "total_ms": 42.0, "max_ms": 30.0}
+            }
+
+            package_logger = logging.getLogger("invoice_fetcher")
+            try:
+                with caplog.at_level(logging.DEBUG):
+                    result = self.runner.invoke(
+                        main,
+                        [
+                            "fetch",
+                            "--team",
+                            "engineering",
+                            "--config",
+                            str(config_file),
+                            "--dry-run",
+                            "--verbose",
+                        ],
+                    )
+            finally:
+                package_logger.handlers = []
+                package_logger.setLevel(logging.NOTSET)
+
+            assert result.exit_code == 0, result.output
+            assert (
+                "Selector group order_card: 3 lookups, 42 ms total, 30 ms max"
+                in caplog.text
+            )
+
+    @patch("invoice_fetcher.auth.AmazonBusinessAuth")
+    @patch("invoice_fetcher.client.InvoiceClient")
+    def test_narrow_fetch_does_not_skip_older_orders(self, mock_client, mock_auth):
+        """Test that a default run after --days 3 rescans the whole window."""
+        import tempfile
+        from datetime import datetime, timedelta
+        from pathlib import Path
+
+        def download_to(url, partial, validators=None):
+            partial.begin(200, {"Content-Length": "4"})
+            partial.write(b"%PDF")
+            partial.finish()
+            return True
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.yaml"
+            config_file.write_text(
+                f"download_dir: {temp_dir}/invoices\n"
+                "amazon:\n"
+                "  email: buyer@example.com\n"
+                "selectors:\n"
+                f"  stats_file: {temp_dir}/stats.json\n"
+            )
+            client = mock_client.return_value
+            client.download_to.side_effect = download_to
+            client.iter_orders.return_value = [
+                {
+                    "order_number": "123-4567890-0000001",
+                    "date": datetime.now() - timedelta(days=1),
+                    "total": "10.00",
+                    "invoice_url": "https://business.amazon.com/invoice/1",
+                }
+            ]
+            fetch = ["fetch", "--team", "engineering", "--config", str(config_file)]
+
+            result = self.runner.invoke(main, fetch + ["--days", "3"])
+            assert result.exit_code == 0, result.output
+
+            result = self.runner.invoke(main, fetch)
+            assert result.exit_code == 0, result.output
+            since = client.iter_orders.call_args.kwargs["since"]
+            assert since < datetime.now() - timedelta(days=89)
+
+            # Now the whole default window is covered, so the next run is
+            # incremental again
+            result = self.runner.invoke(main, fetch)
+            assert result.exit_code == 0, result.output
+            assert "Incremental fetch" in result.output
+            since = client.iter_orders.call_args.kwargs["since"]
+            assert since > datetime.now() - timedelta(days=5)
+
+    def test_fetch_rejects_inverted_range(self):
+        """Test fetch command rejects --since after --until."""
+        result = self.runner.invoke(
+            main,
+            [
+                "fetch",
+                "--team",
+                "engineering",
+                "--since",
+                "2024-03-01",
+                "--until",
+                "2024-02-01",
+            ],
+        )
+        assert result.exit_code != 0
+        assert "--since" in result.output
+
     def test_setup_help(self):
         """Test setup command help."""
         result = self.runner.invoke(main, ["setup", "--help"])
@@ -84,3 +250,176 @@ class TestCLI:
         assert result.exit_code == 0
         assert "--team" in result.output
         assert "--year" in result.output
+
+    def test_list_invoices_indexes_team_download_dirs(self):
+        """Test that invoices in a team's own download directory are listed."""
+        import tempfile
+        from datetime import datetime
+        from pathlib import Path
+
+        from invoice_fetcher.file_manager import FileManager
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.yaml"
+            config_file.write_text(
+                f"download_dir: {temp_dir}/invoices\n"
+                "teams:\n"
+                "  engineering: {}\n"
+                "  marketing:\n"
+                f"    download_dir: {temp_dir}/shared/marketing-invoices\n"
+            )
+            FileManager(Path(temp_dir) / "invoices" / "engineering").save_invoice(
+                b"a", datetime(2024, 3, 15), "10.00", "A-1"
+            )
+            FileManager(Path(temp_dir) / "shared" / "marketing-invoices").save_invoice(
+                b"b", datetime(2024, 3, 16), "20.00", "B-1"
+            )
+
+            for _ in range(2):
+                result = self.runner.invoke(
+                    main, ["list-invoices", "--config", str(config_file)]
+                )
+                assert result.exit_code == 0, result.output
+                assert "A-1" in result.output and "B-1" in result.output
+                assert "marketing" in result.output
+
+            result = self.runner.invoke(main, ["reindex", "--config", str(config_file)])
+            assert result.exit_code == 0, result.output
+            assert "Indexed 2 invoices" in result.output
+
+
+class TestStartup:
+    """Test that the CLI starts without loading heavy dependencies."""
+
+    HEAVY_MODULES = (
+        "selenium",
+        "webdriver_manager",
+        "keyring",
+        "requests",
+        "lxml",
+        "cryptography",
+        "httpx",
+        "rich.table",
+        "rich.progress",
+    )
+
+    def test_heavy_modules_not_imported(self):
+        """Test importing the CLI doesn't pull in heavy dependencies."""
+        code = (
+            "import sys, invoice_fetcher.cli; "
+            f"print(','.join(m for m in {self.HEAVY_MODULES!r} if m in sys.modules))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        assert result.stdout.strip() == ""
+
+
+class InlineExecutor:
+    """Process pool stand-in that runs submitted work immediately."""
+
+    max_workers = None
+
+    def __init__(self, max_workers=None, mp_context=None):
+        InlineExecutor.max_workers = max_workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, *args, **kwargs):
+        from concurrent.futures import Future
+
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+class TestFetchAccounts:
+    """Test fetching several accounts in parallel."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.runner = CliRunner()
+
+    def write_config(self, temp_dir: str) -> str:
+        """Write a configuration with three account profiles."""
+        from pathlib import Path
+
+        config_file = Path(temp_dir) / "config.yaml"
+        config_file.write_text(
+            f"download_dir: {temp_dir}/invoices\n"
+            "accounts:\n"
+            "  max_browsers: 2\n"
+            "  profiles:\n"
+            "    - name: acme\n"
+            "      email: buyer@acme.example.com\n"
+            "      teams: [engineering]\n"
+            "    - name: globex\n"
+            "      email: buyer@globex.example.com\n"
+            f"      download_dir: {temp_dir}/globex\n"
+            "    - name: initech\n"
+            "      email: buyer@initech.example.com\n"
+        )
+        return str(config_file)
+
+    @patch("concurrent.futures.ProcessPoolExecutor", InlineExecutor)
+    @patch("invoice_fetcher.cli._run_fetch")
+    def test_accounts_run_isolated(self, mock_run_fetch):
+        """Test each account gets its own login, Chrome profile and folder."""
+        import tempfile
+        from pathlib import Path
+
+        calls = []
+
+        def run_fetch(cfg, teams, **kwargs):
+            calls.append((cfg, teams, kwargs))
+            if cfg.amazon_email.startswith("buyer@initech"):
+                raise RuntimeError("login failed")
+            return {"downloaded": 2, "skipped": 1, "errors": 0, "teams": {}}
+
+        mock_run_fetch.side_effect = run_fetch
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = self.runner.invoke(
+                main, ["fetch-accounts", "--config", self.write_config(temp_dir)]
+            )
+
+            assert result.exit_code == 1
+            assert InlineExecutor.max_workers == 2
+            assert "Account Summary" in result.output
+            assert "login failed" in result.output
+
+            by_email = {cfg.amazon_email: (cfg, teams, kw) for cfg, teams, kw in calls}
+            acme_cfg, acme_teams, acme_kwargs = by_email["buyer@acme.example.com"]
+            globex_cfg, globex_teams, _ = by_email["buyer@globex.example.com"]
+
+            assert acme_teams == ("engineering",)
+            assert globex_teams == ("globex",)
+            assert acme_cfg.download_dir == Path(temp_dir) / "invoices" / "acme"
+            assert globex_cfg.download_dir == Path(temp_dir) / "globex"
+            assert acme_cfg.get("selenium.user_data_dir") != globex_cfg.get(
+                "selenium.user_data_dir"
+            )
+            assert acme_kwargs["use_daemon"] is False
+
+    def test_unknown_account_rejected(self):
+        """Test that selecting a missing profile is reported."""
+        import tempfile
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            result = self.runner.invoke(
+                main,
+                [
+                    "fetch-accounts",
+                    "--config",
+                    self.write_config(temp_dir),
+                    "--account",
+                    "umbrella",
+                ],
+            )
+
+            assert result.exit_code == 1
+            assert "umbrella" in result.output
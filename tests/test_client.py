@@ -0,0 +1,557 @@
+"""Tests for client module."""
+
+import logging
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+import yaml
+
+from invoice_fetcher.client import InvoiceClient
+from invoice_fetcher.config import Config
+from invoice_fetcher.exceptions import AuthenticationError, NetworkError
+from invoice_fetcher.partial import PartialDownload
+from invoice_fetcher.ratelimit import RateLimiter
+
+
+def order_card(order_number: str, date: datetime, total: str, href: str) -> str:
+    """Render an order card as it appears in the order history."""
+    return f"""
+    <div class="order-card">
+      <span class="order-number">Order # {order_number}</span>
+      <span class="order-date">{date.strftime("%B %d, %Y")}</span>
+      <span class="order-total">${total}</span>
+      <a class="invoice-link" href="{href}">Invoice</a>
+    </div>
+    """
+
+
+def make_response(url: str, body: str) -> MagicMock:
+    """Build a fake requests response."""
+    response = MagicMock()
+    response.url = url
+    response.text = f"<html><body>{body}</body></html>"
+    response.status_code = 200
+    return response
+
+
+def make_config(temp_dir: str, **client_options) -> Config:
+    """Create a configuration with the given client options."""
+    config_file = Path(temp_dir) / "config.yaml"
+    with open(config_file, "w") as f:
+        yaml.dump(
+            {
+                "client": client_options,
+                "selectors": {"stats_file": str(Path(temp_dir) / "stats.json")},
+            },
+            f,
+        )
+    return Config(config_file)
+
+
+class TestHttpOrderListing:
+    """Test the HTTP order listing backend."""
+
+    def test_pages_through_order_history(self):
+        """Test orders are collected across pages and filtered by date."""
+        recent = datetime.now() - timedelta(days=5)
+        old = datetime.now() - timedelta(days=200)
+
+        page1_url = "https://business.amazon.com/orders"
+        page2_url = "https://business.amazon.com/orders?startIndex=10"
+        pages = {
+            page1_url: make_response(
+                page1_url,
+                order_card("123-4567890-0000001", recent, "10.00", "/invoice/1")
+                + '<ul class="a-pagination"><li class="a-last">'
+                '<a href="/orders?startIndex=10">Next</a></li></ul>',
+            ),
+            page2_url: make_response(
+                page2_url,
+                order_card("123-4567890-0000002", recent, "20.50", "/invoice/2")
+                + order_card("123-4567890-0000003", old, "30.00", "/invoice/3"),
+            ),
+        }
+
+        session = MagicMock()
+        session.get.side_effect = lambda url, **kwargs: pages[url]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(make_config(temp_dir), session=session)
+            orders = client.get_recent_orders(days=90)
+
+        assert [o["order_number"] for o in orders] == [
+            "123-4567890-0000001",
+            "123-4567890-0000002",
+        ]
+        assert orders[1]["total"] == "20.50"
+        assert orders[1]["invoice_url"] == "https://business.amazon.com/invoice/2"
+        assert orders[0]["date"].date() == recent.date()
+
+    def test_field_selectors_keep_default_priority(self):
+        """Test that a selector hit on one card doesn't change another's values."""
+        recent = datetime.now() - timedelta(days=5)
+        url = "https://business.amazon.com/orders"
+        body = f"""
+        <div class="order-card">
+          <span class="order-number">Order # 123-4567890-0000001</span>
+          <span class="order-date">{recent.strftime("%B %d, %Y")}</span>
+          <span class="price">$12.00</span>
+          <a href="/invoice/1">Invoice</a>
+        </div>
+        <div class="order-card">
+          <span class="order-number">Order # 123-4567890-0000002</span>
+          <span class="order-date">{recent.strftime("%B %d, %Y")}</span>
+          <span class="price">$5.00</span>
+          <span class="order-total">$99.00</span>
+          <a href="/invoice/2">Invoice</a>
+        </div>
+        """
+        session = MagicMock()
+        session.get.return_value = make_response(url, body)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(make_config(temp_dir), session=session)
+            orders = client.get_recent_orders(days=90)
+
+        assert [o["total"] for o in orders] == ["12.00", "99.00"]
+
+    def test_error_status_tries_next_order_url(self):
+        """Test that a 404 on one order history URL moves on to the next."""
+        recent = datetime.now() - timedelta(days=5)
+        missing_url, history_url = InvoiceClient.ORDER_URLS[:2]
+        missing = make_response(missing_url, "Not found")
+        missing.status_code = 404
+        missing.raise_for_status.side_effect = requests.HTTPError("404 Not Found")
+        pages = {
+            missing_url: missing,
+            history_url: make_response(
+                history_url,
+                order_card("123-4567890-0000001", recent, "10.00", "/invoice/1"),
+            ),
+        }
+        session = MagicMock()
+        session.get.side_effect = lambda url, **kwargs: pages[url]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(make_config(temp_dir), session=session)
+            orders = client.get_recent_orders(days=90)
+
+        assert [o["order_number"] for o in orders] == ["123-4567890-0000001"]
+
+    def test_stops_paging_at_cutoff(self):
+        """Test that paging stops once orders older than the range appear."""
+        page_url = "https://business.amazon.com/orders"
+        page = make_response(
+            page_url,
+            order_card("123-4567890-0000001", datetime(2024, 3, 20), "1.00", "/i/1")
+            + order_card("123-4567890-0000002", datetime(2024, 3, 10), "2.00", "/i/2")
+            + order_card("123-4567890-0000003", datetime(2024, 2, 1), "3.00", "/i/3")
+            + '<a rel="next" href="/orders?startIndex=10">Next</a>',
+        )
+
+        session = MagicMock()
+        session.get.side_effect = lambda url, **kwargs: page
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(make_config(temp_dir), session=session)
+            orders = client.get_recent_orders(
+                since=datetime(2024, 3, 1), until=datetime(2024, 3, 15)
+            )
+
+        assert [o["order_number"] for o in orders] == ["123-4567890-0000002"]
+        assert session.get.call_count == 1
+
+    def test_iter_orders_yields_before_next_page(self):
+        """Test that a page's orders are yielded before the next page loads."""
+        recent = datetime.now() - timedelta(days=5)
+
+        page1_url = "https://business.amazon.com/orders"
+        page2_url = "https://business.amazon.com/orders?startIndex=10"
+        pages = {
+            page1_url: make_response(
+                page1_url,
+                order_card("123-4567890-0000001", recent, "10.00", "/invoice/1")
+                + '<a rel="next" href="/orders?startIndex=10">Next</a>',
+            ),
+            page2_url: make_response(
+                page2_url,
+                order_card("123-4567890-0000002", recent, "20.00", "/invoice/2"),
+            ),
+        }
+
+        session = MagicMock()
+        session.get.side_effect = lambda url, **kwargs: pages[url]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(make_config(temp_dir), session=session)
+            orders = client.iter_orders(days=90)
+
+            assert next(orders)["order_number"] == "123-4567890-0000001"
+            assert session.get.call_count == 1
+            assert [o["order_number"] for o in orders] == ["123-4567890-0000002"]
+            assert session.get.call_count == 2
+
+    def test_fallback_skips_orders_already_yielded(self):
+        """Test that a mid-listing fallback to Selenium yields no duplicates."""
+        recent = datetime.now() - timedelta(days=5)
+        page_url = "https://business.amazon.com/orders"
+        page = make_response(
+            page_url,
+            order_card("123-4567890-0000001", recent, "10.00", "/invoice/1")
+            + '<a rel="next" href="/orders?startIndex=10">Next</a>',
+        )
+
+        def get(url, **kwargs):
+            if url == page_url:
+                return page
+            raise requests.ConnectionError("connection reset")
+
+        session = MagicMock()
+        session.get.side_effect = get
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(make_config(temp_dir), session=session)
+            client._get_recent_orders_selenium = MagicMock(
+                return_value=[
+                    {"order_number": "123-4567890-0000001"},
+                    {"order_number": "123-4567890-0000002"},
+                ]
+            )
+            orders = client.get_recent_orders(days=90)
+
+        assert [o["order_number"] for o in orders] == [
+            "123-4567890-0000001",
+            "123-4567890-0000002",
+        ]
+
+    def test_falls_back_to_selenium(self, caplog, capsys):
+        """Test that Selenium is used when no order cards are found over HTTP."""
+        session = MagicMock()
+        session.get.side_effect = lambda url, **kwargs: make_response(url, "")
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(make_config(temp_dir), session=session)
+            client._get_recent_orders_selenium = MagicMock(return_value=["order"])
+
+            with caplog.at_level(logging.WARNING, logger="invoice_fetcher.client"):
+                assert client.get_recent_orders(days=90) == ["order"]
+
+        # The notice is logged for the CLI to show, not printed
+        assert "falling back to Selenium" in caplog.text
+        assert capsys.readouterr().out == ""
+
+    def test_selenium_backend_skips_http(self):
+        """Test that the selenium backend does not request pages over HTTP."""
+        session = MagicMock()
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config = make_config(temp_dir, backend="selenium")
+            client = InvoiceClient(config, session=session)
+            client._get_recent_orders_selenium = MagicMock(return_value=[])
+
+            assert client.get_recent_orders(days=90) == []
+            session.get.assert_not_called()
+
+
+class TestScriptExtraction:
+    """Test single-call order card extraction in the browser."""
+
+    def test_extracts_orders_from_script_result(self):
+        """Test that script results are parsed into order dictionaries."""
+        driver = MagicMock()
+        driver.get_cookies.return_value = []
+        driver.execute_script.return_value = [
+            1,
+            [
+                {
+                    "order_number": [
+                        [".order-number", "Placed by Jane"],
+                        ["[class*='order-number']", "Order # 123-4567890-0000001"],
+                    ],
+                    "date_text": [[".order-date", "March 15, 2024"]],
+                    "total_text": [[".order-total", "$249.99"]],
+                    "invoice_href": [
+                        [".invoice-link", "https://business.amazon.com/invoice/1"]
+                    ],
+                },
+                {
+                    "order_number": [[".order-number", "No order number here"]],
+                    "date_text": [[".order-date", "March 16, 2024"]],
+                    "total_text": [],
+                    "invoice_href": [],
+                },
+            ],
+        ]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(make_config(temp_dir), driver)
+            orders = client._extract_orders_script()
+            card_selectors = driver.execute_script.call_args[0][1]
+            reordered = client.selector_stats.order(
+                "order_card", InvoiceClient.ORDER_CARD_SELECTORS
+            )
+
+        assert driver.execute_script.call_count == 1
+        assert reordered[0] == card_selectors[1]
+        assert orders == [
+            {
+                "order_number": "123-4567890-0000001",
+                "date": datetime(2024, 3, 15),
+                "total": "249.99",
+                "invoice_url": "https://business.amazon.com/invoice/1",
+            }
+        ]
+
+    def test_extracts_routing_fields(self):
+        """Test that requester, group and PO are read when routing needs them."""
+        page_url = "https://business.amazon.com/orders"
+        card = order_card(
+            "123-4567890-0000001", datetime.now(), "10.00", "/invoice/1"
+        ).replace(
+            "</div>",
+            '<span class="purchasing-group">Purchasing group: Engineering</span>'
+            '<span class="po-number">PO # ENG-42</span></div>',
+        )
+        session = MagicMock()
+        session.get.return_value = make_response(page_url, card)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(
+                make_config(temp_dir), session=session, routing_fields=True
+            )
+            orders = client.get_recent_orders(days=30)
+
+        assert orders[0]["purchasing_group"] == "Engineering"
+        assert orders[0]["po_number"] == "ENG-42"
+        assert "requester" not in orders[0]
+
+
+class TestInvoiceDownload:
+    """Test streaming invoice downloads."""
+
+    def test_stream_invoice_yields_chunks(self):
+        """Test that invoices are streamed instead of buffered."""
+        response = MagicMock()
+        response.headers = {"content-type": "application/pdf"}
+        response.iter_content.return_value = iter([b"%PDF", b"", b"-1.4"])
+
+        session = MagicMock()
+        session.get.return_value = response
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(make_config(temp_dir), session=session)
+            chunks = list(client.stream_invoice("https://business.amazon.com/i/1"))
+
+        assert chunks == [b"%PDF", b"-1.4"]
+        assert session.get.call_args.kwargs["stream"] is True
+        response.close.assert_called_once()
+
+    @staticmethod
+    def pdf_response(url: str, status_code: int = 200) -> MagicMock:
+        """Build a fake streamed PDF response."""
+        response = MagicMock()
+        response.url = url
+        response.status_code = status_code
+        response.headers = {"content-type": "application/pdf"}
+        response.iter_content.return_value = iter([b"%PDF"])
+        return response
+
+    @classmethod
+    def error_response(cls, url: str, status_code: int) -> MagicMock:
+        """Build a fake response failing with an HTTP error status."""
+        response = cls.pdf_response(url, status_code)
+        response.raise_for_status.side_effect = requests.HTTPError(str(status_code))
+        return response
+
+    def test_cookies_cached_between_downloads(self):
+        """Test that browser cookies are not re-read for every download."""
+        driver = MagicMock()
+        driver.get_cookies.return_value = [{"name": "session-id", "value": "1"}]
+        driver.current_url = "https://business.amazon.com/orders"
+
+        session = MagicMock()
+        session.get.side_effect = lambda url, **kwargs: self.pdf_response(url)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(make_config(temp_dir), driver, session=session)
+            for i in range(5):
+                list(client.stream_invoice(f"https://business.amazon.com/i/{i}"))
+
+        driver.get_cookies.assert_called_once()
+        headers = session.get.call_args.kwargs["headers"]
+        assert headers["Referer"] == "https://business.amazon.com/orders"
+
+    def test_cookies_refreshed_after_ttl(self):
+        """Test that stale cookies are synced again."""
+        driver = MagicMock()
+        driver.get_cookies.return_value = []
+        driver.current_url = "https://business.amazon.com/orders"
+
+        session = MagicMock()
+        session.get.side_effect = lambda url, **kwargs: self.pdf_response(url)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(
+                make_config(temp_dir, cookie_ttl=0), driver, session=session
+            )
+            list(client.stream_invoice("https://business.amazon.com/i/1"))
+
+        assert driver.get_cookies.call_count == 2
+
+    def test_auth_failure_resyncs_and_retries(self):
+        """Test that a rejected download is retried once with fresh cookies."""
+        driver = MagicMock()
+        driver.get_cookies.return_value = []
+        driver.current_url = "https://business.amazon.com/orders"
+
+        responses = [
+            self.pdf_response("https://business.amazon.com/i/1", status_code=403),
+            self.pdf_response("https://business.amazon.com/i/1"),
+        ]
+        session = MagicMock()
+        session.get.side_effect = responses
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(make_config(temp_dir), driver, session=session)
+            chunks = list(client.stream_invoice("https://business.amazon.com/i/1"))
+
+        assert chunks == [b"%PDF"]
+        assert session.get.call_count == 2
+        assert driver.get_cookies.call_count == 2
+        responses[0].close.assert_called_once()
+
+    def test_rejected_saved_session_needs_login(self):
+        """Test that a rejected saved session isn't reused to seed a browser."""
+        driver_factory = MagicMock()
+        response = self.pdf_response("https://www.amazon.com/ap/signin?return=i/1")
+        session = MagicMock()
+        session.get.return_value = response
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(
+                make_config(temp_dir), session=session, driver_factory=driver_factory
+            )
+            with pytest.raises(AuthenticationError):
+                client.stream_invoice("https://business.amazon.com/i/1")
+
+        driver_factory.assert_not_called()
+        session.get.assert_called_once()
+        response.close.assert_called_once()
+
+    def test_throttled_download_retried(self):
+        """Test that a throttled download slows the client down and retries."""
+        throttled = self.pdf_response("https://business.amazon.com/i/1", 503)
+        throttled.headers = {"Retry-After": "0"}
+        responses = [throttled, self.pdf_response("https://business.amazon.com/i/1")]
+
+        session = MagicMock()
+        session.get.side_effect = responses
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(make_config(temp_dir), session=session)
+            rate = client.rate_limiter.rate
+            chunks = list(client.stream_invoice("https://business.amazon.com/i/1"))
+
+        assert chunks == [b"%PDF"]
+        assert session.get.call_count == 2
+        assert client.rate_limiter.rate < rate
+        throttled.close.assert_called_once()
+
+    def test_download_resumes_after_dropped_connection(self):
+        """Test that an interrupted download continues with a Range request."""
+
+        def dropped_chunks(chunk_size):
+            yield b"%PDF"
+            raise requests.ConnectionError("connection reset")
+
+        first = self.pdf_response("https://business.amazon.com/i/1")
+        first.headers = {
+            "content-type": "application/pdf",
+            "Content-Length": "8",
+            "ETag": '"v1"',
+        }
+        first.iter_content.side_effect = dropped_chunks
+
+        second = self.pdf_response("https://business.amazon.com/i/1", 206)
+        second.headers = {
+            "content-type": "application/pdf",
+            "Content-Range": "bytes 4-7/8",
+        }
+        second.iter_content.return_value = iter([b"-1.4"])
+
+        session = MagicMock()
+        session.get.side_effect = [first, second]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(make_config(temp_dir), session=session)
+            partial = PartialDownload(
+                Path(temp_dir) / "invoice.pdf", "https://business.amazon.com/i/1"
+            )
+            client.download_to("https://business.amazon.com/i/1", partial)
+
+            assert partial.path.read_bytes() == b"%PDF-1.4"
+
+        headers = session.get.call_args.kwargs["headers"]
+        assert headers["Range"] == "bytes=4-"
+        assert headers["If-Range"] == '"v1"'
+
+    def test_conditional_download_not_modified(self):
+        """Test that a 304 answer to the stored validators skips the download."""
+        session = MagicMock()
+        session.get.return_value = self.pdf_response(
+            "https://business.amazon.com/i/1", 304
+        )
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(make_config(temp_dir), session=session)
+            partial = PartialDownload(
+                Path(temp_dir) / "invoice.pdf", "https://business.amazon.com/i/1"
+            )
+            modified = client.download_to(
+                "https://business.amazon.com/i/1",
+                partial,
+                {"etag": '"v1"', "last_modified": "Fri, 15 Mar 2024 10:00:00 GMT"},
+            )
+
+            assert modified is False
+            assert not partial.path.exists()
+
+        headers = session.get.call_args.kwargs["headers"]
+        assert headers["If-None-Match"] == '"v1"'
+        assert headers["If-Modified-Since"] == "Fri, 15 Mar 2024 10:00:00 GMT"
+        session.get.return_value.close.assert_called_once()
+
+    def test_rejected_download_not_resumed(self):
+        """Test that HTTP errors fail at once instead of re-entering the resume loop."""
+        session = MagicMock()
+        session.get.side_effect = lambda url, **kwargs: self.error_response(url, 404)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(make_config(temp_dir), session=session)
+            partial = PartialDownload(
+                Path(temp_dir) / "invoice.pdf", "https://business.amazon.com/i/1"
+            )
+            with pytest.raises(NetworkError):
+                client.download_to("https://business.amazon.com/i/1", partial)
+
+        assert session.get.call_count == 1
+
+    def test_throttled_download_retried_by_limiter_only(self):
+        """Test that an invoice throttled past its retries isn't retried again."""
+        session = MagicMock()
+        session.get.side_effect = lambda url, **kwargs: self.error_response(url, 429)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            client = InvoiceClient(make_config(temp_dir), session=session)
+            client.rate_limiter = RateLimiter(rate=None, retries=2, backoff=0)
+            partial = PartialDownload(
+                Path(temp_dir) / "invoice.pdf", "https://business.amazon.com/i/1"
+            )
+            with pytest.raises(NetworkError):
+                client.download_to("https://business.amazon.com/i/1", partial)
+
+        assert session.get.call_count == 3
@@ -0,0 +1,244 @@
+"""Tests for downloader module."""
+
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from invoice_fetcher.downloader import (
+    InvoiceDownloader,
+    DOWNLOADED,
+    SKIPPED,
+    UNCHANGED,
+    ERROR,
+)
+from invoice_fetcher.exceptions import NetworkError
+from invoice_fetcher.file_manager import FileManager
+from invoice_fetcher.manifest import InvoiceManifest
+
+
+def make_order(suffix: str, **overrides) -> dict:
+    """Build an order dictionary for tests."""
+    order = {
+        "order_number": f"123-4567890-{suffix}",
+        "date": datetime(2024, 3, 15),
+        "total": "249.99",
+        "invoice_url": f"https://business.amazon.com/invoice/{suffix}",
+    }
+    order.update(overrides)
+    return order
+
+
+def write_part(content: bytes):
+    """Build a fake ``download_to`` that writes content to the part file."""
+
+    def download_to(url, partial, validators=None):
+        partial.begin(200, {"Content-Length": str(len(content))})
+        partial.write(content)
+        partial.finish()
+        return True
+
+    return download_to
+
+
+class TestInvoiceDownloader:
+    """Test concurrent invoice downloading."""
+
+    def test_downloads_and_counts(self):
+        """Test that results are counted per status."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            fm = FileManager(Path(temp_dir))
+            fm.save_invoice(
+                b"existing", datetime(2024, 3, 15), "249.99", "123-4567890-0000001"
+            )
+
+            client = MagicMock()
+            client.download_to.side_effect = write_part(b"pdf content")
+
+            orders = [
+                make_order("0000001"),
+                make_order("0000002"),
+                make_order("0000003", invoice_url=None),
+            ]
+
+            results = []
+            downloader = InvoiceDownloader(client, fm, concurrency=4)
+            counts = downloader.run(
+                orders, on_result=lambda o, s, m: results.append((o, s))
+            )
+
+            assert counts == {DOWNLOADED: 1, SKIPPED: 1, UNCHANGED: 0, ERROR: 1}
+            assert len(results) == 3
+            assert client.download_to.call_count == 1
+            assert fm.file_exists(
+                datetime(2024, 3, 15), "249.99", "123-4567890-0000002"
+            )
+
+    def test_network_error_counted(self):
+        """Test that download failures are reported as errors."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            fm = FileManager(Path(temp_dir))
+            client = MagicMock()
+            client.download_to.side_effect = NetworkError("boom")
+
+            downloader = InvoiceDownloader(client, fm)
+            status, message = downloader.process_order(make_order("0000001"))
+
+            assert status == ERROR
+            assert "boom" in message
+
+    def test_dry_run_does_not_download(self):
+        """Test dry run mode reports without downloading."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            fm = FileManager(Path(temp_dir))
+            client = MagicMock()
+
+            downloader = InvoiceDownloader(client, fm, dry_run=True)
+            counts = downloader.run([make_order("0000001")])
+
+            assert counts[DOWNLOADED] == 1
+            client.download_to.assert_not_called()
+
+    def test_downloads_run_in_parallel(self):
+        """Test that downloads overlap when concurrency allows it."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            fm = FileManager(Path(temp_dir))
+            active = 0
+            peak = 0
+            lock = threading.Lock()
+
+            def download(url, partial, validators):
+                nonlocal active, peak
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.05)
+                with lock:
+                    active -= 1
+                return write_part(b"pdf")(url, partial)
+
+            client = MagicMock()
+            client.download_to.side_effect = download
+
+            orders = [make_order(f"000000{i}") for i in range(4)]
+            downloader = InvoiceDownloader(client, fm, concurrency=4)
+            counts = downloader.run(orders)
+
+            assert counts[DOWNLOADED] == 4
+            assert peak > 1
+
+    def test_downloads_start_while_listing(self):
+        """Test that orders are downloaded before the order source is done."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            fm = FileManager(Path(temp_dir))
+            first_downloaded = threading.Event()
+
+            def download(url, partial, validators):
+                first_downloaded.set()
+                return write_part(b"pdf")(url, partial)
+
+            def orders():
+                yield make_order("0000001")
+                # Listing the next page only finishes once a download ran
+                assert first_downloaded.wait(timeout=5)
+                yield make_order("0000002")
+
+            client = MagicMock()
+            client.download_to.side_effect = download
+
+            downloader = InvoiceDownloader(client, fm, concurrency=2)
+            counts = downloader.run(orders())
+
+            assert counts[DOWNLOADED] == 2
+
+    def test_failed_download_leaves_part_for_resume(self):
+        """Test that an interrupted download is resumed by the next attempt."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            fm = FileManager(Path(temp_dir))
+            order = make_order("0000001")
+
+            def interrupted(url, partial, validators):
+                partial.begin(200, {"Content-Length": "8", "ETag": '"v1"'})
+                partial.write(b"%PDF")
+                partial.suspend()
+                raise NetworkError("connection reset")
+
+            def resumed(url, partial, validators):
+                assert partial.request_headers() == {
+                    "Range": "bytes=4-",
+                    "If-Range": '"v1"',
+                }
+                partial.begin(206, {"Content-Range": "bytes 4-7/8"})
+                partial.write(b"-1.4")
+                partial.finish()
+                return True
+
+            client = MagicMock()
+            client.download_to.side_effect = interrupted
+            downloader = InvoiceDownloader(client, fm)
+            assert downloader.process_order(order)[0] == ERROR
+
+            client.download_to.side_effect = resumed
+            assert downloader.process_order(order)[0] == DOWNLOADED
+
+            file_path = fm.get_file_path(
+                order["date"], order["total"], order["order_number"]
+            )
+            assert file_path.read_bytes() == b"%PDF-1.4"
+            assert [p.name for p in file_path.parent.iterdir()] == [file_path.name]
+
+    def test_refresh_counts_not_modified_as_unchanged(self):
+        """Test that refreshing sends the stored validators and keeps the file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            manifest = InvoiceManifest(root)
+            fm = FileManager(root / "engineering", manifest=manifest)
+            order = make_order("0000001")
+
+            client = MagicMock()
+            client.download_to.side_effect = lambda url, partial, validators: (
+                write_part(b"%PDF-v1")(url, partial) if validators is None else False
+            )
+            downloader = InvoiceDownloader(client, fm, refresh=True)
+            assert downloader.process_order(order)[0] == DOWNLOADED
+            assert client.download_to.call_args.args[2] is None
+
+            status, message = downloader.process_order(order)
+
+            assert status == UNCHANGED
+            assert client.download_to.call_args.args[2] == {
+                "etag": None,
+                "last_modified": None,
+            }
+            file_path = fm.get_file_path(
+                order["date"], order["total"], order["order_number"]
+            )
+            assert file_path.read_bytes() == b"%PDF-v1"
+            manifest.close()
+
+    def test_refresh_replaces_changed_invoice(self):
+        """Test that a changed invoice is rewritten when refreshing."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            fm = FileManager(Path(temp_dir))
+            order = make_order("0000001")
+            fm.save_invoice(
+                b"%PDF-v1", order["date"], order["total"], order["order_number"]
+            )
+
+            client = MagicMock()
+            client.download_to.side_effect = write_part(b"%PDF-v2")
+
+            skipped = InvoiceDownloader(client, fm).process_order(order)
+            status, message = InvoiceDownloader(client, fm, refresh=True).process_order(
+                order
+            )
+
+            assert skipped[0] == SKIPPED
+            assert status == DOWNLOADED
+            assert message.startswith("Refreshed")
+            file_path = fm.get_file_path(
+                order["date"], order["total"], order["order_number"]
+            )
+            assert file_path.read_bytes() == b"%PDF-v2"
@@ -0,0 +1,132 @@
+"""Tests for driver cache module."""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from invoice_fetcher.driver_cache import DriverResolver, MANAGER_SELENIUM
+from invoice_fetcher.exceptions import WebDriverError
+
+
+def make_driver(temp_dir: str) -> str:
+    """Create a placeholder chromedriver executable."""
+    driver_path = Path(temp_dir) / "chromedriver"
+    driver_path.write_text("")
+    return str(driver_path)
+
+
+class TestDriverResolver:
+    """Test cached chromedriver resolution."""
+
+    def test_explicit_driver_path(self):
+        """Test that a configured driver path is used without resolution."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            driver_path = make_driver(temp_dir)
+            resolver = DriverResolver(
+                Path(temp_dir) / "cache.json", driver_path=driver_path
+            )
+
+            with patch.object(resolver, "_install") as install:
+                assert resolver.resolve() == driver_path
+                install.assert_not_called()
+
+    def test_missing_explicit_driver_path(self):
+        """Test that a missing configured driver is reported."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            resolver = DriverResolver(
+                Path(temp_dir) / "cache.json",
+                driver_path=str(Path(temp_dir) / "missing"),
+            )
+
+            with pytest.raises(WebDriverError):
+                resolver.resolve()
+
+    def test_selenium_manager(self):
+        """Test that Selenium Manager resolution returns no path."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            resolver = DriverResolver(
+                Path(temp_dir) / "cache.json", manager=MANAGER_SELENIUM
+            )
+            assert resolver.resolve() is None
+
+    @patch("invoice_fetcher.driver_cache.binary_version")
+    def test_resolves_once_then_uses_cache(self, mock_version):
+        """Test that the driver is installed once and then reused."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            driver_path = make_driver(temp_dir)
+            cache_path = Path(temp_dir) / "cache.json"
+            mock_version.return_value = "120.0.6099.109"
+
+            resolver = DriverResolver(cache_path, chrome_binary=driver_path)
+            with patch.object(
+                resolver, "_install", return_value=driver_path
+            ) as install:
+                assert resolver.resolve() == driver_path
+                assert resolver.resolve() == driver_path
+                assert install.call_count == 1
+
+            cached = json.loads(cache_path.read_text())
+            assert cached["driver_path"] == driver_path
+            assert cached["chrome_version"] == "120.0.6099.109"
+
+    @patch("invoice_fetcher.driver_cache.binary_version")
+    def test_cache_written_through_per_process_temp_file(self, mock_version):
+        """Test that parallel workers don't share a temporary cache file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            driver_path = make_driver(temp_dir)
+            cache_path = Path(temp_dir) / "cache.json"
+            mock_version.return_value = "120.0.6099.109"
+
+            resolver = DriverResolver(cache_path, chrome_binary=driver_path)
+            with (
+                patch.object(resolver, "_install", return_value=driver_path),
+                patch("invoice_fetcher.driver_cache.os.getpid", return_value=4242),
+                patch(
+                    "invoice_fetcher.driver_cache.os.replace", wraps=os.replace
+                ) as replace,
+            ):
+                resolver.resolve()
+
+            assert Path(replace.call_args.args[0]).name == "cache.json.4242.tmp"
+            assert sorted(p.name for p in Path(temp_dir).iterdir()) == [
+                "cache.json",
+                "chromedriver",
+            ]
+
+    @patch("invoice_fetcher.driver_cache.binary_version")
+    def test_chrome_upgrade_invalidates_cache(self, mock_version):
+        """Test that a Chrome major version change re-resolves the driver."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            driver_path = make_driver(temp_dir)
+            cache_path = Path(temp_dir) / "cache.json"
+            cache_path.write_text(
+                json.dumps(
+                    {
+                        "driver_path": driver_path,
+                        "driver_version": "119.0.6045.105",
+                        "chrome_version": "119.0.6045.105",
+                    }
+                )
+            )
+            mock_version.return_value = "120.0.6099.109"
+
+            resolver = DriverResolver(cache_path, chrome_binary=driver_path)
+            with patch.object(
+                resolver, "_install", return_value=driver_path
+            ) as install:
+                resolver.resolve()
+                install.assert_called_once()
+
+    def test_install_failure_falls_back_to_selenium_manager(self):
+        """Test that offline resolution failures defer to Selenium Manager."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            resolver = DriverResolver(
+                Path(temp_dir) / "cache.json",
+                chrome_binary=str(Path(temp_dir) / "no-chrome"),
+            )
+            with patch.object(resolver, "_install", side_effect=OSError("offline")):
+                assert resolver.resolve() is None
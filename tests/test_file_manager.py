@@ -1,9 +1,13 @@
 """Tests for file manager module."""
 
+import io
 import tempfile
 from datetime import datetime
 from pathlib import Path
 
+import pytest
+
+from invoice_fetcher.exceptions import NetworkError
 from invoice_fetcher.file_manager import FileManager
 
 
@@ -47,7 +51,8 @@ class TestFileManager:
                 / "2024-03-15--249.99--123-4567890-1234567.pdf"
             )
             assert file_path == expected_path
-            assert file_path.parent.exists()  # Directory should be created
+            # Directories are only created when an invoice is saved
+            assert not file_path.parent.exists()
 
     def test_file_exists(self):
         """Test file existence check."""
@@ -59,13 +64,27 @@ class TestFileManager:
             # File doesn't exist initially
             assert not fm.file_exists(date, "249.99", "123-4567890-1234567")
 
-            # Create the file
-            file_path = fm.get_file_path(date, "249.99", "123-4567890-1234567")
-            file_path.touch()
+            # Checking must not create directories
+            assert not (Path(temp_dir) / "2024").exists()
+
+            # Save the file
+            fm.save_invoice(b"fake pdf content", date, "249.99", "123-4567890-1234567")
 
             # Now it should exist
             assert fm.file_exists(date, "249.99", "123-4567890-1234567")
 
+    def test_file_exists_indexes_existing_files(self):
+        """Test that invoices already on disk are found by a new manager."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            date = datetime(2024, 3, 15)
+            FileManager(Path(temp_dir)).save_invoice(
+                b"fake pdf content", date, "249.99", "123-4567890-1234567"
+            )
+
+            fm = FileManager(Path(temp_dir))
+            assert fm.file_exists(date, "249.99", "123-4567890-1234567")
+            assert not fm.file_exists(date, "249.99", "123-4567890-7654321")
+
     def test_save_invoice(self):
         """Test saving invoice content."""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -83,6 +102,42 @@ class TestFileManager:
 
             assert saved_content == content
 
+    def test_save_invoice_streams_chunks(self):
+        """Test saving invoice content from chunks and file-like objects."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            fm = FileManager(Path(temp_dir))
+            date = datetime(2024, 3, 15)
+
+            chunked = fm.save_invoice(iter([b"%PDF", b"-1.4"]), date, "1.00", "A-1")
+            assert chunked.read_bytes() == b"%PDF-1.4"
+
+            fm.CHUNK_SIZE = 3
+            from_file = fm.save_invoice(io.BytesIO(b"%PDF-1.7"), date, "2.00", "A-2")
+            assert from_file.read_bytes() == b"%PDF-1.7"
+
+            # No temporary files are left next to the invoices
+            assert sorted(p.name for p in chunked.parent.iterdir()) == [
+                chunked.name,
+                from_file.name,
+            ]
+
+    def test_save_invoice_interrupted(self):
+        """Test that a failed download leaves no partial file behind."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            fm = FileManager(Path(temp_dir))
+            date = datetime(2024, 3, 15)
+
+            def broken_stream():
+                yield b"%PDF"
+                raise NetworkError("connection reset")
+
+            with pytest.raises(NetworkError, match="connection reset"):
+                fm.save_invoice(broken_stream(), date, "249.99", "123-4567890-1234567")
+
+            assert not fm.file_exists(date, "249.99", "123-4567890-1234567")
+            month_dir = Path(temp_dir) / "2024" / "03"
+            assert list(month_dir.iterdir()) == []
+
     def test_parse_filename(self):
         """Test filename parsing."""
         with tempfile.TemporaryDirectory() as temp_dir:
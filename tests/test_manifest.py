@@ -0,0 +1,184 @@
+"""Tests for invoice manifest module."""
+
+import hashlib
+import sqlite3
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from invoice_fetcher.file_manager import FileManager
+from invoice_fetcher.manifest import InvoiceManifest
+
+
+class TestInvoiceManifest:
+    """Test the SQLite invoice manifest."""
+
+    def test_save_invoice_records_row(self):
+        """Test that saving an invoice records it in the manifest."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            manifest = InvoiceManifest(root)
+            fm = FileManager(root / "engineering", manifest=manifest)
+
+            content = b"%PDF-1.4 test"
+            file_path = fm.save_invoice(
+                content, datetime(2024, 3, 15), "249.99", "123-4567890-1234567"
+            )
+
+            invoices = manifest.query()
+            assert invoices == [
+                (
+                    file_path,
+                    {
+                        "date": datetime(2024, 3, 15),
+                        "amount": "249.99",
+                        "invoice_number": "123-4567890-1234567",
+                        "team": "engineering",
+                    },
+                )
+            ]
+
+            size, sha256 = (
+                manifest._connect()
+                .execute("SELECT size, sha256 FROM invoices")
+                .fetchone()
+            )
+            assert size == len(content)
+            assert sha256 == hashlib.sha256(content).hexdigest()
+            manifest.close()
+
+    def test_query_filters(self):
+        """Test filtering the manifest by team and year."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            manifest = InvoiceManifest(root)
+            engineering = FileManager(root / "engineering", manifest=manifest)
+            marketing = FileManager(root / "marketing", manifest=manifest)
+
+            engineering.save_invoice(b"a", datetime(2023, 12, 31), "10.00", "A-1")
+            engineering.save_invoice(b"b", datetime(2024, 1, 1), "20.00", "A-2")
+            marketing.save_invoice(b"c", datetime(2024, 6, 1), "30.00", "B-1")
+
+            numbers = [info["invoice_number"] for _, info in manifest.query()]
+            assert numbers == ["A-1", "A-2", "B-1"]
+
+            by_team = manifest.query(team="engineering", year=2024)
+            assert [info["invoice_number"] for _, info in by_team] == ["A-2"]
+
+            by_year = manifest.query(year=2023)
+            assert [info["invoice_number"] for _, info in by_year] == ["A-1"]
+            manifest.close()
+
+    def test_reindex_from_disk(self):
+        """Test rebuilding the manifest from existing files."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            fm = FileManager(root / "engineering")
+            fm.save_invoice(b"a", datetime(2024, 1, 15), "10.00", "A-1")
+            fm.save_invoice(b"b", datetime(2024, 2, 15), "20.00", "A-2")
+            (root / "notes.txt").write_text("not a team")
+
+            manifest = InvoiceManifest(root)
+            assert not manifest.is_indexed()
+
+            assert manifest.reindex() == 2
+            assert manifest.is_indexed()
+
+            invoices = manifest.query(team="engineering")
+            assert [info["invoice_number"] for _, info in invoices] == ["A-1", "A-2"]
+            assert all(path.exists() for path, _ in invoices)
+            manifest.close()
+
+    def test_reindex_team_dirs_outside_root(self):
+        """Test that configured team directories are indexed under their team."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir) / "invoices"
+            elsewhere = Path(temp_dir) / "shared" / "marketing-invoices"
+            renamed = root / "eng-archive"
+            FileManager(root / "sales").save_invoice(
+                b"a", datetime(2024, 1, 15), "10.00", "A-1"
+            )
+            FileManager(elsewhere).save_invoice(
+                b"b", datetime(2024, 2, 15), "20.00", "B-1"
+            )
+            FileManager(renamed).save_invoice(
+                b"c", datetime(2024, 3, 15), "30.00", "C-1"
+            )
+
+            manifest = InvoiceManifest(root)
+            count = manifest.reindex(
+                {"marketing": elsewhere, "engineering": renamed, "legal": root / "x"}
+            )
+
+            assert count == 3
+            teams = {
+                info["invoice_number"]: info["team"] for _, info in manifest.query()
+            }
+            assert teams == {"A-1": "sales", "B-1": "marketing", "C-1": "engineering"}
+            assert all(path.exists() for path, _ in manifest.query())
+            manifest.close()
+
+    def test_reindex_drops_missing_files(self):
+        """Test that reindexing removes rows for deleted files."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            manifest = InvoiceManifest(root)
+            fm = FileManager(root / "engineering", manifest=manifest)
+            file_path = fm.save_invoice(b"a", datetime(2024, 1, 15), "10.00", "A-1")
+
+            file_path.unlink()
+            assert manifest.reindex() == 0
+            assert manifest.query() == []
+            manifest.close()
+
+    def test_validators_recorded_and_kept_on_reindex(self):
+        """Test that HTTP validators of a download survive a reindex."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            manifest = InvoiceManifest(root)
+            fm = FileManager(root / "engineering", manifest=manifest)
+            partial = fm.partial_download(
+                datetime(2024, 1, 15), "10.00", "A-1", "https://example.com/i/1"
+            )
+            partial.begin(200, {"Content-Length": "4", "ETag": '"v1"'})
+            partial.write(b"%PDF")
+            partial.finish()
+            file_path = fm.finalize_invoice(
+                partial, datetime(2024, 1, 15), "10.00", "A-1"
+            )
+
+            expected = {"etag": '"v1"', "last_modified": None}
+            assert manifest.validators(file_path) == expected
+            assert fm.validators(datetime(2024, 1, 15), "10.00", "A-1") == expected
+            assert manifest._connect().execute(
+                "SELECT size, sha256 FROM invoices"
+            ).fetchone() == (4, hashlib.sha256(b"%PDF").hexdigest())
+
+            manifest.reindex()
+            assert manifest.validators(file_path) == expected
+            assert manifest.validators(root / "missing.pdf") == {}
+            manifest.close()
+
+    def test_older_manifest_migrated(self):
+        """Test that a manifest without validator columns gains them."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = Path(temp_dir)
+            conn = sqlite3.connect(str(root / InvoiceManifest.FILENAME))
+            conn.execute(
+                "CREATE TABLE invoices (path TEXT PRIMARY KEY, team TEXT NOT NULL, "
+                "invoice_number TEXT NOT NULL, date TEXT NOT NULL, "
+                "amount TEXT NOT NULL, size INTEGER NOT NULL, sha256 TEXT, "
+                "downloaded_at TEXT)"
+            )
+            conn.commit()
+            conn.close()
+
+            manifest = InvoiceManifest(root)
+            fm = FileManager(root / "engineering", manifest=manifest)
+            file_path = fm.save_invoice(b"a", datetime(2024, 1, 15), "10.00", "A-1")
+
+            assert manifest.validators(file_path) == {
+                "etag": None,
+                "last_modified": None,
+            }
+            manifest.close()
@@ -0,0 +1,146 @@
+"""Tests for partial module."""
+
+import hashlib
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from invoice_fetcher.exceptions import NetworkError
+from invoice_fetcher.partial import PartialDownload
+
+URL = "https://business.amazon.com/invoice/1"
+
+
+def interrupted_download(temp_dir: str, headers: dict) -> PartialDownload:
+    """Leave a part file holding the first four bytes of an eight-byte PDF."""
+    partial = PartialDownload(Path(temp_dir) / "invoice.pdf", URL)
+    partial.begin(200, {"Content-Length": "8", **headers})
+    partial.write(b"%PDF")
+    partial.suspend()
+    return partial
+
+
+class TestPartialDownload:
+    """Test resumable part files."""
+
+    def test_fresh_download_has_no_range(self):
+        """Test that a new download requests the whole invoice."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            partial = PartialDownload(Path(temp_dir) / "invoice.pdf", URL)
+
+            assert partial.request_headers() == {}
+            assert partial.path.name == ".invoice.pdf.part"
+
+    def test_resume_headers_from_sidecar(self):
+        """Test that a later attempt asks for the missing bytes."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            interrupted_download(temp_dir, {"ETag": '"v1"'})
+            partial = PartialDownload(Path(temp_dir) / "invoice.pdf", URL)
+
+            assert partial.received == 4
+            assert partial.request_headers() == {
+                "Range": "bytes=4-",
+                "If-Range": '"v1"',
+            }
+
+    def test_weak_etag_falls_back_to_last_modified(self):
+        """Test that weak ETags are not used to validate a range."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            last_modified = "Fri, 15 Mar 2024 10:00:00 GMT"
+            interrupted_download(
+                temp_dir, {"ETag": 'W/"v1"', "Last-Modified": last_modified}
+            )
+            partial = PartialDownload(Path(temp_dir) / "invoice.pdf", URL)
+
+            assert partial.request_headers()["If-Range"] == last_modified
+
+    def test_part_without_validator_restarts(self):
+        """Test that a part file that can't be validated is not resumed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            interrupted_download(temp_dir, {})
+            partial = PartialDownload(Path(temp_dir) / "invoice.pdf", URL)
+
+            assert partial.request_headers() == {}
+
+    def test_part_for_other_url_restarts(self):
+        """Test that a part file of another invoice URL is not resumed."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            interrupted_download(temp_dir, {"ETag": '"v1"'})
+            partial = PartialDownload(Path(temp_dir) / "invoice.pdf", URL + "?v=2")
+
+            assert partial.request_headers() == {}
+
+    def test_partial_content_is_appended(self):
+        """Test that a 206 response continues the part file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            interrupted_download(temp_dir, {"ETag": '"v1"'})
+            partial = PartialDownload(Path(temp_dir) / "invoice.pdf", URL)
+            partial.begin(206, {"Content-Range": "bytes 4-7/8"})
+            partial.write(b"-1.4")
+            partial.finish()
+
+            assert partial.path.read_bytes() == b"%PDF-1.4"
+            assert partial.etag == '"v1"'
+            assert partial.sha256 == hashlib.sha256(b"%PDF-1.4").hexdigest()
+
+    def test_full_response_replaces_part(self):
+        """Test that a 200 response (the invoice changed) starts over."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            interrupted_download(temp_dir, {"ETag": '"v1"'})
+            partial = PartialDownload(Path(temp_dir) / "invoice.pdf", URL)
+            partial.begin(200, {"Content-Length": "6", "ETag": '"v2"'})
+            partial.write(b"%PDF-2")
+            partial.finish()
+
+            assert partial.path.read_bytes() == b"%PDF-2"
+            assert partial.etag == '"v2"'
+            assert partial.sha256 == hashlib.sha256(b"%PDF-2").hexdigest()
+
+    def test_resume_in_same_attempt_keeps_digest(self):
+        """Test that resuming without a new process doesn't reread the part."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            partial = interrupted_download(temp_dir, {"ETag": '"v1"'})
+            with patch.object(PartialDownload, "_hash_part") as hash_part:
+                partial.begin(206, {"Content-Range": "bytes 4-7/8"})
+                partial.write(b"-1.4")
+                partial.finish()
+
+            hash_part.assert_not_called()
+
+            assert partial.sha256 == hashlib.sha256(b"%PDF-1.4").hexdigest()
+
+    def test_wrong_offset_discards_part(self):
+        """Test that a range starting elsewhere throws the part file away."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            interrupted_download(temp_dir, {"ETag": '"v1"'})
+            partial = PartialDownload(Path(temp_dir) / "invoice.pdf", URL)
+
+            with pytest.raises(NetworkError, match="wrong offset"):
+                partial.begin(206, {"Content-Range": "bytes 2-7/8"})
+
+            assert not partial.path.exists()
+            assert partial.request_headers() == {}
+
+    def test_incomplete_download_is_kept(self):
+        """Test that a short body fails but stays available for resuming."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            partial = PartialDownload(Path(temp_dir) / "invoice.pdf", URL)
+            partial.begin(200, {"Content-Length": "8", "ETag": '"v1"'})
+            partial.write(b"%PDF")
+
+            with pytest.raises(NetworkError, match="received 4 of 8"):
+                partial.finish()
+
+            assert partial.path.exists()
+            assert partial.state_path.exists()
+
+    def test_discard_removes_files(self):
+        """Test that discarding removes the part file and sidecar."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            partial = interrupted_download(temp_dir, {"ETag": '"v1"'})
+            partial.discard()
+
+            assert not partial.path.exists()
+            assert not partial.state_path.exists()
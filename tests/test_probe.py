@@ -0,0 +1,105 @@
+"""Tests for selector probe module."""
+
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock
+
+from invoice_fetcher.probe import SelectorProbe, SelectorStats
+
+
+class TestSelectorProbe:
+    """Test selector probing."""
+
+    def test_reports_matched_selector(self):
+        """Test that the matching selector and element are returned."""
+        driver = MagicMock()
+        element = MagicMock()
+        driver.execute_script.return_value = [1, element]
+
+        probe = SelectorProbe(driver, implicit_wait=30)
+        result = probe.find(["#missing", ".order-card"], group="order_card")
+
+        assert result.selector == ".order-card"
+        assert result.match is element
+        assert driver.execute_script.call_count == 1
+        assert probe.summary()["order_card"]["calls"] == 1
+
+    def test_miss_returns_none_without_waiting(self):
+        """Test that a miss with no timeout checks only once."""
+        driver = MagicMock()
+        driver.execute_script.return_value = None
+
+        probe = SelectorProbe(driver, implicit_wait=30)
+
+        assert probe.find(["#missing"]) is None
+        assert driver.execute_script.call_count == 1
+
+    def test_polls_until_timeout(self):
+        """Test that the probe polls until an element appears."""
+        driver = MagicMock()
+        element = MagicMock()
+        driver.execute_script.side_effect = [None, None, [0, element]]
+
+        probe = SelectorProbe(driver)
+        probe.POLL_INTERVAL = 0
+        result = probe.find(["#late"], timeout=5)
+
+        assert result.match is element
+        assert driver.execute_script.call_count == 3
+
+    def test_no_implicit_wait_restores_timeout(self):
+        """Test that the implicit wait is restored after the block."""
+        driver = MagicMock()
+        probe = SelectorProbe(driver, implicit_wait=30)
+
+        with probe.no_implicit_wait():
+            driver.implicitly_wait.assert_called_with(0)
+
+        driver.implicitly_wait.assert_called_with(30)
+
+
+class TestSelectorStats:
+    """Test adaptive selector ordering."""
+
+    def test_successful_selector_tried_first(self):
+        """Test that the last successful selector moves to the front."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            stats = SelectorStats(Path(temp_dir) / "stats.json")
+            selectors = ["#a", "#b", "#c", "#d"]
+
+            assert stats.order("group", selectors) == selectors
+
+            stats.record("group", "#d", ["#a", "#b", "#c"])
+            assert stats.order("group", selectors) == ["#d", "#a", "#b", "#c"]
+
+    def test_persisted_across_instances(self):
+        """Test that statistics survive a reload and merge per group."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "stats.json"
+
+            first = SelectorStats(path)
+            first.record("login", "#b", ["#a"])
+            second = SelectorStats(path)
+            second.record("orders", "#y", ["#x"])
+
+            first.save()
+            second.save()
+
+            reloaded = SelectorStats(path)
+            assert reloaded.order("login", ["#a", "#b"]) == ["#b", "#a"]
+            assert reloaded.order("orders", ["#x", "#y"]) == ["#y", "#x"]
+
+    def test_probe_uses_stats(self):
+        """Test that the probe sends selectors in adaptive order."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            stats = SelectorStats(Path(temp_dir) / "stats.json")
+            stats.record("group", "#b", ["#a"])
+
+            driver = MagicMock()
+            driver.execute_script.return_value = [0, MagicMock()]
+
+            probe = SelectorProbe(driver, stats=stats)
+            result = probe.find(["#a", "#b"], group="group")
+
+            assert result.selector == "#b"
+            assert driver.execute_script.call_args[0][2] == ["#b", "#a"]
@@ -0,0 +1,114 @@
+"""Tests for rate limiting module."""
+
+import tempfile
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+
+import yaml
+
+from invoice_fetcher.config import Config
+from invoice_fetcher.ratelimit import RateLimiter, parse_retry_after
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestParseRetryAfter:
+    """Test Retry-After parsing."""
+
+    def test_seconds(self):
+        """Test delay-seconds values."""
+        assert parse_retry_after("7") == 7.0
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+    def test_http_date(self):
+        """Test HTTP-date values."""
+        retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+        delay = parse_retry_after(format_datetime(retry_at, usegmt=True))
+
+        assert 25 < delay <= 30
+
+
+class TestRateLimiter:
+    """Test the token bucket and its AIMD adjustment."""
+
+    def test_burst_then_rate(self):
+        """Test that a burst passes and later requests are spaced out."""
+        clock = FakeClock()
+        limiter = RateLimiter(rate=2.0, burst=3, clock=clock)
+
+        assert [limiter.reserve() for _ in range(3)] == [0, 0, 0]
+        assert limiter.reserve() == 0.5
+        assert limiter.reserve() == 1.0
+
+        clock.now += 10
+        assert limiter.reserve() == 0
+
+    def test_throttle_decreases_and_success_recovers(self):
+        """Test multiplicative decrease and additive increase."""
+        clock = FakeClock()
+        limiter = RateLimiter(rate=4.0, burst=1, increase=0.5, clock=clock)
+
+        assert limiter.observe(429, retry_after="3") == 3.0
+        assert limiter.rate == 2.0
+        # Every request waits out the pause
+        assert limiter.reserve() >= 3.0
+
+        for _ in range(10):
+            assert limiter.observe(200) is None
+        assert limiter.rate == 4.0
+
+    def test_retry_after_capped(self):
+        """Test that a huge Retry-After pauses no longer than max_backoff."""
+        clock = FakeClock()
+        limiter = RateLimiter(rate=4.0, max_backoff=30.0, clock=clock)
+
+        assert limiter.observe(503, retry_after="86400") == 30.0
+        assert limiter.reserve() <= 30.0
+
+    def test_rate_never_below_minimum(self):
+        """Test that repeated throttling stops at the minimum rate."""
+        limiter = RateLimiter(rate=1.0, min_rate=0.4, backoff=0, clock=FakeClock())
+
+        for _ in range(5):
+            limiter.throttled(0)
+
+        assert limiter.rate == 0.4
+
+    def test_retries_run_out(self):
+        """Test that transient failures are retried a limited number of times."""
+        limiter = RateLimiter(rate=None, retries=2, backoff=1.0, clock=FakeClock())
+
+        assert 0 <= limiter.observe(502, attempt=0) <= 1.0
+        assert 0 <= limiter.observe(502, attempt=1) <= 2.0
+        assert limiter.observe(502, attempt=2) is None
+        assert limiter.observe(404) is None
+
+    def test_captcha_counts_as_throttling(self):
+        """Test that a captcha interstitial slows the limiter down."""
+        limiter = RateLimiter(rate=2.0, backoff=0, clock=FakeClock())
+
+        assert limiter.observe(200, throttled=True) == 0
+        assert limiter.rate == 1.0
+
+    def test_from_config(self):
+        """Test that the rate_limit section configures the limiter."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            config_file = Path(temp_dir) / "config.yaml"
+            with open(config_file, "w") as f:
+                yaml.dump({"rate_limit": {"requests_per_second": 1.5, "burst": 2}}, f)
+
+            limiter = RateLimiter.from_config(Config(config_file))
+
+        assert limiter.rate == 1.5
+        assert limiter.burst == 2
+        assert limiter.retries == 4
@@ -0,0 +1,60 @@
+"""Tests for page readiness module."""
+
+from unittest.mock import MagicMock
+
+from invoice_fetcher.readiness import PageReadiness, COUNT_SCRIPT
+
+
+def make_waiter(driver, **kwargs) -> PageReadiness:
+    """Create a readiness waiter that polls without sleeping."""
+    waiter = PageReadiness(driver, **kwargs)
+    waiter.POLL_INTERVAL = 0
+    return waiter
+
+
+class TestPageReadiness:
+    """Test event-driven readiness waits."""
+
+    def test_page_ready_returns_once_settled(self):
+        """Test that a settled page is reported ready without extra polling."""
+        driver = MagicMock()
+        driver.execute_script.return_value = ["complete", 1000, 12]
+
+        waiter = make_waiter(driver, quiet_period=0)
+
+        assert waiter.page_ready() is True
+        assert driver.execute_script.call_count == 1
+
+    def test_page_ready_waits_for_document(self):
+        """Test that loading documents are polled until complete."""
+        driver = MagicMock()
+        driver.execute_script.side_effect = [
+            ["loading", 0, 1],
+            ["interactive", 1000, 5],
+            ["complete", 1000, 5],
+        ]
+
+        waiter = make_waiter(driver, quiet_period=0)
+
+        assert waiter.page_ready() is True
+        assert driver.execute_script.call_count == 3
+
+    def test_page_ready_times_out(self):
+        """Test that the wait gives up at the ceiling."""
+        driver = MagicMock()
+        driver.execute_script.return_value = ["loading", 0, 1]
+
+        waiter = make_waiter(driver, timeout=0.05)
+
+        assert waiter.page_ready() is False
+
+    def test_element_count_stable(self):
+        """Test waiting for more elements to load after an action."""
+        driver = MagicMock()
+        driver.execute_script.side_effect = [10, 15, 20, 20]
+
+        waiter = make_waiter(driver, quiet_period=0)
+        count = waiter.element_count_stable([".order-card"], previous_count=10)
+
+        assert count == 20
+        assert driver.execute_script.call_args[0][0] == COUNT_SCRIPT
@@ -0,0 +1,88 @@
+"""Tests for session store module."""
+
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from invoice_fetcher.session_store import SessionStore
+
+
+class FakeKeyring:
+    """In-memory stand-in for the system keyring."""
+
+    def __init__(self):
+        self.passwords = {}
+
+    def get_password(self, service, username):
+        return self.passwords.get((service, username))
+
+    def set_password(self, service, username, password):
+        self.passwords[(service, username)] = password
+
+
+COOKIES = [
+    {"name": "session-id", "value": "abc", "domain": ".amazon.com", "path": "/"},
+]
+
+
+class TestSessionStore:
+    """Test encrypted session storage."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.keyring = FakeKeyring()
+        self.patcher = patch("invoice_fetcher.session_store.keyring", self.keyring)
+        self.patcher.start()
+
+    def teardown_method(self):
+        """Tear down test fixtures."""
+        self.patcher.stop()
+
+    def test_save_and_load(self):
+        """Test cookies round-trip through the store."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = SessionStore(Path(temp_dir))
+            store.save("user@example.com", COOKIES)
+
+            assert store.load("user@example.com") == COOKIES
+            assert store.load("other@example.com") is None
+
+    def test_stored_file_is_encrypted(self):
+        """Test that cookie values are not stored in plain text."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = SessionStore(Path(temp_dir))
+            store.save("user@example.com", COOKIES)
+
+            files = list(Path(temp_dir).iterdir())
+            assert len(files) == 1
+            assert b"session-id" not in files[0].read_bytes()
+
+    def test_expired_session_ignored(self):
+        """Test that sessions older than max_age are not returned."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = SessionStore(Path(temp_dir), max_age=60)
+            store.save("user@example.com", COOKIES)
+
+            with patch("invoice_fetcher.session_store.time") as mock_time:
+                mock_time.time.return_value = time.time() + 120
+                assert store.load("user@example.com") is None
+
+    def test_missing_key_ignored(self):
+        """Test that a session cannot be loaded without its keyring key."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = SessionStore(Path(temp_dir))
+            store.save("user@example.com", COOKIES)
+            self.keyring.passwords.clear()
+
+            assert store.load("user@example.com") is None
+
+    def test_clear(self):
+        """Test removing a stored session."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            store = SessionStore(Path(temp_dir))
+            store.save("user@example.com", COOKIES)
+            store.clear("user@example.com")
+
+            assert store.load("user@example.com") is None
+            store.clear("user@example.com")  # Should not raise
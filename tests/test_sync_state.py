@@ -0,0 +1,120 @@
+"""Tests for sync state module."""
+
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+from invoice_fetcher.sync_state import SyncState
+
+
+class TestSyncState:
+    """Test per-team incremental sync state."""
+
+    def test_no_watermark_initially(self):
+        """Test that a fresh team directory has no watermark."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state = SyncState(Path(temp_dir))
+            assert state.watermark(3) is None
+
+    def test_update_and_reload(self):
+        """Test that the newest order is persisted and used as watermark."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state = SyncState(Path(temp_dir))
+            state.update(
+                [
+                    {
+                        "order_number": "123-4567890-0000001",
+                        "date": datetime(2024, 3, 1),
+                    },
+                    {
+                        "order_number": "123-4567890-0000002",
+                        "date": datetime(2024, 3, 9),
+                    },
+                ],
+                run_time=datetime(2024, 3, 10, 8, 0),
+                since=datetime(2023, 12, 11, 8, 0),
+            )
+            state.save()
+
+            reloaded = SyncState(Path(temp_dir))
+            assert reloaded.newest_order_number == "123-4567890-0000002"
+            assert reloaded.last_run == datetime(2024, 3, 10, 8, 0)
+            assert reloaded.watermark(3) == datetime(2024, 3, 6)
+
+    def test_watermark_never_moves_back(self):
+        """Test that older orders don't lower the watermark."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state = SyncState(Path(temp_dir))
+            state.update(
+                [{"date": datetime(2024, 3, 9)}],
+                datetime(2024, 3, 10),
+                since=datetime(2024, 1, 1),
+            )
+            state.update(
+                [{"date": datetime(2024, 2, 1)}],
+                datetime(2024, 3, 11),
+                since=datetime(2024, 1, 1),
+            )
+
+            assert state.watermark() == datetime(2024, 3, 9)
+            assert state.last_run == datetime(2024, 3, 11)
+
+    def test_narrow_first_run_leaves_no_watermark_for_wider_window(self):
+        """Test that a short first run doesn't hide older orders."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state = SyncState(Path(temp_dir))
+            state.update(
+                [{"date": datetime(2024, 3, 9)}],
+                datetime(2024, 3, 10),
+                since=datetime(2024, 3, 7),
+            )
+
+            assert state.watermark(3, window_start=datetime(2023, 12, 11)) is None
+            assert state.watermark(3, window_start=datetime(2024, 3, 8)) == (
+                datetime(2024, 3, 6)
+            )
+
+    def test_run_after_gap_does_not_advance(self):
+        """Test that a run starting after the covered period keeps the watermark."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state = SyncState(Path(temp_dir))
+            state.update(
+                [{"date": datetime(2024, 1, 9)}],
+                datetime(2024, 1, 10),
+                since=datetime(2023, 10, 12),
+            )
+            state.update(
+                [{"date": datetime(2024, 3, 9)}],
+                datetime(2024, 3, 10),
+                since=datetime(2024, 3, 7),
+            )
+
+            assert state.watermark() == datetime(2024, 1, 9)
+            assert state.covered_until == datetime(2024, 1, 10)
+
+    def test_closed_period_extends_coverage_backwards(self):
+        """Test that an --until run adjoining the covered period extends it."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            state = SyncState(Path(temp_dir))
+            state.update(
+                [{"date": datetime(2024, 3, 9)}],
+                datetime(2024, 3, 10),
+                since=datetime(2024, 3, 1),
+            )
+            state.update(
+                [{"date": datetime(2024, 2, 9)}],
+                datetime(2024, 3, 11),
+                since=datetime(2024, 1, 1),
+                until=datetime(2024, 3, 2),
+            )
+            state.save()
+
+            reloaded = SyncState(Path(temp_dir))
+            assert reloaded.covered_since == datetime(2024, 1, 1)
+            assert reloaded.watermark() == datetime(2024, 3, 9)
+
+    def test_corrupt_state_ignored(self):
+        """Test that an unreadable state file is treated as a first run."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            (Path(temp_dir) / SyncState.FILENAME).write_text("{not json")
+            assert SyncState(Path(temp_dir)).watermark() is None
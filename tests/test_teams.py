@@ -0,0 +1,79 @@
+"""Tests for team routing module."""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+import yaml
+
+from invoice_fetcher.config import Config
+from invoice_fetcher.exceptions import ConfigurationError
+from invoice_fetcher.teams import TeamRouter, team_download_dir
+
+
+def make_config(temp_dir: str, teams: dict) -> Config:
+    """Create a configuration with the given teams section."""
+    config_file = Path(temp_dir) / "config.yaml"
+    with open(config_file, "w") as f:
+        yaml.dump({"download_dir": str(Path(temp_dir) / "invoices"), "teams": teams}, f)
+    return Config(config_file)
+
+
+class TestTeamRouter:
+    """Test routing orders to teams."""
+
+    TEAMS = {
+        "engineering": {"match": {"purchasing_group": ["Engineering*"], "po": "ENG-*"}},
+        "marketing": {"match": {"requester": ["*@marketing.example.com"]}},
+        "general": None,
+    }
+
+    def test_routes_by_rules(self):
+        """Test that orders go to the first team with a matching rule."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cfg = make_config(temp_dir, self.TEAMS)
+            router = TeamRouter.from_config(cfg, TeamRouter.configured_teams(cfg))
+
+            assert router.has_rules
+            assert router.route({"purchasing_group": "engineering EU"}) == "engineering"
+            assert router.route({"po_number": "ENG-42"}) == "engineering"
+            assert (
+                router.route({"requester": "Jane@Marketing.example.com"}) == "marketing"
+            )
+
+    def test_unmatched_orders_use_fallback(self):
+        """Test that unmatched orders go to the first team without rules."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cfg = make_config(temp_dir, self.TEAMS)
+
+            router = TeamRouter.from_config(cfg, ["engineering", "general"])
+            assert router.route({"requester": "bob@example.com"}) == "general"
+
+            router = TeamRouter.from_config(cfg, ["engineering", "marketing"])
+            assert router.route({"requester": "bob@example.com"}) is None
+
+    def test_single_team_without_rules_takes_everything(self):
+        """Test that a team missing from the config receives all orders."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            router = TeamRouter.from_config(make_config(temp_dir, {}), ["finance"])
+
+            assert not router.has_rules
+            assert router.route({"order_number": "123-4567890-1234567"}) == "finance"
+
+    def test_unknown_rule_rejected(self):
+        """Test that misspelt match rules are reported."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cfg = make_config(temp_dir, {"ops": {"match": {"cost_center": ["1"]}}})
+
+            with pytest.raises(ConfigurationError, match="cost_center"):
+                TeamRouter.from_config(cfg, ["ops"])
+
+    def test_team_download_dir(self):
+        """Test per-team download directory overrides."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cfg = make_config(
+                temp_dir, {"ops": {"download_dir": str(Path(temp_dir) / "ops")}}
+            )
+
+            assert team_download_dir(cfg, "ops") == Path(temp_dir) / "ops"
+            assert team_download_dir(cfg, "hr") == Path(temp_dir) / "invoices" / "hr"
@@ -0,0 +1,86 @@
+"""Tests for HTTP transport module."""
+
+import socket
+import tempfile
+from pathlib import Path
+
+import requests
+import yaml
+
+from invoice_fetcher.config import Config
+from invoice_fetcher.transport import (
+    TunedHTTPAdapter,
+    configure_session,
+    socket_options,
+)
+
+
+def make_config(temp_dir: str, transport: dict) -> Config:
+    """Create a configuration with the given transport section."""
+    config_file = Path(temp_dir) / "config.yaml"
+    with open(config_file, "w") as f:
+        yaml.dump({"transport": transport}, f)
+    return Config(config_file)
+
+
+class TestSocketOptions:
+    """Test socket option construction."""
+
+    def test_defaults(self):
+        """Test that TCP_NODELAY and keep-alive are enabled by default."""
+        options = socket_options()
+
+        assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in options
+        assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options
+
+    def test_disabled(self):
+        """Test that both options can be turned off."""
+        options = socket_options(tcp_nodelay=False, keep_alive=False)
+
+        assert options == [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 0)]
+
+
+class TestConfigureSession:
+    """Test session configuration."""
+
+    def test_pool_sized_to_concurrency(self):
+        """Test that the pool holds a connection per download worker."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cfg = make_config(temp_dir, {})
+            session = configure_session(requests.Session(), cfg, concurrency=32)
+
+            adapter = session.get_adapter("https://www.amazon.com/")
+            assert isinstance(adapter, TunedHTTPAdapter)
+            assert adapter._pool_maxsize == 32
+            assert adapter.max_retries.total == 3
+            assert not adapter.max_retries.status_forcelist
+            assert adapter.max_retries.allowed_methods == {"GET", "HEAD"}
+
+            pool = adapter.poolmanager.connection_from_url("https://www.amazon.com/")
+            assert pool.conn_kw["socket_options"] == socket_options()
+
+    def test_configured_values(self):
+        """Test that the transport section overrides the defaults."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cfg = make_config(
+                temp_dir,
+                {"pool_maxsize": 5, "retries": 0, "keep_alive": False},
+            )
+            session = configure_session(requests.Session(), cfg, concurrency=32)
+
+            adapter = session.get_adapter("https://www.amazon.com/")
+            assert adapter._pool_maxsize == 5
+            assert adapter.max_retries.total == 0
+            assert session.headers["Connection"] == "close"
+
+    def test_headers_set_once(self):
+        """Test that common headers are set on the session."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cfg = make_config(temp_dir, {})
+            session = configure_session(
+                requests.Session(), cfg, user_agent="invoice-fetcher-test"
+            )
+
+            assert session.headers["User-Agent"] == "invoice-fetcher-test"
+            assert session.headers["Accept-Language"] == "en-US,en;q=0.9"
+            assert session.headers["Connection"] == "keep-alive"